@@ -4,14 +4,22 @@ Slide tiles to combine and reach 2048!
 
 Controls:
 - Arrow keys to slide tiles
+- H for a hint, A to let the AI play
 - ESC to quit, R to restart
 """
 
 import pygame
-import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+from gamekit.replay import pinned
+import bitboard
+from expectimax import Expectimax, MOVE_NAMES
+
 pygame.init()
 
 SIZE = 450
@@ -25,6 +33,10 @@ EMPTY_CELL = (205, 193, 180)
 WHITE = (255, 255, 255)
 DARK_TEXT = (119, 110, 101)
 
+HEADER_RECT = pygame.Rect(0, 0, SIZE, 100)
+# Search time per AI move; half a frame so hints and auto-play keep 60 FPS
+AI_BUDGET = 0.008
+
 # Tile colors with gradients
 COLORS = {
     0: ((205, 193, 180), (195, 183, 170)),
@@ -49,66 +61,44 @@ class Game:
         self.font = pygame.font.Font(None, 52)
         self.small_font = pygame.font.Font(None, 32)
         self.title_font = pygame.font.Font(None, 48)
+        self.dirty = DirtyRects()
+        self.ai = Expectimax(budget=AI_BUDGET)
+        self.autoplay = False
         self.reset()
     
     def reset(self):
-        self.grid = [[0] * GRID for _ in range(GRID)]
+        # The board lives in a bitboard; grid is the tile values unpacked for drawing
+        self.board = bitboard.spawn(bitboard.spawn(0))
+        self.grid = bitboard.to_grid(self.board)
         self.score = 0
         self.high_score = getattr(self, 'high_score', 0)
         self.game_over = False
         self.won = False
-        self.spawn()
-        self.spawn()
-    
-    def spawn(self):
-        empty = [(r, c) for r in range(GRID) for c in range(GRID) if self.grid[r][c] == 0]
-        if empty:
-            r, c = random.choice(empty)
-            self.grid[r][c] = 4 if random.random() < 0.1 else 2
+        self.hint = None
+        self.dirty.mark_all()
     
-    def slide(self, row):
-        new = [x for x in row if x != 0]
-        for i in range(len(new) - 1):
-            if new[i] == new[i + 1]:
-                new[i] *= 2
-                self.score += new[i]
-                if new[i] == 2048:
-                    self.won = True
-                new[i + 1] = 0
-        new = [x for x in new if x != 0]
-        return new + [0] * (GRID - len(new))
+    def cell_rect(self, r, c):
+        return pygame.Rect(c * CELL + 5, r * CELL + 100, CELL, CELL)
     
     def move(self, direction):
-        old = [row[:] for row in self.grid]
+        board, gained = bitboard.move(self.board, bitboard.DIRECTIONS[direction])
         
-        if direction == 'left':
-            self.grid = [self.slide(row) for row in self.grid]
-        elif direction == 'right':
-            self.grid = [self.slide(row[::-1])[::-1] for row in self.grid]
-        elif direction == 'up':
-            cols = [[self.grid[r][c] for r in range(GRID)] for c in range(GRID)]
-            cols = [self.slide(col) for col in cols]
-            self.grid = [[cols[c][r] for c in range(GRID)] for r in range(GRID)]
-        elif direction == 'down':
-            cols = [[self.grid[r][c] for r in range(GRID)] for c in range(GRID)]
-            cols = [self.slide(col[::-1])[::-1] for col in cols]
-            self.grid = [[cols[c][r] for c in range(GRID)] for r in range(GRID)]
-        
-        if self.grid != old:
-            self.spawn()
+        if board != self.board:
+            old = self.grid
+            self.hint = None
+            self.score += gained
+            if bitboard.has_won(board):
+                self.won = True
+            self.board = bitboard.spawn(board)
+            self.grid = bitboard.to_grid(self.board)
             self.high_score = max(self.high_score, self.score)
-            self.check_game_over()
-    
-    def check_game_over(self):
-        for r in range(GRID):
-            for c in range(GRID):
-                if self.grid[r][c] == 0:
-                    return
-                if c < GRID - 1 and self.grid[r][c] == self.grid[r][c + 1]:
-                    return
-                if r < GRID - 1 and self.grid[r][c] == self.grid[r + 1][c]:
-                    return
-        self.game_over = True
+            self.game_over = bitboard.is_game_over(self.board)
+            if self.game_over or self.won:
+                self.dirty.mark_all()
+            else:
+                self.dirty.mark(HEADER_RECT)
+                self.dirty.mark(*(self.cell_rect(r, c) for r in range(GRID) for c in range(GRID)
+                                  if self.grid[r][c] != old[r][c]))
     
     def draw_tile(self, val, r, c):
         x, y = c * CELL + 10, r * CELL + 105
@@ -128,29 +118,51 @@ class Game:
         if val:
             text_color = DARK_TEXT if val < 8 else WHITE
             font = self.font if val < 1000 else self.small_font
-            text = font.render(str(val), True, text_color)
+            text = render_text(font, str(val), True, text_color)
             self.screen.blit(text, (x + w // 2 - text.get_width() // 2, y + h // 2 - text.get_height() // 2))
     
-    def draw(self):
+    def ai_move(self):
+        # The depth a search reaches depends on machine load; a recorded session
+        # logs it and a replay searches to exactly that depth
+        return pinned(lambda depth: (self.ai.best_move(self.board, depth), self.ai.depth_reached))
+    
+    def show_hint(self):
+        direction = self.ai_move()
+        self.hint = MOVE_NAMES[direction] if direction is not None else None
+        self.dirty.mark(HEADER_RECT)
+    
+    def update(self):
+        if self.autoplay and not self.game_over:
+            direction = self.ai_move()
+            if direction is not None:
+                self.move(MOVE_NAMES[direction])
+    
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        clip = self.screen.get_clip()
         self.screen.fill(BG_COLOR)
         
         # Header
-        title = self.title_font.render("2048", True, DARK_TEXT)
-        self.screen.blit(title, (20, 20))
-        
-        # Score boxes
-        pygame.draw.rect(self.screen, BOARD_BG, (SIZE - 200, 15, 90, 50), border_radius=6)
-        pygame.draw.rect(self.screen, BOARD_BG, (SIZE - 100, 15, 90, 50), border_radius=6)
-        
-        score_label = self.small_font.render("SCORE", True, WHITE)
-        best_label = self.small_font.render("BEST", True, WHITE)
-        score_val = self.small_font.render(str(self.score), True, WHITE)
-        best_val = self.small_font.render(str(self.high_score), True, WHITE)
-        
-        self.screen.blit(score_label, (SIZE - 185, 18))
-        self.screen.blit(score_val, (SIZE - 185, 40))
-        self.screen.blit(best_label, (SIZE - 85, 18))
-        self.screen.blit(best_val, (SIZE - 85, 40))
+        if clip.colliderect(HEADER_RECT):
+            title = render_text(self.title_font, "2048", True, DARK_TEXT)
+            self.screen.blit(title, (20, 20))
+            if self.autoplay or self.hint:
+                label = "AI playing" if self.autoplay else f"Hint: {self.hint.upper()}"
+                self.screen.blit(render_text(self.small_font, label, True, DARK_TEXT), (20, 66))
+            
+            # Score boxes
+            pygame.draw.rect(self.screen, BOARD_BG, (SIZE - 200, 15, 90, 50), border_radius=6)
+            pygame.draw.rect(self.screen, BOARD_BG, (SIZE - 100, 15, 90, 50), border_radius=6)
+            
+            score_label = render_text(self.small_font, "SCORE", True, WHITE)
+            best_label = render_text(self.small_font, "BEST", True, WHITE)
+            score_val = render_text(self.small_font, str(self.score), True, WHITE)
+            best_val = render_text(self.small_font, str(self.high_score), True, WHITE)
+            
+            self.screen.blit(score_label, (SIZE - 185, 18))
+            self.screen.blit(score_val, (SIZE - 185, 40))
+            self.screen.blit(best_label, (SIZE - 85, 18))
+            self.screen.blit(best_val, (SIZE - 85, 40))
         
         # Board
         pygame.draw.rect(self.screen, BOARD_BG, (5, 100, SIZE - 10, SIZE - 10), border_radius=8)
@@ -158,7 +170,8 @@ class Game:
         # Tiles
         for r in range(GRID):
             for c in range(GRID):
-                self.draw_tile(self.grid[r][c], r, c)
+                if clip.colliderect(self.cell_rect(r, c)):
+                    self.draw_tile(self.grid[r][c], r, c)
         
         # Overlays
         if self.game_over or self.won:
@@ -168,27 +181,35 @@ class Game:
             
             msg = "You Win! 🎉" if self.won else "Game Over!"
             color = (255, 180, 0) if self.won else DARK_TEXT
-            text = self.title_font.render(msg, True, color)
-            hint = self.small_font.render("Press R to restart", True, DARK_TEXT)
+            text = render_text(self.title_font, msg, True, color)
+            hint = render_text(self.small_font, "Press R to restart", True, DARK_TEXT)
             
             self.screen.blit(text, (SIZE // 2 - text.get_width() // 2, SIZE // 2 + 50))
             self.screen.blit(hint, (SIZE // 2 - hint.get_width() // 2, SIZE // 2 + 100))
-        
-        pygame.display.flip()
+    
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.dirty.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
                     if event.key == pygame.K_r: self.reset()
+                    if event.key == pygame.K_a:
+                        self.autoplay = not self.autoplay
+                        self.dirty.mark(HEADER_RECT)
                     if not self.game_over:
+                        if event.key == pygame.K_h: self.show_hint()
                         if event.key == pygame.K_LEFT: self.move('left')
                         elif event.key == pygame.K_RIGHT: self.move('right')
                         elif event.key == pygame.K_UP: self.move('up')
                         elif event.key == pygame.K_DOWN: self.move('down')
             
+            self.update()
             self.draw()
             self.clock.tick(60)
 
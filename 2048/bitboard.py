@@ -0,0 +1,146 @@
+"""
+🔢 2048 bitboard engine
+
+The 4x4 grid packed into one 64-bit integer: each cell is a 4-bit exponent
+(0 = empty, 1 = 2, 2 = 4, ... 11 = 2048), row r at bits 16*r, column c at
+bits 4*c within its row. A whole row is a 16-bit number, so every possible
+left/right row move and its score is looked up in 65536-entry tables built
+once at import; up and down transpose the board and use the same tables.
+
+Plain functions on ints, usable from the game and from headless code:
+
+    board = spawn(spawn(0))
+    new, gained = move(board, LEFT)
+    if new != board: board = spawn(new)
+"""
+
+import random
+
+LEFT, RIGHT, UP, DOWN = range(4)
+DIRECTIONS = {"left": LEFT, "right": RIGHT, "up": UP, "down": DOWN}
+ROW_MASK = 0xFFFF
+WIN_EXPONENT = 11           # 2048
+MAX_EXPONENT = 15           # a nibble can't hold a merged 32768 + 32768
+
+
+def _reverse_row(row):
+    return (row & 0xF) << 12 | (row >> 4 & 0xF) << 8 | (row >> 8 & 0xF) << 4 | row >> 12
+
+
+def _build_tables():
+    left_table = [0] * 65536
+    right_table = [0] * 65536
+    score_table = [0] * 65536
+    for row in range(65536):
+        tiles = [t for t in (row & 0xF, row >> 4 & 0xF, row >> 8 & 0xF, row >> 12) if t]
+        merged = []
+        score = 0
+        i = 0
+        while i < len(tiles):
+            if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < MAX_EXPONENT:
+                merged.append(tiles[i] + 1)
+                score += 1 << (tiles[i] + 1)
+                i += 2
+            else:
+                merged.append(tiles[i])
+                i += 1
+        merged += [0] * (4 - len(merged))
+        left = merged[0] | merged[1] << 4 | merged[2] << 8 | merged[3] << 12
+        left_table[row] = left
+        # A run of equal tiles merges into the same pairs from either end,
+        # so one score table serves both directions
+        score_table[row] = score
+        right_table[_reverse_row(row)] = _reverse_row(left)
+    return left_table, right_table, score_table
+
+
+ROW_LEFT, ROW_RIGHT, ROW_SCORE = _build_tables()
+
+
+def transpose(board):
+    """Swap rows and columns (cell (r, c) moves to (c, r))."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | a2 << 12 | a3 >> 12
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | b2 >> 24 | b3 << 24
+
+
+def _move_rows(board, table):
+    r0 = board & ROW_MASK
+    r1 = board >> 16 & ROW_MASK
+    r2 = board >> 32 & ROW_MASK
+    r3 = board >> 48
+    moved = table[r0] | table[r1] << 16 | table[r2] << 32 | table[r3] << 48
+    return moved, ROW_SCORE[r0] + ROW_SCORE[r1] + ROW_SCORE[r2] + ROW_SCORE[r3]
+
+
+def move(board, direction):
+    """Return (new_board, points scored). new_board == board if nothing moved."""
+    if direction == LEFT:
+        return _move_rows(board, ROW_LEFT)
+    if direction == RIGHT:
+        return _move_rows(board, ROW_RIGHT)
+    moved, score = _move_rows(transpose(board), ROW_LEFT if direction == UP else ROW_RIGHT)
+    return transpose(moved), score
+
+
+def empty_cells(board):
+    """Indices (4*r + c) of the empty cells, in row-major order."""
+    return [i for i in range(16) if not board >> (4 * i) & 0xF]
+
+
+def count_empty(board):
+    count = 0
+    for i in range(16):
+        if not board & 0xF:
+            count += 1
+        board >>= 4
+    return count
+
+
+def spawn(board, rng=random):
+    """Put a 2 (90%) or a 4 (10%) on a random empty cell, like Game.spawn()."""
+    empty = empty_cells(board)
+    if not empty:
+        return board
+    i = rng.choice(empty)
+    return board | (2 if rng.random() < 0.1 else 1) << (4 * i)
+
+
+def can_move(board):
+    return any(move(board, d)[0] != board for d in (LEFT, RIGHT, UP, DOWN))
+
+
+def is_game_over(board):
+    return not can_move(board)
+
+
+def max_exponent(board):
+    return max(board >> (4 * i) & 0xF for i in range(16))
+
+
+def has_won(board):
+    return max_exponent(board) >= WIN_EXPONENT
+
+
+def tile_value(exponent):
+    return 1 << exponent if exponent else 0
+
+
+def from_grid(grid):
+    """Pack a 4x4 list of tile values (0, 2, 4, ...) into a board."""
+    board = 0
+    for r, row in enumerate(grid):
+        for c, value in enumerate(row):
+            if value:
+                board |= (value.bit_length() - 1) << (4 * (4 * r + c))
+    return board
+
+
+def to_grid(board):
+    """Unpack a board into a 4x4 list of tile values."""
+    return [[tile_value(board >> (4 * (4 * r + c)) & 0xF) for c in range(4)] for r in range(4)]
@@ -0,0 +1,238 @@
+"""
+🤖 Expectimax player for 2048
+
+Searches the bitboard engine: max nodes try the four moves, chance nodes
+average over every empty cell getting a 2 (90%) or a 4 (10%), exactly like
+bitboard.spawn(). Leaves are scored with a row heuristic (empty cells,
+merges, monotonic rows, big tiles penalised) over all rows and columns.
+
+Depth adapts to a time budget per move: iterative deepening runs deeper
+searches until the budget runs out and keeps the move from the deepest
+search that finished. Chance nodes are cached in a bounded transposition
+table that survives between moves; a search's entries only go in once it
+finishes, so a move searched again to the depth it reached (as a replay
+does) leaves the table exactly as it was the first time.
+
+Headless benchmark, games spread over a process pool:
+    python 2048/expectimax.py --games 16 --budget 0.02
+"""
+
+import os
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import bitboard
+from bitboard import LEFT, RIGHT, UP, DOWN
+
+MOVE_NAMES = {LEFT: "left", RIGHT: "right", UP: "up", DOWN: "down"}
+
+# Row heuristic weights (from nneonneo's well-known 2048 AI)
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+_row_scores = {}
+
+
+def row_heuristic(row):
+    """Heuristic value of one 16-bit row, computed once per distinct row."""
+    score = _row_scores.get(row)
+    if score is not None:
+        return score
+    line = [row & 0xF, row >> 4 & 0xF, row >> 8 & 0xF, row >> 12]
+    total = sum(rank ** SUM_POWER for rank in line)
+    empty = line.count(0)
+    merges = 0
+    prev = 0
+    counter = 0
+    for rank in line:
+        if rank == 0:
+            continue
+        if prev == rank:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        prev = rank
+    if counter > 0:
+        merges += 1 + counter
+    mono_left = mono_right = 0.0
+    for i in range(3):
+        a, b = line[i] ** MONOTONICITY_POWER, line[i + 1] ** MONOTONICITY_POWER
+        if line[i] > line[i + 1]:
+            mono_left += a - b
+        else:
+            mono_right += b - a
+    score = (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+             - MONOTONICITY_WEIGHT * min(mono_left, mono_right) - SUM_WEIGHT * total)
+    _row_scores[row] = score
+    return score
+
+
+def evaluate(board):
+    """Sum of the row heuristic over the four rows and the four columns."""
+    cols = bitboard.transpose(board)
+    return (row_heuristic(board & 0xFFFF) + row_heuristic(board >> 16 & 0xFFFF)
+            + row_heuristic(board >> 32 & 0xFFFF) + row_heuristic(board >> 48)
+            + row_heuristic(cols & 0xFFFF) + row_heuristic(cols >> 16 & 0xFFFF)
+            + row_heuristic(cols >> 32 & 0xFFFF) + row_heuristic(cols >> 48))
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Expectimax:
+    def __init__(self, budget=0.01, max_depth=8, table_size=200000, min_probability=0.0001):
+        self.budget = budget                  # seconds per move
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.min_probability = min_probability
+        self.table = {}                       # board -> (depth searched below it, value)
+        self.pending = {}                     # entries of the search in progress
+        self.deadline = None
+        self.nodes = 0
+        self.table_hits = 0
+        self.depth_reached = 0
+
+    def best_move(self, board, depth=None):
+        """Return the best direction for `board`, or None if no move is possible.
+
+        Searches to `depth` if given, otherwise as deep as the time budget allows.
+        """
+        self.depth_reached = 0
+        moves = [(d, moved) for d in (LEFT, RIGHT, UP, DOWN)
+                 for moved in (bitboard.move(board, d)[0],) if moved != board]
+        if not moves:
+            return None
+        if len(moves) == 1:
+            return moves[0][0]
+
+        start = time.perf_counter()
+        best = moves[0][0]
+        for d in range(1, (self.max_depth if depth is None else depth) + 1):
+            # Depth 1 always finishes so there is an answer to give
+            self.deadline = start + self.budget if depth is None and d > 1 else None
+            self.pending = {}
+            try:
+                scores = [(self.chance_node(moved, d - 1, 1.0), m) for m, moved in moves]
+            except _Timeout:
+                break
+            for key, (entry_depth, value) in self.pending.items():
+                self.remember(key, entry_depth, value)
+            best = max(scores)[1]
+            self.depth_reached = d
+            # A deeper search takes several times longer; don't start one we can't finish
+            if depth is None and time.perf_counter() - start > self.budget / 4:
+                break
+        self.pending = {}
+        return best
+
+    def remember(self, board, depth, value):
+        table = self.table
+        if len(table) >= self.table_size:
+            # Evict the oldest entry (dicts keep insertion order)
+            del table[next(iter(table))]
+        table[board] = (depth, value)
+
+    def chance_node(self, board, depth, probability):
+        if depth == 0 or probability < self.min_probability:
+            return evaluate(board)
+        entry = self.pending.get(board) or self.table.get(board)
+        if entry is not None and entry[0] >= depth:
+            self.table_hits += 1
+            return entry[1]
+
+        self.nodes += 1
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+        empty = bitboard.empty_cells(board)
+        probability /= len(empty)
+        total = 0.0
+        for i in empty:
+            shift = 4 * i
+            total += 0.9 * self.max_node(board | 1 << shift, depth, probability * 0.9)
+            total += 0.1 * self.max_node(board | 2 << shift, depth, probability * 0.1)
+        value = total / len(empty)
+        self.pending[board] = (depth, value)
+        return value
+
+    def max_node(self, board, depth, probability):
+        best = None
+        for d in (LEFT, RIGHT, UP, DOWN):
+            moved = bitboard.move(board, d)[0]
+            if moved != board:
+                value = self.chance_node(moved, depth - 1, probability)
+                if best is None or value > best:
+                    best = value
+        return 0.0 if best is None else best
+
+
+def play_game(seed, budget=0.01, max_depth=8):
+    """Play one full game headlessly; returns its result and timings."""
+    rng = random.Random(seed)
+    ai = Expectimax(budget=budget, max_depth=max_depth)
+    board = bitboard.spawn(bitboard.spawn(0, rng), rng)
+    score = moves = 0
+    depths = 0
+    start = time.perf_counter()
+    while True:
+        direction = ai.best_move(board)
+        if direction is None:
+            break
+        board, gained = bitboard.move(board, direction)
+        board = bitboard.spawn(board, rng)
+        score += gained
+        moves += 1
+        depths += ai.depth_reached
+    return {
+        "seed": seed,
+        "score": score,
+        "moves": moves,
+        "max_tile": bitboard.tile_value(bitboard.max_exponent(board)),
+        "seconds": time.perf_counter() - start,
+        "mean_depth": depths / moves if moves else 0.0,
+        "nodes": ai.nodes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the 2048 expectimax player over many games.")
+    parser.add_argument("--games", type=int, default=16, help="games to play")
+    parser.add_argument("--budget", type=float, default=0.01, help="search time per move in seconds")
+    parser.add_argument("--max-depth", type=int, default=8, help="deepest search to try")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args()
+
+    print(f"Playing {args.games} games, {args.budget * 1000:.0f} ms per move, {args.jobs} workers")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(play_game, range(args.seed, args.seed + args.games),
+                                [args.budget] * args.games, [args.max_depth] * args.games))
+    wall = time.perf_counter() - start
+
+    moves = sum(r["moves"] for r in results)
+    cpu = sum(r["seconds"] for r in results)
+    print(f"\n{moves} moves in {wall:.1f}s wall ({moves / wall:.0f} moves/s over the pool, "
+          f"{moves / cpu:.0f} moves/s per worker)")
+    print(f"mean score {sum(r['score'] for r in results) / len(results):.0f}, "
+          f"mean search depth {sum(r['mean_depth'] for r in results) / len(results):.2f}")
+
+    print(f"\n{'highest tile':>12}{'games':>8}{'reached':>10}")
+    tiles = sorted({r["max_tile"] for r in results}, reverse=True)
+    for tile in tiles:
+        count = sum(1 for r in results if r["max_tile"] == tile)
+        reached = sum(1 for r in results if r["max_tile"] >= tile)
+        print(f"{tile:>12}{count:>8}{reached / len(results):>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
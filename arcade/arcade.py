@@ -0,0 +1,165 @@
+"""
+🕹️ Arcade
+Every pygame game in one bundle - pick a game, play, press ESC to come back!
+
+Controls:
+- Arrow keys / mouse to choose a game
+- ENTER / click to play
+- ESC in a game returns to the menu, ESC in the menu quits
+"""
+
+import pygame
+import sys
+import os
+import asyncio
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# In the web bundle the games are staged next to this file; when run from a
+# checkout they live one level up, next to gamekit
+ROOT = HERE if os.path.isdir(os.path.join(HERE, "gamekit")) else os.path.dirname(HERE)
+sys.path.append(ROOT)
+from gamekit import background
+from gamekit.dirty import DirtyRects
+from gamekit.loader import load_game_module
+from gamekit.text import cache as text_cache, render_text
+
+pygame.init()
+
+WIDTH, HEIGHT = 800, 600
+COLS = 4
+CARD_W, CARD_H = 170, 72
+GAP = 16
+TOP = 110
+BG_TOP = (25, 25, 50)
+BG_BOTTOM = (45, 30, 70)
+CARD = (50, 55, 90)
+CARD_SELECTED = (90, 100, 180)
+WHITE = (255, 255, 255)
+SUBTLE = (150, 160, 200)
+
+
+def find_games(root_dir=ROOT):
+    """Return (folder, title, blurb) for every pygame game with a Game class, without importing it."""
+    games = []
+    for folder in sorted(os.listdir(root_dir)):
+        path = os.path.join(root_dir, folder, f"{folder}.py")
+        if folder == "arcade" or not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        if "import pygame" not in source or "\nclass Game" not in source:
+            continue
+        doc = source.split('"""')[1].strip().splitlines() if source.startswith('"""') else []
+        blurb = doc[1].strip() if len(doc) > 1 else ""
+        games.append((folder, folder.replace("_", " ").title(), blurb))
+    return games
+
+
+class Launcher:
+    def __init__(self):
+        self.games = find_games()
+        self.modules = {}
+        self.selected = 0
+        self.title_font = pygame.font.Font(None, 64)
+        self.font = pygame.font.Font(None, 32)
+        self.small_font = pygame.font.Font(None, 20)
+        self.clock = pygame.time.Clock()
+        self.dirty = DirtyRects()
+        self.show_menu()
+
+    def show_menu(self):
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("🕹️ Arcade")
+        self.dirty.mark_all()
+
+    def card_rect(self, i):
+        row, col = divmod(i, COLS)
+        left = (WIDTH - COLS * CARD_W - (COLS - 1) * GAP) // 2
+        return pygame.Rect(left + col * (CARD_W + GAP), TOP + row * (CARD_H + GAP), CARD_W, CARD_H)
+
+    def select(self, i):
+        if i != self.selected and 0 <= i < len(self.games):
+            self.dirty.mark(self.card_rect(self.selected), self.card_rect(i))
+            self.selected = i
+
+    def paint(self):
+        self.screen.blit(background.gradient((WIDTH, HEIGHT), BG_TOP, BG_BOTTOM), (0, 0))
+        title = render_text(self.title_font, "Arcade", True, WHITE)
+        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 30))
+
+        clip = self.screen.get_clip()
+        for i, (_, name, blurb) in enumerate(self.games):
+            rect = self.card_rect(i)
+            if not clip.colliderect(rect):
+                continue
+            pygame.draw.rect(self.screen, CARD_SELECTED if i == self.selected else CARD, rect, border_radius=10)
+            label = render_text(self.font, name, True, WHITE)
+            self.screen.blit(label, (rect.centerx - label.get_width() // 2, rect.y + 14))
+            if blurb:
+                line = render_text(self.small_font, blurb[:28], True, SUBTLE)
+                self.screen.blit(line, (rect.centerx - line.get_width() // 2, rect.y + 46))
+
+        hint = render_text(self.small_font, "ENTER to play  -  ESC in a game returns here", True, SUBTLE)
+        self.screen.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT - 30))
+
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
+
+    async def play(self, folder):
+        """Run one game until it quits, then come back to the menu."""
+        module = self.modules.get(folder)
+        if module is None:
+            # Imported on first pick only
+            module = self.modules[folder] = load_game_module(folder, ROOT, prefix="arcade_")
+
+        # Games leave with pygame.quit(); sys.exit(). Keep the display alive
+        # and turn the exit into a return to the menu.
+        quit_pygame = pygame.quit
+        pygame.quit = lambda: None
+        try:
+            await module.Game().run()
+        except SystemExit:
+            pass
+        finally:
+            pygame.quit = quit_pygame
+            text_cache.clear()
+            background.clear()
+            pygame.event.clear()
+        self.show_menu()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(0)
+            chosen = None
+            for event in pygame.event.get():
+                self.dirty.handle_event(event)
+                if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
+                    if event.key == pygame.K_LEFT: self.select(self.selected - 1)
+                    if event.key == pygame.K_RIGHT: self.select(self.selected + 1)
+                    if event.key == pygame.K_UP: self.select(self.selected - COLS)
+                    if event.key == pygame.K_DOWN: self.select(self.selected + COLS)
+                    if event.key in (pygame.K_RETURN, pygame.K_SPACE) and self.games:
+                        chosen = self.selected
+                if event.type == pygame.MOUSEMOTION:
+                    for i in range(len(self.games)):
+                        if self.card_rect(i).collidepoint(event.pos):
+                            self.select(i)
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    for i in range(len(self.games)):
+                        if self.card_rect(i).collidepoint(event.pos):
+                            self.select(i)
+                            chosen = i
+
+            if chosen is not None:
+                await self.play(self.games[chosen][0])
+            self.draw()
+            self.clock.tick(60)
+
+async def main():
+    launcher = Launcher()
+    await launcher.run()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,8 +13,14 @@ import pygame
 import math
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+from gamekit.perf import PerfMonitor
+
 pygame.init()
 
 WIDTH, HEIGHT = 800, 600
@@ -94,6 +100,8 @@ class Game:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("🌟 Asteroids")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
+        self.perf = PerfMonitor(entities=lambda: {"asteroids": len(self.asteroids), "bullets": len(self.bullets)})
         self.font = pygame.font.Font(None, 36)
         self.reset()
     
@@ -105,9 +113,58 @@ class Game:
         self.lives = 3
         self.game_over = False
     
+    def update(self):
+        if self.game_over:
+            return
+        
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT]: self.ship.rotate(-1)
+        if keys[pygame.K_RIGHT]: self.ship.rotate(1)
+        if keys[pygame.K_UP]: self.ship.thrust()
+        
+        self.ship.update()
+        for b in self.bullets[:]:
+            b.update()
+            if b.life <= 0: self.bullets.remove(b)
+        for a in self.asteroids: a.update()
+        
+        # Collision detection
+        for b in self.bullets[:]:
+            for a in self.asteroids[:]:
+                if math.hypot(b.x - a.x, b.y - a.y) < a.radius:
+                    self.bullets.remove(b) if b in self.bullets else None
+                    self.asteroids.remove(a)
+                    self.score += (4 - a.size) * 20
+                    if a.size > 1:
+                        self.asteroids.extend([Asteroid(a.x, a.y, a.size - 1) for _ in range(2)])
+                    break
+        
+        for a in self.asteroids:
+            if math.hypot(self.ship.x - a.x, self.ship.y - a.y) < a.radius + 10:
+                self.lives -= 1
+                self.ship = Ship()
+                if self.lives <= 0: self.game_over = True
+                break
+        
+        if not self.asteroids:
+            self.asteroids = [Asteroid() for _ in range(5)]
+    
+    def draw(self):
+        self.screen.fill(BLACK)
+        if not self.game_over: self.ship.draw(self.screen)
+        for b in self.bullets: b.draw(self.screen)
+        for a in self.asteroids: a.draw(self.screen)
+        self.screen.blit(render_text(self.font, f"Score: {self.score}  Lives: {self.lives}", True, WHITE), (10, 10))
+        if self.game_over:
+            self.screen.blit(render_text(self.font, "GAME OVER - Press R", True, WHITE), (WIDTH//2 - 130, HEIGHT//2))
+        self.perf.draw_overlay(self.screen)
+        pygame.display.flip()
+    
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.perf.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
@@ -115,47 +172,13 @@ class Game:
                     if event.key == pygame.K_SPACE and not self.game_over:
                         self.bullets.append(self.ship.shoot())
             
-            keys = pygame.key.get_pressed()
-            if not self.game_over:
-                if keys[pygame.K_LEFT]: self.ship.rotate(-1)
-                if keys[pygame.K_RIGHT]: self.ship.rotate(1)
-                if keys[pygame.K_UP]: self.ship.thrust()
-                
-                self.ship.update()
-                for b in self.bullets[:]:
-                    b.update()
-                    if b.life <= 0: self.bullets.remove(b)
-                for a in self.asteroids: a.update()
-                
-                # Collision detection
-                for b in self.bullets[:]:
-                    for a in self.asteroids[:]:
-                        if math.hypot(b.x - a.x, b.y - a.y) < a.radius:
-                            self.bullets.remove(b) if b in self.bullets else None
-                            self.asteroids.remove(a)
-                            self.score += (4 - a.size) * 20
-                            if a.size > 1:
-                                self.asteroids.extend([Asteroid(a.x, a.y, a.size - 1) for _ in range(2)])
-                            break
-                
-                for a in self.asteroids:
-                    if math.hypot(self.ship.x - a.x, self.ship.y - a.y) < a.radius + 10:
-                        self.lives -= 1
-                        self.ship = Ship()
-                        if self.lives <= 0: self.game_over = True
-                        break
-                
-                if not self.asteroids:
-                    self.asteroids = [Asteroid() for _ in range(5)]
-            
-            self.screen.fill(BLACK)
-            if not self.game_over: self.ship.draw(self.screen)
-            for b in self.bullets: b.draw(self.screen)
-            for a in self.asteroids: a.draw(self.screen)
-            self.screen.blit(self.font.render(f"Score: {self.score}  Lives: {self.lives}", True, WHITE), (10, 10))
-            if self.game_over:
-                self.screen.blit(self.font.render("GAME OVER - Press R", True, WHITE), (WIDTH//2 - 130, HEIGHT//2))
-            pygame.display.flip()
+            self.perf.begin_frame()
+            for _ in range(self.timestep.advance()):
+                self.update()
+            self.perf.lap("update")
+            self.draw()
+            self.perf.lap("draw")
+            self.perf.end_frame()
             self.clock.tick(60)
 
 async def main():
@@ -0,0 +1,369 @@
+"""
+⏱️ Headless frame-time benchmark
+
+Runs every pygame game's Game class for N frames with scripted input on the
+SDL dummy video driver and reports p50/p95/p99 update and draw times. The
+update time includes the scripted input, since that is where turn-based
+games do a frame's real work (a 2048 move, a Tetris lock, a Sudoku entry).
+
+Usage:
+    python benchmark.py                        # all games, 600 frames each
+    python benchmark.py tetris snake_game -n 2000
+    python benchmark.py -o new.json --compare old.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from gamekit import text
+from gamekit.loader import load_game_module
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class HeldKeys:
+    """Stand-in for pygame.key.get_pressed() that reports scripted keys as held."""
+
+    def __init__(self):
+        self.keys = set()
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+HELD = HeldKeys()
+
+
+def find_pygame_games(root_dir=ROOT_DIR):
+    """Return the folders whose main script is a pygame game with a Game class."""
+    games = []
+    for folder in sorted(os.listdir(root_dir)):
+        path = os.path.join(root_dir, folder, f"{folder}.py")
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        if "import pygame" in source and "\nclass Game" in source:
+            games.append(folder)
+    return games
+
+
+# ---------------------------------------------------------------------------
+# Input scripts: called once per frame before update(). They drive the game
+# through its own methods, set HELD.keys for games that poll the keyboard,
+# and restart the game when it ends so every frame does real work.
+# ---------------------------------------------------------------------------
+
+def script_2048(game, frame, mod):
+    if game.game_over or game.won:
+        game.reset()
+    elif frame % 2 == 0:
+        game.move(("left", "down", "right", "up")[frame // 2 % 4])
+
+
+def script_asteroids(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    HELD.keys = {pygame.K_LEFT, pygame.K_UP} if frame % 120 < 60 else {pygame.K_RIGHT}
+    if frame % 8 == 0:
+        game.bullets.append(game.ship.shoot())
+
+
+def script_breakout(game, frame, mod):
+    if game.game_over or game.victory:
+        game.reset()
+    game.ball.active = True
+    target = game.ball.x - mod.PADDLE_WIDTH // 2
+    HELD.keys = {pygame.K_LEFT} if game.paddle.x > target + 5 else {pygame.K_RIGHT} if game.paddle.x < target - 5 else set()
+
+
+def script_catch_the_ball(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    target = max(game.balls, key=lambda b: b["y"])["x"] if game.balls else mod.WIDTH // 2
+    HELD.keys = {pygame.K_LEFT} if game.basket_x > target + 8 else {pygame.K_RIGHT} if game.basket_x < target - 8 else set()
+
+
+def script_checkers(game, frame, mod):
+    if frame % 6:
+        return
+    movable = [(p, m) for p in game.pieces if p.color == game.turn for m in game.get_valid_moves(p)]
+    if not movable:
+        game.reset()
+        return
+    piece, move = random.choice(movable)
+    game.selected, game.valid_moves = piece, game.get_valid_moves(piece)
+    game.move(piece, move[0], move[1], move[2])
+    game.selected, game.valid_moves = None, []
+
+
+def script_connect_four(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif frame % 4 == 0:
+        game.drop(random.randrange(mod.COLS))
+
+
+def script_flappy_bird(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    game.started = True
+    ahead = [p for p in game.pipes if p.x + mod.PIPE_WIDTH > game.bird.x]
+    target = ahead[0].gap_y + mod.PIPE_GAP * 0.6 if ahead else mod.WINDOW_HEIGHT // 2
+    if game.bird.y > target and game.bird.velocity > 0:
+        game.bird.flap()
+
+
+def script_frogger(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif frame % 15 == 0:
+        dx, dy = random.choice([(0, -mod.CELL), (0, -mod.CELL), (-mod.CELL, 0), (mod.CELL, 0)])
+        game.move_frog(dx, dy)
+
+
+def script_maze_runner(game, frame, mod):
+    if game.won:
+        game.reset()
+    game.move(*random.choice([(0, -1), (0, 1), (-1, 0), (1, 0)]))
+
+
+def script_memory_match(game, frame, mod):
+    if game.game_won:
+        game.reset()
+    elif frame % 3 == 0:
+        game.click(random.randrange(mod.GRID), random.randrange(mod.GRID))
+
+
+def script_minesweeper(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif frame % 3 == 0:
+        r, c = random.randrange(game.rows), random.randrange(game.cols)
+        if frame % 12 == 0:
+            game.toggle_flag(r, c)
+        else:
+            game.reveal(r, c)
+
+
+def script_platformer(game, frame, mod):
+    if game.won or frame % 900 == 0:
+        game.reset()
+    HELD.keys = {pygame.K_RIGHT} if frame % 200 < 150 else {pygame.K_LEFT}
+    if frame % 40 == 0:
+        game.player.jump()
+
+
+def script_pong(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    game.ball.active = True
+    # Left paddle tracks the ball, right paddle lags behind so points get scored
+    HELD.keys = set()
+    ball_y = game.ball.y + game.ball.size / 2
+    if game.paddle1.y + mod.PADDLE_HEIGHT / 2 < ball_y - 10:
+        HELD.keys.add(pygame.K_s)
+    elif game.paddle1.y + mod.PADDLE_HEIGHT / 2 > ball_y + 10:
+        HELD.keys.add(pygame.K_w)
+    HELD.keys.add(pygame.K_UP if frame % 90 < 45 else pygame.K_DOWN)
+
+
+def script_simon_says(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif game.state == "playing" and frame % 10 == 0:
+        game.check_input(game.sequence[len(game.player_seq)])
+
+
+def script_sliding_puzzle(game, frame, mod):
+    game.move(random.choice(("up", "down", "left", "right")))
+
+
+def script_snake_game(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif frame % 6 == 0:
+        game.snake.change_direction(random.choice([mod.UP, mod.DOWN, mod.LEFT, mod.RIGHT]))
+
+
+def script_space_invaders(game, frame, mod):
+    if game.game_over:
+        game.reset_game()
+    HELD.keys = {pygame.K_LEFT} if frame % 160 < 80 else {pygame.K_RIGHT}
+    if frame % 12 == 0:
+        game.bullets.append(mod.Bullet(game.player.x + game.player.width // 2 - 2, game.player.y))
+
+
+def script_sudoku(game, frame, mod):
+    if game.won:
+        game.new_puzzle()
+    elif frame % 3 == 0:
+        open_cells = [i for i in range(mod.CELLS) if not game.fixed[i]]
+        game.select(*divmod(random.choice(open_cells), 9))
+        game.enter(random.randint(0, 9))
+
+
+def script_tetris(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif frame % 12 == 0:
+        shift = random.randint(-4, 4)
+        for _ in range(abs(shift)):
+            if game.valid(game.piece, dx=1 if shift > 0 else -1):
+                game.piece.x += 1 if shift > 0 else -1
+        game.hard_drop()
+
+
+def script_whack_a_mole(game, frame, mod):
+    if game.game_over:
+        game.reset()
+    elif frame % 10 == 0:
+        visible = [m for m in game.moles if m.visible]
+        if visible:
+            game.click((visible[0].x, visible[0].y))
+
+
+SCRIPTS = {name[len("script_"):]: fn for name, fn in globals().items() if name.startswith("script_")}
+
+
+def percentiles(samples):
+    """Return mean/p50/p95/p99/max in milliseconds for a list of nanosecond samples."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q):
+        return round(ordered[min(last, int(round(q * last)))] / 1e6, 4)
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) / 1e6, 4),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] / 1e6, 4),
+    }
+
+
+def bench_game(folder, frames, warmup, seed):
+    """Run one game headlessly and return its timing summary."""
+    module = load_game_module(folder, ROOT_DIR)
+    script = SCRIPTS.get(folder)
+    random.seed(seed)
+    HELD.keys = set()
+    text.cache.clear()
+    game = module.Game()
+    update = getattr(game, "update", None)
+
+    update_ns, draw_ns = [], []
+    clock = time.perf_counter_ns
+    for frame in range(warmup + frames):
+        pygame.event.pump()
+        t0 = clock()
+        if script:
+            script(game, frame, module)
+        if update:
+            update()
+        t1 = clock()
+        game.draw()
+        t2 = clock()
+        if frame >= warmup:
+            update_ns.append(t1 - t0)
+            draw_ns.append(t2 - t1)
+
+    total = [u + d for u, d in zip(update_ns, draw_ns)]
+    return {
+        "frames": frames,
+        "scripted": script is not None,
+        "update": percentiles(update_ns),
+        "draw": percentiles(draw_ns),
+        "frame": percentiles(total),
+        "text_cache": text.cache.stats(),
+    }
+
+
+def compare(old, new, threshold):
+    """Print p95 frame-time changes against a previous run; return the regressed games."""
+    regressed = []
+    print(f"\n{'game':<20}{'old p95':>10}{'new p95':>10}{'change':>9}")
+    for name, result in new["games"].items():
+        before = old.get("games", {}).get(name)
+        if not before:
+            continue
+        a, b = before["frame"]["p95"], result["frame"]["p95"]
+        change = (b - a) / a if a else 0.0
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(f"{name:<20}{a:>10.3f}{b:>10.3f}{change:>+8.0%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for the pygame games.")
+    parser.add_argument("games", nargs="*", help="game folders to run (default: all pygame games)")
+    parser.add_argument("-n", "--frames", type=int, default=600, help="measured frames per game")
+    parser.add_argument("--warmup", type=int, default=60, help="unmeasured frames before timing starts")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for game and script")
+    parser.add_argument("-o", "--output", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare against an earlier JSON result")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="p95 slowdown that counts as a regression (default 0.15 = 15%%)")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.key.get_pressed = lambda: HELD
+
+    games = args.games or find_pygame_games()
+    results = {
+        "meta": {
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "timestamp": int(time.time()),
+        },
+        "games": {},
+    }
+
+    print(f"{'game':<20}{'update p50/p95/p99 ms':>26}{'draw p50/p95/p99 ms':>26}{'text hits':>11}")
+    for folder in games:
+        try:
+            result = bench_game(folder, args.frames, args.warmup, args.seed)
+        except Exception as e:
+            print(f"{folder:<20}failed: {e!r}")
+            continue
+        results["games"][folder] = result
+        u, d = result["update"], result["draw"]
+        print(f"{folder:<20}{u['p50']:>8.3f}{u['p95']:>9.3f}{u['p99']:>9.3f}"
+              f"{d['p50']:>8.3f}{d['p95']:>9.3f}{d['p99']:>9.3f}{result['text_cache']['hit_rate']:>10.0%}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        regressed = compare(old, results, args.threshold)
+        if regressed:
+            print(f"\nFrame-time regressions: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
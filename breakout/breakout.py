@@ -10,9 +10,14 @@ Controls:
 
 import pygame
 import sys
+import os
 import asyncio
 import math
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
@@ -82,6 +87,7 @@ class Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("🧱 Breakout")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 48)
         self.reset()
     
@@ -96,8 +102,43 @@ class Game:
                 self.bricks.append(Brick(col * BRICK_WIDTH + 10, row * BRICK_HEIGHT + 60, 
                                         COLORS[row], (6 - row) * 10))
     
+    def update(self):
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT]: self.paddle.move(-1)
+        if keys[pygame.K_RIGHT]: self.paddle.move(1)
+        
+        if self.game_over or self.victory:
+            return
+        self.ball.update()
+        if self.ball.get_rect().colliderect(self.paddle.get_rect()) and self.ball.active:
+            hit_pos = (self.ball.x - self.paddle.x) / PADDLE_WIDTH
+            self.ball.angle = -math.pi/2 + (hit_pos - 0.5) * math.pi * 0.6
+        for brick in self.bricks[:]:
+            if self.ball.get_rect().colliderect(brick.rect):
+                self.score += brick.points
+                self.bricks.remove(brick)
+                self.ball.angle = -self.ball.angle
+                break
+        if self.ball.y > WINDOW_HEIGHT:
+            self.lives -= 1
+            self.ball.reset() if self.lives > 0 else None
+            self.game_over = self.lives <= 0
+        self.victory = not self.bricks
+    
+    def draw(self):
+        self.screen.fill(BLACK)
+        for brick in self.bricks: brick.draw(self.screen)
+        self.paddle.draw(self.screen)
+        self.ball.draw(self.screen)
+        self.screen.blit(render_text(self.font, f"Score: {self.score}  Lives: {self.lives}", True, WHITE), (10, 10))
+        if self.game_over or self.victory:
+            text = "YOU WIN!" if self.victory else "GAME OVER"
+            self.screen.blit(render_text(self.font, text, True, WHITE), (WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2))
+        pygame.display.flip()
+    
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                     pygame.quit(); sys.exit()
@@ -105,36 +146,9 @@ class Game:
                     if event.key == pygame.K_r: self.reset()
                     if event.key == pygame.K_SPACE: self.ball.active = True
             
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]: self.paddle.move(-1)
-            if keys[pygame.K_RIGHT]: self.paddle.move(1)
-            
-            if not self.game_over and not self.victory:
-                self.ball.update()
-                if self.ball.get_rect().colliderect(self.paddle.get_rect()) and self.ball.active:
-                    hit_pos = (self.ball.x - self.paddle.x) / PADDLE_WIDTH
-                    self.ball.angle = -math.pi/2 + (hit_pos - 0.5) * math.pi * 0.6
-                for brick in self.bricks[:]:
-                    if self.ball.get_rect().colliderect(brick.rect):
-                        self.score += brick.points
-                        self.bricks.remove(brick)
-                        self.ball.angle = -self.ball.angle
-                        break
-                if self.ball.y > WINDOW_HEIGHT:
-                    self.lives -= 1
-                    self.ball.reset() if self.lives > 0 else None
-                    self.game_over = self.lives <= 0
-                self.victory = not self.bricks
-            
-            self.screen.fill(BLACK)
-            for brick in self.bricks: brick.draw(self.screen)
-            self.paddle.draw(self.screen)
-            self.ball.draw(self.screen)
-            self.screen.blit(self.font.render(f"Score: {self.score}  Lives: {self.lives}", True, WHITE), (10, 10))
-            if self.game_over or self.victory:
-                text = "YOU WIN!" if self.victory else "GAME OVER"
-                self.screen.blit(self.font.render(text, True, WHITE), (WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2))
-            pygame.display.flip()
+            for _ in range(self.timestep.advance()):
+                self.update()
+            self.draw()
             self.clock.tick(60)
 
 async def main():
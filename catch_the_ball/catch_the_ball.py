@@ -10,8 +10,13 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 WIDTH, HEIGHT = 600, 500
@@ -24,6 +29,7 @@ class Game:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("⚽ Catch the Ball")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 36)
         self.reset()
     
@@ -90,7 +96,7 @@ class Game:
                         (self.basket_x - 40, HEIGHT - 40, 80, 10))
         
         # Draw HUD
-        text = self.font.render(f"Score: {self.score}  Missed: {self.missed}/5", True, WHITE)
+        text = render_text(self.font, f"Score: {self.score}  Missed: {self.missed}/5", True, WHITE)
         self.screen.blit(text, (10, 10))
         
         if self.game_over:
@@ -98,22 +104,24 @@ class Game:
             overlay.set_alpha(180)
             overlay.fill(BLACK)
             self.screen.blit(overlay, (0, 0))
-            text = self.font.render(f"Game Over! Score: {self.score}", True, WHITE)
+            text = render_text(self.font, f"Game Over! Score: {self.score}", True, WHITE)
             self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 20))
-            text2 = self.font.render("Press R to restart", True, WHITE)
+            text2 = render_text(self.font, "Press R to restart", True, WHITE)
             self.screen.blit(text2, (WIDTH // 2 - text2.get_width() // 2, HEIGHT // 2 + 20))
         
         pygame.display.flip()
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
                     if event.key == pygame.K_r: self.reset()
             
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
 
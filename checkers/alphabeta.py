@@ -0,0 +1,253 @@
+"""
+🤖 Alpha-beta player for Checkers
+
+Iterative-deepening negamax with alpha-beta over draughts positions:
+- a fixed-size Zobrist-keyed transposition table, replaced by depth or age
+- move ordering: table move, then two killer moves per ply, then the
+  history score of each (from, to) pair
+- captures are compulsory, so a leaf where a capture is pending is searched
+  on until the position is quiet
+- a node budget per move; the deepest finished search wins
+
+Leaves are scored on material (kings worth more than men), how far men have
+advanced and whether the back row is still guarded. With a tablebase, any
+position it covers is scored from its result and distance like a won or
+lost game that ends that many plies later, instead of being searched
+further, so a won ending heads for the quickest win.
+
+search() is a generator that yields every `slice_nodes` nodes, so the game
+runs it a slice per frame on its loop (see gamekit.worker.run_in_steps).
+Budgeting nodes rather than milliseconds gives the same move, on the same
+frame, on every machine.
+
+Benchmark of engine speed at fixed depths:
+    python checkers/alphabeta.py --depth 8
+"""
+
+import time
+import random
+import argparse
+
+import draughts
+from draughts import RED, BLACK, legal_moves, squares
+from tablebase import WIN as TB_WON, LOSS as TB_LOST, DRAW as TB_DRAWN
+
+WIN = 100000
+MAN, KING = 100, 160
+EXACT, LOWER, UPPER = range(3)
+MAX_PLY = 64
+# Rows a man has advanced, per square, for each side
+ADVANCE = [[7 - s // 4 for s in range(draughts.SQUARES)], [s // 4 for s in range(draughts.SQUARES)]]
+BACK_ROW = (0xF0000000, 0x0000000F)
+
+
+class _Timeout(Exception):
+    pass
+
+
+def evaluate(position):
+    """Score for the side to move."""
+    score = 0
+    kings = position.kings
+    for side, sign in ((RED, 1), (BLACK, -1)):
+        pieces = position.sides[side]
+        men = pieces & ~kings
+        value = MAN * bin(men).count("1") + KING * bin(pieces & kings).count("1")
+        value += 2 * sum(ADVANCE[side][s] for s in squares(men))
+        value += 8 * bin(men & BACK_ROW[side]).count("1")
+        score += sign * value
+    return score if position.turn == RED else -score
+
+
+class Searcher:
+    def __init__(self, node_budget=16000, slice_nodes=256, table_bits=18, tablebase=None):
+        self.node_budget = node_budget
+        self.slice_nodes = slice_nodes
+        self.tablebase = tablebase
+        self.size = 1 << table_bits
+        self.table = [None] * self.size         # (hash, depth, flag, value, move, generation)
+        self.generation = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {}
+        self.node_limit = None
+        self.nodes = 0
+        self.tablebase_hits = 0
+        self.depth_reached = 0
+
+    def best_move(self, position, depth=None):
+        """Best legal move, searched to `depth` or until the node budget runs out."""
+        search = self.search(position, depth)
+        while True:
+            try:
+                next(search)
+            except StopIteration as stop:
+                return stop.value
+
+    def search(self, position, depth=None):
+        """Generator form of best_move(): yields between slices, returns the move."""
+        position = position.copy()
+        moves = legal_moves(position)
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+        self.generation += 1
+        self.nodes = 0
+        self.tablebase_hits = 0
+        self.depth_reached = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+
+        best = moves[0]
+        for d in range(1, (depth or MAX_PLY - 1) + 1):
+            # Depth 1 always finishes so there is an answer to give
+            self.node_limit = self.node_budget if depth is None and d > 1 else None
+            try:
+                value, best = yield from self.search_root(position, moves, d)
+            except _Timeout:
+                break
+            self.depth_reached = d
+            moves.remove(best)
+            moves.insert(0, best)
+            if abs(value) > WIN - MAX_PLY:
+                break
+        return best
+
+    def search_root(self, position, moves, depth):
+        alpha = -WIN
+        best_value, best_move = None, moves[0]
+        for move in moves:
+            undo = position.play(move)
+            value = -(yield from self.negamax(position, depth - 1, 1, -WIN, -alpha))
+            position.restore(undo)
+            if best_value is None or value > best_value:
+                best_value, best_move = value, move
+            if value > alpha:
+                alpha = value
+        return best_value, best_move
+
+    def store(self, key, depth, flag, value, move):
+        slot = key & (self.size - 1)
+        old = self.table[slot]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.table[slot] = (key, depth, flag, value, move, self.generation)
+
+    def order(self, moves, tt_move, ply):
+        killers = self.killers[ply]
+        history = self.history
+
+        def score(move):
+            if move == tt_move:
+                return 1 << 30
+            if move == killers[0] or move == killers[1]:
+                return 1 << 29
+            return history.get((move.path[0], move.path[-1]), 0)
+
+        moves.sort(key=score, reverse=True)
+
+    def negamax(self, position, depth, ply, alpha, beta):
+        self.nodes += 1
+        if not self.nodes % self.slice_nodes:
+            if self.node_limit is not None and self.nodes > self.node_limit:
+                raise _Timeout
+            yield
+        if self.tablebase is not None:
+            entry = self.tablebase.probe(position)
+            if entry is not None:
+                self.tablebase_hits += 1
+                result, distance = entry
+                if result == TB_WON:
+                    return WIN - (ply + distance)
+                if result == TB_LOST:
+                    return -(WIN - (ply + distance))
+                if result == TB_DRAWN:
+                    return 0
+        moves = legal_moves(position)
+        if not moves:
+            return -(WIN - ply)
+        capturing = moves[0].captured != 0
+        if (depth <= 0 and not capturing) or ply >= MAX_PLY - 1:
+            return evaluate(position)
+
+        key = position.hash
+        entry = self.table[key & (self.size - 1)]
+        tt_move = None
+        if entry is not None and entry[0] == key:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                value = entry[3]
+                if entry[2] == EXACT:
+                    return value
+                if entry[2] == LOWER and value > alpha:
+                    alpha = value
+                elif entry[2] == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        if len(moves) > 1:
+            self.order(moves, tt_move, ply)
+        start_alpha = alpha
+        best_value, best_move = -WIN, None
+        for move in moves:
+            undo = position.play(move)
+            value = -(yield from self.negamax(position, depth - 1, ply + 1, -beta, -alpha))
+            position.restore(undo)
+            if value > best_value:
+                best_value, best_move = value, move
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    if not move.captured:
+                        killers = self.killers[ply]
+                        if killers[0] != move:
+                            killers[1], killers[0] = killers[0], move
+                        pair = (move.path[0], move.path[-1])
+                        self.history[pair] = self.history.get(pair, 0) + depth * depth
+                    break
+
+        if best_value <= start_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.store(key, depth, flag, best_value, best_move)
+        return best_value
+
+
+def benchmark_positions(count, seed=0, plies=12):
+    """Positions reached by random play from the start, for repeatable benchmarks."""
+    rng = random.Random(seed)
+    positions = [draughts.Position()]
+    while len(positions) < count:
+        position = draughts.Position()
+        for _ in range(plies):
+            moves = legal_moves(position)
+            if not moves:
+                break
+            position.play(rng.choice(moves))
+        if legal_moves(position):
+            positions.append(position)
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure checkers search speed at fixed depths.")
+    parser.add_argument("--depth", type=int, default=7, help="deepest fixed-depth search")
+    parser.add_argument("--positions", type=int, default=8, help="positions searched at each depth")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random openings")
+    args = parser.parse_args()
+
+    positions = benchmark_positions(args.positions, args.seed)
+    print(f"{'depth':>5}{'nodes':>12}{'seconds':>10}{'nodes/s':>10}")
+    for depth in range(1, args.depth + 1):
+        nodes = 0
+        start = time.perf_counter()
+        for position in positions:
+            searcher = Searcher()
+            searcher.best_move(position, depth=depth)
+            nodes += searcher.nodes
+        elapsed = time.perf_counter() - start
+        print(f"{depth:>5}{nodes:>12}{elapsed:>10.2f}{nodes / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
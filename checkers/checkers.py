@@ -4,13 +4,25 @@ Classic checkers board game!
 
 Controls:
 - Click piece to select, click destination to move
+- Captures are compulsory and multi-jumps are made in one click; when two
+  capture chains land on the same square, click the chain's squares in turn
+- C to play against the computer (black)
 - ESC to quit, R to restart
 """
 
 import pygame
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+from gamekit.worker import run_in_steps
+import draughts
+from alphabeta import Searcher
+from tablebase import endgame_tablebase
+
 pygame.init()
 
 SIZE = 600
@@ -22,6 +34,12 @@ CREAM = (255, 220, 180)
 BROWN = (139, 90, 43)
 GREEN = (50, 200, 50)
 
+SIDE_COLORS = {draughts.RED: RED, draughts.BLACK: BLACK}
+# Search nodes per computer move, and per frame (about 8 ms); the search runs
+# a slice per frame on the game loop, so it never blocks and replays exactly
+AI_NODES = 20000
+AI_SLICE = 256
+
 class Piece:
     def __init__(self, row, col, color):
         self.row, self.col = row, col
@@ -42,57 +60,126 @@ class Game:
         pygame.display.set_caption("🔲 Checkers")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 48)
+        self.dirty = DirtyRects()
+        self.vs_ai = False
         self.reset()
     
     def reset(self):
+        self.position = draughts.Position()
         self.pieces = []
-        for row in range(8):
-            for col in range(8):
-                if (row + col) % 2 == 1:
-                    if row < 3:
-                        self.pieces.append(Piece(row, col, BLACK))
-                    elif row > 4:
-                        self.pieces.append(Piece(row, col, RED))
+        # grid[row][col] -> Piece or None, kept in step with self.pieces by move()
+        self.grid = [[None] * 8 for _ in range(8)]
+        for square in range(draughts.SQUARES):
+            occupant = self.position.piece_at(square)
+            if occupant:
+                row, col = draughts.coords(square)
+                piece = Piece(row, col, SIDE_COLORS[occupant[0]])
+                self.pieces.append(piece)
+                self.grid[row][col] = piece
         self.selected = None
         self.turn = RED
+        # Squares to click next as (row, col, move), the moves the selection can still become,
+        # and how many squares of their paths have been clicked so far
         self.valid_moves = []
+        self.candidates = []
+        self.hops = 1
+        self.legal_moves = draughts.legal_moves(self.position)
+        self.winner = None
+        # A fresh searcher per game, so a search abandoned by the restart can't share its table
+        self.ai = Searcher(node_budget=AI_NODES, slice_nodes=AI_SLICE, tablebase=endgame_tablebase())
+        self.search = None
+        # Hash of the position the running search was started from
+        self.searched = None
+        self.dirty.mark_all()
+    
+    def cell_rect(self, row, col):
+        return pygame.Rect(col * CELL, row * CELL, CELL, CELL)
+    
+    def mark_selection(self):
+        if self.selected:
+            self.dirty.mark(self.cell_rect(self.selected.row, self.selected.col))
+        self.dirty.mark(*(self.cell_rect(r, c) for r, c, _ in self.valid_moves))
     
     def get_piece(self, row, col):
-        for p in self.pieces:
-            if p.row == row and p.col == col:
-                return p
-        return None
+        return self.grid[row][col]
     
     def get_valid_moves(self, piece):
-        moves = []
-        directions = [(-1, -1), (-1, 1)] if piece.color == RED else [(1, -1), (1, 1)]
-        if piece.king:
-            directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        
-        for dr, dc in directions:
-            nr, nc = piece.row + dr, piece.col + dc
-            if 0 <= nr < 8 and 0 <= nc < 8:
-                if not self.get_piece(nr, nc):
-                    moves.append((nr, nc, None))
-                else:
-                    target = self.get_piece(nr, nc)
-                    if target.color != piece.color:
-                        jr, jc = nr + dr, nc + dc
-                        if 0 <= jr < 8 and 0 <= jc < 8 and not self.get_piece(jr, jc):
-                            moves.append((jr, jc, target))
-        return moves
-    
-    def move(self, piece, row, col, captured):
+        """(row, col, move) for every legal move of `piece`; empty if another piece must capture."""
+        start = draughts.square_at(piece.row, piece.col)
+        return [draughts.coords(move.path[-1]) + (move,) for move in self.legal_moves if move.path[0] == start]
+    
+    def select(self, piece):
+        self.selected = piece
+        self.candidates = [move for _, _, move in self.get_valid_moves(piece)]
+        self.hops = 1
+        self.valid_moves = self.targets()
+    
+    def targets(self):
+        """Each candidate's landing square; while two candidates land on the same
+        square, the next square along each path instead."""
+        ends = [move.path[-1] for move in self.candidates]
+        if len(set(ends)) == len(ends):
+            return [draughts.coords(move.path[-1]) + (move,) for move in self.candidates]
+        return [draughts.coords(move.path[min(self.hops, len(move.path) - 1)]) + (move,) for move in self.candidates]
+    
+    def advance(self, row, col):
+        """Follow a click on (row, col); True if the selection stays because a capture chain needs its next square."""
+        chosen = [move for r, c, move in self.valid_moves if (r, c) == (row, col)]
+        if len(chosen) == 1:
+            self.move(self.selected, *draughts.coords(chosen[0].path[-1]), chosen[0])
+            return False
+        if not chosen:
+            return False
+        self.candidates = chosen
+        self.hops += 1
+        self.valid_moves = self.targets()
+        return True
+    
+    def move(self, piece, row, col, move):
+        for square in move.path:
+            self.dirty.mark(self.cell_rect(*draughts.coords(square)))
+        self.grid[piece.row][piece.col] = None
+        for square in draughts.squares(move.captured):
+            r, c = draughts.coords(square)
+            self.pieces.remove(self.grid[r][c])
+            self.grid[r][c] = None
         piece.row, piece.col = row, col
-        if captured:
-            self.pieces.remove(captured)
-        if (piece.color == RED and row == 0) or (piece.color == BLACK and row == 7):
-            piece.king = True
+        self.grid[row][col] = piece
+        self.position.play(move)
+        piece.king = bool(self.position.kings >> move.path[-1] & 1)
         self.turn = BLACK if self.turn == RED else RED
+        self.legal_moves = draughts.legal_moves(self.position)
+        if not self.legal_moves:
+            # No pieces left or all of them blocked
+            self.winner = piece.color
+            self.dirty.mark_all()
+    
+    def ai_turn(self):
+        return self.vs_ai and self.turn == BLACK and not self.winner
+    
+    def toggle_ai(self):
+        # Switching sides mid-search abandons it, so its move can't land on a later position
+        self.vs_ai = not self.vs_ai
+        self.search = None
+    
+    def update_ai(self):
+        if self.search is not None:
+            if self.search.step():
+                move = self.search.result()
+                self.search = None
+                if self.ai_turn() and self.position.hash == self.searched:
+                    row, col = draughts.coords(move.path[0])
+                    self.move(self.grid[row][col], *draughts.coords(move.path[-1]), move)
+        elif self.ai_turn():
+            self.searched = self.position.hash
+            self.search = run_in_steps(self.ai.search(self.position.copy()))
     
     def draw_board(self):
+        clip = self.screen.get_clip()
         for row in range(8):
             for col in range(8):
+                if not clip.colliderect(self.cell_rect(row, col)):
+                    continue
                 color = CREAM if (row + col) % 2 == 0 else BROWN
                 pygame.draw.rect(self.screen, color, (col * CELL, row * CELL, CELL, CELL))
         
@@ -101,46 +188,51 @@ class Game:
                              (move[1] * CELL + CELL // 2, move[0] * CELL + CELL // 2), 15)
         
         for piece in self.pieces:
-            piece.draw(self.screen)
+            if clip.colliderect(self.cell_rect(piece.row, piece.col)):
+                piece.draw(self.screen)
         
         if self.selected:
             x = self.selected.col * CELL + CELL // 2
             y = self.selected.row * CELL + CELL // 2
             pygame.draw.circle(self.screen, GREEN, (x, y), CELL // 2 - 5, 4)
     
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        self.draw_board()
+        
+        if self.winner:
+            winner = "Red" if self.winner == RED else "Black"
+            text = render_text(self.font, f"{winner} Wins!", True, WHITE)
+            self.screen.blit(text, (SIZE // 2 - text.get_width() // 2, SIZE // 2))
+    
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
+    
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.dirty.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
                     if event.key == pygame.K_r: self.reset()
-                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.key == pygame.K_c: self.toggle_ai()
+                if event.type == pygame.MOUSEBUTTONDOWN and not self.ai_turn():
                     col, row = event.pos[0] // CELL, event.pos[1] // CELL
                     piece = self.get_piece(row, col)
+                    self.mark_selection()
                     
                     if self.selected:
-                        for move in self.valid_moves:
-                            if move[0] == row and move[1] == col:
-                                self.move(self.selected, row, col, move[2])
-                                break
-                        self.selected = None
-                        self.valid_moves = []
+                        if not self.advance(row, col):
+                            self.selected = None
+                            self.valid_moves = []
                     elif piece and piece.color == self.turn:
-                        self.selected = piece
-                        self.valid_moves = self.get_valid_moves(piece)
-            
-            self.draw_board()
-            
-            # Check win
-            red_count = sum(1 for p in self.pieces if p.color == RED)
-            black_count = sum(1 for p in self.pieces if p.color == BLACK)
-            if red_count == 0 or black_count == 0:
-                winner = "Red" if black_count == 0 else "Black"
-                text = self.font.render(f"{winner} Wins!", True, WHITE)
-                self.screen.blit(text, (SIZE // 2 - text.get_width() // 2, SIZE // 2))
+                        self.select(piece)
+                    self.mark_selection()
             
-            pygame.display.flip()
+            self.update_ai()
+            self.draw()
             self.clock.tick(60)
 
 async def main():
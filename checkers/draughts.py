@@ -0,0 +1,174 @@
+"""
+🔲 Checkers rules on 32 squares
+
+Only the dark squares are played, numbered 0-31 row by row from the top
+(square 0 is row 0, column 1). A position is three 32-bit masks, one per
+side plus one for kings, so finding or moving a piece is a bit operation.
+play() also keeps a Zobrist hash of the position up to date for searches.
+
+English draughts rules, as the game plays them: red moves first and up the
+board, black moves down; men move and capture forwards, kings both ways, one
+square at a time. Capturing is compulsory, a capture continues while the
+same piece can keep jumping, and a man that reaches the far row is crowned
+and ends its move there, even in the middle of a jump chain. A side with no
+legal move loses.
+
+    position = Position()
+    for move in legal_moves(position): ...
+    undo = position.play(move)
+    position.restore(undo)
+"""
+
+import random
+from collections import namedtuple
+
+RED, BLACK = 0, 1
+SQUARES = 32
+# Diagonal directions as (row step, column step); red's forward moves come first
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+FORWARD = ((0, 1), (2, 3))
+ALL_DIRECTIONS = (0, 1, 2, 3)
+PROMOTION = (0x0000000F, 0xF0000000)     # row 0 for red, row 7 for black
+
+# ZOBRIST[side][is_king][square], plus one key for black to move
+_rng = random.Random(0xD4)
+ZOBRIST = [[[_rng.getrandbits(64) for _ in range(SQUARES)] for _ in range(2)] for _ in range(2)]
+ZOBRIST_BLACK_TO_MOVE = _rng.getrandbits(64)
+
+# A move: the squares the piece visits (from, ..., to) and a mask of the pieces it takes
+Move = namedtuple("Move", "path captured")
+
+
+def coords(square):
+    row = square // 4
+    return row, 2 * (square % 4) + (1 - row % 2)
+
+
+def square_at(row, col):
+    """Square number of (row, col), or None for a light square or off the board."""
+    if not (0 <= row < 8 and 0 <= col < 8) or (row + col) % 2 == 0:
+        return None
+    return row * 4 + col // 2
+
+
+def _build_tables():
+    steps = []
+    jumps = []
+    for square in range(SQUARES):
+        row, col = coords(square)
+        steps.append([square_at(row + dr, col + dc) for dr, dc in DIRECTIONS])
+        square_jumps = []
+        for dr, dc in DIRECTIONS:
+            over, land = square_at(row + dr, col + dc), square_at(row + 2 * dr, col + 2 * dc)
+            square_jumps.append((over, land) if over is not None and land is not None else None)
+        jumps.append(square_jumps)
+    return steps, jumps
+
+
+# STEPS[square][direction] -> neighbouring square or None
+# JUMPS[square][direction] -> (jumped square, landing square) or None
+STEPS, JUMPS = _build_tables()
+
+
+def squares(mask):
+    """Square numbers of the set bits in `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Position:
+    def __init__(self, red=0xFFF00000, black=0x00000FFF, kings=0, turn=RED):
+        self.sides = [red, black]
+        self.kings = kings
+        self.turn = turn
+        self.hash = self.zobrist_hash()
+
+    def zobrist_hash(self):
+        key = ZOBRIST_BLACK_TO_MOVE if self.turn == BLACK else 0
+        for side in (RED, BLACK):
+            for square in squares(self.sides[side]):
+                key ^= ZOBRIST[side][self.kings >> square & 1][square]
+        return key
+
+    def copy(self):
+        return Position(self.sides[RED], self.sides[BLACK], self.kings, self.turn)
+
+    def count(self, side):
+        return bin(self.sides[side]).count("1")
+
+    def piece_at(self, square):
+        """(side, is_king) of the piece on `square`, or None."""
+        bit = 1 << square
+        for side in (RED, BLACK):
+            if self.sides[side] & bit:
+                return side, bool(self.kings & bit)
+        return None
+
+    def play(self, move):
+        """Make `move` and return what restore() needs to take it back."""
+        undo = (self.sides[RED], self.sides[BLACK], self.kings, self.turn, self.hash)
+        me = self.turn
+        first, last = move.path[0], move.path[-1]
+        start, end = 1 << first, 1 << last
+        key = self.hash ^ ZOBRIST_BLACK_TO_MOVE
+        was_king = self.kings >> first & 1
+        crowned = was_king or PROMOTION[me] >> last & 1
+        key ^= ZOBRIST[me][was_king][first] ^ ZOBRIST[me][crowned][last]
+        for square in squares(move.captured):
+            key ^= ZOBRIST[1 - me][self.kings >> square & 1][square]
+        self.sides[me] ^= start | end
+        self.sides[1 - me] &= ~move.captured
+        self.kings &= ~(move.captured | start)
+        if crowned:
+            self.kings |= end
+        self.turn = 1 - me
+        self.hash = key
+        return undo
+
+    def restore(self, undo):
+        self.sides[RED], self.sides[BLACK], self.kings, self.turn, self.hash = undo
+
+
+def _jumps(path, king, side, occupied, theirs, captured, out):
+    square = path[-1]
+    extended = False
+    for d in ALL_DIRECTIONS if king else FORWARD[side]:
+        jump = JUMPS[square][d]
+        if jump is None:
+            continue
+        over, land = jump
+        if theirs >> over & 1 and not captured >> over & 1 and not occupied >> land & 1:
+            extended = True
+            path.append(land)
+            if not king and PROMOTION[side] >> land & 1:
+                # Crowned on the far row: the move ends here
+                out.append(Move(tuple(path), captured | 1 << over))
+            else:
+                _jumps(path, king, side, occupied, theirs, captured | 1 << over, out)
+            path.pop()
+    if not extended and captured:
+        out.append(Move(tuple(path), captured))
+
+
+def legal_moves(position):
+    """Every legal move for the side to move: all capture chains if any exist, else all steps."""
+    side = position.turn
+    mine = position.sides[side]
+    theirs = position.sides[1 - side]
+    occupied = mine | theirs
+    kings = position.kings
+    captures = []
+    for square in squares(mine):
+        # The moving piece leaves its square, so a chain may pass back over it
+        _jumps([square], kings >> square & 1, side, occupied & ~(1 << square), theirs, 0, captures)
+    if captures:
+        return captures
+    moves = []
+    for square in squares(mine):
+        for d in ALL_DIRECTIONS if kings >> square & 1 else FORWARD[side]:
+            target = STEPS[square][d]
+            if target is not None and not occupied >> target & 1:
+                moves.append(Move((square, target), 0))
+    return moves
@@ -0,0 +1,358 @@
+"""
+📚 Checkers endgame tablebase
+
+Win/loss/draw for every position with few pieces left, and for wins and
+losses the number of plies until the game ends with best play (the winner
+hurrying, the loser holding out), solved once offline and probed in
+constant time during play.
+
+Positions are grouped by material: (red men, red kings, black men, black
+kings). Within a group a position's index is the combinatorial rank of each
+kind of piece's squares (men never stand on their own crowning row), times
+two for the side to move. Overlapping placements get an index too and are
+stored as UNUSED, which keeps indexing simple at a small cost in space.
+
+Each group is solved by retrograde analysis: forward moves are generated
+once to link every position to its successors, positions with no move are
+losses, and results are pushed back through the predecessor lists in order
+of distance - a position is won in one more ply than its nearest lost
+successor, and lost in one more ply than its farthest won successor once
+every successor is won. Whatever is left over is a draw. Captures and
+crowning lead into groups that are solved earlier, so groups are solved in
+order of piece count, then number of men, with each batch of independent
+groups spread over worker processes.
+
+A lost position is an even number of plies from the end and a won one an
+odd number, so one byte per position holds both: 0 for a draw, the distance
+plus one for a win or loss, and UNUSED for an overlapping placement.
+
+File layout (little-endian): header, one record per group, then the bytes:
+    b"CKTB", version, max pieces, group count
+    rm, rk, bm, bk, byte offset, position count      (per group)
+
+    python checkers/tablebase.py --pieces 3          # writes checkers/endgame.tb
+"""
+
+import os
+import time
+import struct
+import random
+import argparse
+from math import comb
+from concurrent.futures import ProcessPoolExecutor
+
+from draughts import RED, BLACK, Position, legal_moves, squares
+
+try:
+    import mmap
+except ImportError:                     # not every Python build has it
+    mmap = None
+
+DRAW, WIN, LOSS, ILLEGAL = range(4)
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "endgame.tb")
+MAGIC = b"CKTB"
+VERSION = 2
+UNUSED = 255
+MAX_DISTANCE = UNUSED - 2
+HEADER = struct.Struct("<4sBBH")
+GROUP = struct.Struct("<4BII")
+
+# Squares each kind of piece may stand on: men never sit on their crowning row
+MAN_SQUARES = (list(range(4, 32)), list(range(0, 28)))
+KING_SQUARES = list(range(32))
+_MAN_LOCAL = [{s: i for i, s in enumerate(MAN_SQUARES[side])} for side in (RED, BLACK)]
+# _COMB[n][k] == comb(n, k), looked up on every probe
+_COMB = [[comb(n, k) for k in range(33)] for n in range(33)]
+
+
+def _rank(local):
+    """Colexicographic rank of a sorted list of distinct small ints."""
+    return sum(_COMB[x][i + 1] for i, x in enumerate(local))
+
+
+def _unrank(rank, k):
+    local = []
+    for i in range(k, 0, -1):
+        x = i - 1
+        while comb(x + 1, i) <= rank:
+            x += 1
+        local.append(x)
+        rank -= comb(x, i)
+    return local[::-1]
+
+
+def _group_shape(group):
+    rm, rk, bm, bk = group
+    return ((len(MAN_SQUARES[RED]), rm), (len(KING_SQUARES), rk),
+            (len(MAN_SQUARES[BLACK]), bm), (len(KING_SQUARES), bk))
+
+
+def group_size(group):
+    size = 2
+    for n, k in _group_shape(group):
+        size *= comb(n, k)
+    return size
+
+
+def groups(max_pieces):
+    """Every material group with both sides on the board, in the order they must be solved."""
+    found = []
+    for pieces in range(2, max_pieces + 1):
+        for rm in range(pieces + 1):
+            for rk in range(pieces - rm + 1):
+                for bm in range(pieces - rm - rk + 1):
+                    bk = pieces - rm - rk - bm
+                    if rm + rk and bm + bk:
+                        found.append((rm, rk, bm, bk))
+    # Capturing lowers the piece count and crowning lowers the number of men
+    found.sort(key=lambda g: (sum(g), g[0] + g[2]))
+    return found
+
+
+def locate(position):
+    """(group, index) of a position."""
+    red, black, kings = position.sides[RED], position.sides[BLACK], position.kings
+    parts = (
+        [_MAN_LOCAL[RED][s] for s in squares(red & ~kings)],
+        list(squares(red & kings)),
+        [_MAN_LOCAL[BLACK][s] for s in squares(black & ~kings)],
+        list(squares(black & kings)),
+    )
+    group = tuple(len(p) for p in parts)
+    index = 0
+    for (n, k), local in zip(_group_shape(group), parts):
+        index = index * _COMB[n][k] + _rank(local)
+    return group, index * 2 + position.turn
+
+
+def position_at(group, index):
+    """The position at `index` in `group`, or None if its pieces overlap."""
+    turn = index & 1
+    index >>= 1
+    shape = _group_shape(group)
+    ranks = []
+    for n, k in reversed(shape):
+        index, rank = divmod(index, comb(n, k))
+        ranks.append(rank)
+    ranks.reverse()
+    masks = []
+    for (n, k), rank, allowed in zip(shape, ranks, (MAN_SQUARES[RED], KING_SQUARES, MAN_SQUARES[BLACK], KING_SQUARES)):
+        mask = 0
+        for x in _unrank(rank, k):
+            mask |= 1 << allowed[x]
+        masks.append(mask)
+    red_men, red_kings, black_men, black_kings = masks
+    total = bin(red_men | red_kings | black_men | black_kings).count("1")
+    if total != sum(group):
+        return None
+    return Position(red_men | red_kings, black_men | black_kings, red_kings | black_kings, turn)
+
+
+def _entry(tables, group, index):
+    """(result, distance) of a position in an already solved group."""
+    # The side to move with no pieces left has lost
+    if index & 1 == RED and not group[0] + group[1] or index & 1 == BLACK and not group[2] + group[3]:
+        return LOSS, 0
+    return _decode(tables[group][index])
+
+
+def _decode(value):
+    if not value:
+        return DRAW, 0
+    return (WIN if value & 1 == 0 else LOSS), value - 1
+
+
+def solve_group(group, tables):
+    """Solve one group by retrograde analysis; `tables` holds the solved groups it can reach."""
+    size = group_size(group)
+    values = bytearray(size)
+    distances = [0] * size
+    remaining = [0] * size
+    # Longest win among the successors seen so far, for positions that may turn out lost
+    farthest = [0] * size
+    predecessors = [[] for _ in range(size)]
+    # pending[d]: (index, result) proposed at distance d; the first proposal
+    # reached for an index is its shortest win or, for a loss, its only one
+    pending = [[]]
+
+    def propose(index, result, distance):
+        while len(pending) <= distance:
+            pending.append([])
+        pending[distance].append((index, result))
+
+    for index in range(size):
+        position = position_at(group, index)
+        if position is None:
+            values[index] = ILLEGAL
+            continue
+        nearest_loss = None
+        open_moves = 0
+        moves = legal_moves(position)
+        for move in moves:
+            undo = position.play(move)
+            next_group, next_index = locate(position)
+            position.restore(undo)
+            if next_group == group:
+                predecessors[next_index].append(index)
+                open_moves += 1
+                continue
+            value, distance = _entry(tables, next_group, next_index)
+            if value == LOSS:
+                if nearest_loss is None or distance < nearest_loss:
+                    nearest_loss = distance
+            elif value == WIN:
+                farthest[index] = max(farthest[index], distance + 1)
+            else:
+                # Never resolves to a win for the opponent
+                open_moves += 1
+        if nearest_loss is not None:
+            # Won, though a shorter win may still turn up inside the group
+            remaining[index] = -1
+            propose(index, WIN, nearest_loss + 1)
+        elif not open_moves:
+            propose(index, LOSS, farthest[index])
+        else:
+            remaining[index] = open_moves
+
+    distance = 0
+    while distance < len(pending):
+        for index, result in pending[distance]:
+            if values[index]:
+                continue
+            values[index] = result
+            distances[index] = distance
+            for previous in predecessors[index]:
+                if values[previous]:
+                    continue
+                if result == LOSS:
+                    remaining[previous] = -1
+                    propose(previous, WIN, distance + 1)
+                elif remaining[previous] > 0:
+                    farthest[previous] = max(farthest[previous], distance + 1)
+                    remaining[previous] -= 1
+                    if not remaining[previous]:
+                        propose(previous, LOSS, farthest[previous])
+        distance += 1
+
+    longest = max(distances)
+    if longest > MAX_DISTANCE:
+        raise ValueError(f"group {group} has a {longest}-ply ending, longer than MAX_DISTANCE")
+    return group, bytes(UNUSED if value == ILLEGAL else d + 1 if value else 0 for value, d in zip(values, distances))
+
+
+class Tablebase:
+    def __init__(self, path=TABLE_PATH):
+        """Map a tablebase file; an absent file gives an empty tablebase that never answers."""
+        self.max_pieces = 0
+        self.groups = {}
+        self.data = b""
+        self.file = None
+        try:
+            self.file = open(path, "rb")
+        except OSError:
+            return
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            self.data = self.file.read()
+        magic, version, self.max_pieces, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.max_pieces = 0
+            return
+        for i in range(count):
+            rm, rk, bm, bk, offset, _ = GROUP.unpack_from(self.data, HEADER.size + i * GROUP.size)
+            self.groups[(rm, rk, bm, bk)] = offset
+
+    def probe(self, position):
+        """(WIN, LOSS or DRAW for the side to move, plies until the game ends), or None if the position is not covered."""
+        if bin(position.sides[RED] | position.sides[BLACK]).count("1") > self.max_pieces:
+            return None
+        group, index = locate(position)
+        offset = self.groups.get(group)
+        if offset is None:
+            return None
+        return _decode(self.data[offset + index])
+
+
+_tablebase = None
+
+
+def endgame_tablebase():
+    """The shipped tablebase, mapped once."""
+    global _tablebase
+    if _tablebase is None:
+        _tablebase = Tablebase()
+    return _tablebase
+
+
+def generate(max_pieces, jobs):
+    tables = {}
+    batches = {}
+    for group in groups(max_pieces):
+        batches.setdefault((sum(group), group[0] + group[2]), []).append(group)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for key in sorted(batches):
+            batch = batches[key]
+            for group, packed in pool.map(solve_group, batch, [tables] * len(batch)):
+                tables[group] = packed
+    return tables
+
+
+def write(tables, max_pieces, path):
+    order = groups(max_pieces)
+    offset = HEADER.size + GROUP.size * len(order)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_pieces, len(order)))
+        for group in order:
+            f.write(GROUP.pack(*group, offset, group_size(group)))
+            offset += len(tables[group])
+        for group in order:
+            f.write(tables[group])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the checkers endgame tablebase.")
+    parser.add_argument("--pieces", type=int, default=3, help="solve positions with up to this many pieces")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("-o", "--output", default=TABLE_PATH, help="tablebase file")
+    parser.add_argument("--probes", type=int, default=100000, help="random probes for the latency check")
+    args = parser.parse_args()
+
+    order = groups(args.pieces)
+    total = sum(group_size(g) for g in order)
+    print(f"Solving {len(order)} material groups, {total} positions, with {args.jobs} workers")
+    start = time.perf_counter()
+    tables = generate(args.pieces, args.jobs)
+    elapsed = time.perf_counter() - start
+    write(tables, args.pieces, args.output)
+    print(f"Solved in {elapsed:.1f}s ({total / elapsed:.0f} positions/s), "
+          f"wrote {os.path.getsize(args.output)} bytes to {args.output}")
+
+    counts = [0] * 4
+    longest = 0
+    for group in order:
+        for value in tables[group]:
+            result, distance = (ILLEGAL, 0) if value == UNUSED else _decode(value)
+            counts[result] += 1
+            if result == WIN:
+                longest = max(longest, distance)
+    print(f"{counts[WIN]} wins, {counts[LOSS]} losses, {counts[DRAW]} draws, {counts[ILLEGAL]} unused slots; "
+          f"the longest win takes {longest} plies")
+
+    table = Tablebase(args.output)
+    rng = random.Random(0)
+    samples = []
+    while len(samples) < min(args.probes, 1000):
+        group = rng.choice(order)
+        position = position_at(group, rng.randrange(group_size(group)))
+        if position is not None:
+            samples.append(position)
+    start = time.perf_counter()
+    for i in range(args.probes):
+        table.probe(samples[i % len(samples)])
+    elapsed = time.perf_counter() - start
+    print(f"Probe latency {elapsed / args.probes * 1e6:.2f} us ({args.probes} probes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,22 @@ Drop discs to connect four in a row!
 Controls:
 - 1-7 keys to drop disc in column
 - Click on column to drop
+- C to play against the computer (yellow)
 - ESC to quit, R to restart
 """
 
 import pygame
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+from gamekit.worker import run_in_steps
+from position import Position
+from solver import Solver, opening_book
+
 pygame.init()
 
 COLS, ROWS = 7, 6
@@ -25,92 +34,134 @@ RED = (255, 50, 50)
 YELLOW = (255, 220, 0)
 WHITE = (255, 255, 255)
 
+# Search nodes per computer move, and per frame (about 8 ms); the search runs
+# a slice per frame on the game loop, so it never blocks and replays exactly
+AI_NODES = 40000
+AI_SLICE = 512
+
+# Preview disc and status text share the strip above the board
+TOP_RECT = pygame.Rect(0, 0, WIDTH, CELL_SIZE)
+
 class Game:
     def __init__(self):
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("🔴 Connect Four")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 48)
+        self.dirty = DirtyRects()
+        self.vs_ai = False
         self.reset()
     
     def reset(self):
-        self.board = [[0] * COLS for _ in range(ROWS)]
+        self.position = Position()
+        # A fresh solver per game, so a search abandoned by the restart can't share its table
+        self.ai = Solver(node_budget=AI_NODES, slice_nodes=AI_SLICE, book=opening_book())
+        self.search = None
+        # Hash of the position the running search was started from
+        self.searched = None
         self.current = 1
         self.winner = 0
         self.game_over = False
+        self.dirty.mark_all()
+    
+    def cell_rect(self, row, col):
+        return pygame.Rect(col * CELL_SIZE, (row + 1) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
     
     def drop(self, col):
-        if self.game_over or col < 0 or col >= COLS:
+        if self.game_over or not self.position.can_play(col):
             return False
-        for row in range(ROWS - 1, -1, -1):
-            if self.board[row][col] == 0:
-                self.board[row][col] = self.current
-                if self.check_win(row, col):
-                    self.winner = self.current
-                    self.game_over = True
-                elif all(self.board[0][c] != 0 for c in range(COLS)):
-                    self.game_over = True
-                else:
-                    self.current = 3 - self.current
-                return True
-        return False
+        row = ROWS - 1 - self.position.heights[col]
+        self.position.play(col)
+        if self.position.last_player_won():
+            self.winner = self.current
+            self.game_over = True
+        elif self.position.is_full():
+            self.game_over = True
+        else:
+            self.current = 3 - self.current
+        self.dirty.mark(self.cell_rect(row, col), TOP_RECT)
+        return True
+    
+    def ai_turn(self):
+        return self.vs_ai and self.current == 2 and not self.game_over
+    
+    def toggle_ai(self):
+        # Switching sides mid-search abandons it, so its column can't land on a later position
+        self.vs_ai = not self.vs_ai
+        self.search = None
+        self.dirty.mark(TOP_RECT)
     
-    def check_win(self, row, col):
-        p = self.board[row][col]
-        directions = [(0,1), (1,0), (1,1), (1,-1)]
-        for dr, dc in directions:
-            count = 1
-            for d in [1, -1]:
-                r, c = row + dr*d, col + dc*d
-                while 0 <= r < ROWS and 0 <= c < COLS and self.board[r][c] == p:
-                    count += 1
-                    r += dr*d
-                    c += dc*d
-            if count >= 4:
-                return True
-        return False
+    def update_ai(self):
+        if self.search is not None:
+            if self.search.step():
+                col = self.search.result()
+                self.search = None
+                if self.ai_turn() and self.position.hash == self.searched:
+                    self.drop(col)
+        elif self.ai_turn():
+            self.searched = self.position.hash
+            self.search = run_in_steps(self.ai.search(self.position.copy()))
+            self.dirty.mark(TOP_RECT)
+    
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        clip = self.screen.get_clip()
+        self.screen.fill(BLACK)
+        
+        # Draw board
+        for row in range(ROWS):
+            for col in range(COLS):
+                if not clip.colliderect(self.cell_rect(row, col)):
+                    continue
+                pygame.draw.rect(self.screen, BLUE, 
+                               (col * CELL_SIZE, (row + 1) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+                color = BLACK
+                disc = self.position.cell(col, ROWS - 1 - row)
+                if disc == 1: color = RED
+                elif disc == 2: color = YELLOW
+                pygame.draw.circle(self.screen, color,
+                                  (col * CELL_SIZE + CELL_SIZE // 2, 
+                                   (row + 1) * CELL_SIZE + CELL_SIZE // 2), 35)
+        
+        # Draw preview
+        if self.ai_turn():
+            text = render_text(self.font, "Thinking...", True, YELLOW)
+            self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, 20))
+        elif not self.game_over:
+            mx = pygame.mouse.get_pos()[0]
+            color = RED if self.current == 1 else YELLOW
+            pygame.draw.circle(self.screen, color, (mx, CELL_SIZE // 2), 35)
+        
+        # Status
+        if self.game_over:
+            if self.winner:
+                text = f"{'Red' if self.winner == 1 else 'Yellow'} Wins!"
+            else:
+                text = "Draw!"
+            self.screen.blit(render_text(self.font, text, True, WHITE), (WIDTH // 2 - 80, 10))
+    
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.dirty.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+                if event.type == pygame.MOUSEMOTION and not self.game_over:
+                    self.dirty.mark(TOP_RECT)
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
                     if event.key == pygame.K_r: self.reset()
-                    if pygame.K_1 <= event.key <= pygame.K_7:
+                    if event.key == pygame.K_c: self.toggle_ai()
+                    if pygame.K_1 <= event.key <= pygame.K_7 and not self.ai_turn():
                         self.drop(event.key - pygame.K_1)
-                if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+                if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over and not self.ai_turn():
                     self.drop(event.pos[0] // CELL_SIZE)
             
-            self.screen.fill(BLACK)
-            
-            # Draw board
-            for row in range(ROWS):
-                for col in range(COLS):
-                    pygame.draw.rect(self.screen, BLUE, 
-                                   (col * CELL_SIZE, (row + 1) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                    color = BLACK
-                    if self.board[row][col] == 1: color = RED
-                    elif self.board[row][col] == 2: color = YELLOW
-                    pygame.draw.circle(self.screen, color,
-                                      (col * CELL_SIZE + CELL_SIZE // 2, 
-                                       (row + 1) * CELL_SIZE + CELL_SIZE // 2), 35)
-            
-            # Draw preview
-            if not self.game_over:
-                mx = pygame.mouse.get_pos()[0]
-                color = RED if self.current == 1 else YELLOW
-                pygame.draw.circle(self.screen, color, (mx, CELL_SIZE // 2), 35)
-            
-            # Status
-            if self.game_over:
-                if self.winner:
-                    text = f"{'Red' if self.winner == 1 else 'Yellow'} Wins!"
-                else:
-                    text = "Draw!"
-                self.screen.blit(self.font.render(text, True, WHITE), (WIDTH // 2 - 80, 10))
-            
-            pygame.display.flip()
+            self.update_ai()
+            self.draw()
             self.clock.tick(60)
 
 async def main():
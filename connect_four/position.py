@@ -0,0 +1,130 @@
+"""
+🔴 Connect Four bitboard position
+
+Each player's discs are one 49-bit mask: column c owns bits 7*c .. 7*c + 6,
+row 0 is the bottom, and the seventh bit of every column stays empty so
+shifted lines never wrap into the next column. Four in a row is found with
+one shift-and-AND pair per direction.
+
+A Zobrist hash of the position and of its mirror image are kept up to date
+on every move, so transposition tables and the opening book can key on them.
+
+    position = Position()
+    position.play(3)
+    if position.is_winning_move(2): ...
+"""
+
+import random
+
+COLS, ROWS = 7, 6
+H1 = ROWS + 1                           # bits per column, including the sentinel
+BOTTOM_MASK = sum(1 << (c * H1) for c in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+CELLS = COLS * ROWS
+# Shifts that step along a line: vertical, horizontal, and the two diagonals
+DIRECTIONS = (1, H1, H1 - 1, H1 + 1)
+
+ZOBRIST_SEED = 0xC4
+_rng = random.Random(ZOBRIST_SEED)
+# ZOBRIST[player][bit index]; sentinel bits are never played
+ZOBRIST = [[_rng.getrandbits(64) for _ in range(COLS * H1)] for _ in range(2)]
+
+
+def has_four(discs):
+    for shift in DIRECTIONS:
+        pairs = discs & (discs >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+
+def winning_cells(discs, occupied):
+    """Empty cells that would complete four in a row for `discs`."""
+    # Vertical: only the cell on top of three can complete it
+    cells = (discs << 1) & (discs << 2) & (discs << 3)
+    for shift in DIRECTIONS[1:]:
+        pair = (discs << shift) & (discs << 2 * shift)
+        cells |= pair & (discs << 3 * shift)
+        cells |= pair & (discs >> shift)
+        pair = (discs >> shift) & (discs >> 2 * shift)
+        cells |= pair & (discs << shift)
+        cells |= pair & (discs >> 3 * shift)
+    return cells & (BOARD_MASK ^ occupied)
+
+
+def column_mask(col):
+    return ((1 << ROWS) - 1) << (col * H1)
+
+
+class Position:
+    def __init__(self):
+        self.discs = [0, 0]             # player 0 moves first
+        self.heights = [0] * COLS
+        self.moves = 0
+        self.hash = 0
+        self.mirror_hash = 0
+
+    def copy(self):
+        other = Position()
+        other.discs = self.discs[:]
+        other.heights = self.heights[:]
+        other.moves = self.moves
+        other.hash = self.hash
+        other.mirror_hash = self.mirror_hash
+        return other
+
+    @property
+    def player(self):
+        """Player to move: 0 or 1."""
+        return self.moves & 1
+
+    @property
+    def occupied(self):
+        return self.discs[0] | self.discs[1]
+
+    def can_play(self, col):
+        return 0 <= col < COLS and self.heights[col] < ROWS
+
+    def playable(self):
+        """Mask of the cell each non-full column would receive next."""
+        return (self.occupied + BOTTOM_MASK) & BOARD_MASK
+
+    def cell(self, col, row):
+        """0 if empty, else 1 + the player whose disc is at (col, row from the bottom)."""
+        bit = 1 << (col * H1 + row)
+        if self.discs[0] & bit:
+            return 1
+        if self.discs[1] & bit:
+            return 2
+        return 0
+
+    def play(self, col):
+        player = self.moves & 1
+        row = self.heights[col]
+        index = col * H1 + row
+        self.discs[player] |= 1 << index
+        self.heights[col] = row + 1
+        self.moves += 1
+        self.hash ^= ZOBRIST[player][index]
+        self.mirror_hash ^= ZOBRIST[player][(COLS - 1 - col) * H1 + row]
+
+    def undo(self, col):
+        self.moves -= 1
+        player = self.moves & 1
+        row = self.heights[col] - 1
+        index = col * H1 + row
+        self.discs[player] ^= 1 << index
+        self.heights[col] = row
+        self.hash ^= ZOBRIST[player][index]
+        self.mirror_hash ^= ZOBRIST[player][(COLS - 1 - col) * H1 + row]
+
+    def is_winning_move(self, col):
+        """True if the player to move wins by playing `col`."""
+        discs = self.discs[self.moves & 1] | 1 << (col * H1 + self.heights[col])
+        return has_four(discs)
+
+    def last_player_won(self):
+        return has_four(self.discs[(self.moves - 1) & 1])
+
+    def is_full(self):
+        return self.moves == CELLS
@@ -0,0 +1,322 @@
+"""
+🤖 Negamax solver for Connect Four
+
+Alpha-beta negamax over the bitboard position:
+- immediate wins are taken and forced blocks played without searching
+- moves that let the opponent win straight away are never tried
+- the transposition table move goes first, then columns from the centre out
+- a fixed-size Zobrist-keyed table keeps bounds between searches; a slot is
+  replaced by a deeper search or by anything from a newer search
+
+Wins score WIN - (discs on the board when four connected), so quicker wins
+rank higher; non-final leaves are scored from open threes and centre discs.
+Depth grows by iterative deepening until the node budget runs out or the
+result is proven. search() is a generator that yields every `slice_nodes`
+nodes, so a game can run it a slice per frame without a thread (see
+gamekit.worker.run_in_steps). Counting nodes instead of seconds makes the
+move, and the frame it arrives on, the same on every machine.
+
+The first plies come from an opening book: sorted 64-bit Zobrist keys of the
+canonical (mirror-minimal) positions followed by one column byte each,
+searched offline by
+    python connect_four/solver.py --plies 5 --depth 12
+"""
+
+import os
+import sys
+import time
+import struct
+import argparse
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from position import Position, COLS, CELLS, ZOBRIST_SEED, winning_cells
+
+WIN = 1000
+EXACT, LOWER, UPPER = range(3)
+CENTRE_ORDER = (3, 2, 4, 1, 5, 0, 6)
+CENTRE_MASK = ((1 << 6) - 1) << (3 * 7)
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+BOOK_MAGIC = b"C4BK"
+BOOK_HEADER = struct.Struct("<4sII")     # magic, Zobrist seed, entry count
+
+
+class _Timeout(Exception):
+    pass
+
+
+def evaluate(position):
+    """Score of a non-final position for the player to move."""
+    me = position.moves & 1
+    mine, theirs = position.discs[me], position.discs[1 - me]
+    occupied = mine | theirs
+    threats = (bin(winning_cells(mine, occupied)).count("1")
+               - bin(winning_cells(theirs, occupied)).count("1"))
+    centre = bin(mine & CENTRE_MASK).count("1") - bin(theirs & CENTRE_MASK).count("1")
+    return 8 * threats + 2 * centre
+
+
+class OpeningBook:
+    def __init__(self, keys=None, moves=b""):
+        self.keys = keys if keys is not None else array("Q")
+        self.moves = moves
+
+    @classmethod
+    def load(cls, path=BOOK_PATH):
+        """Read a book file; returns an empty book if it is missing or built for other keys."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return cls()
+        magic, seed, count = BOOK_HEADER.unpack_from(data)
+        if magic != BOOK_MAGIC or seed != ZOBRIST_SEED:
+            return cls()
+        start = BOOK_HEADER.size
+        keys = array("Q")
+        keys.frombytes(data[start:start + 8 * count])
+        if sys.byteorder != "little":
+            keys.byteswap()
+        return cls(keys, data[start + 8 * count:start + 9 * count])
+
+    def save(self, path=BOOK_PATH):
+        keys = array("Q", self.keys)
+        if sys.byteorder != "little":
+            keys.byteswap()
+        with open(path, "wb") as f:
+            f.write(BOOK_HEADER.pack(BOOK_MAGIC, ZOBRIST_SEED, len(self.keys)))
+            f.write(keys.tobytes())
+            f.write(bytes(self.moves))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def probe(self, position):
+        """Book column for the position, or None."""
+        mirrored = position.mirror_hash < position.hash
+        key = position.mirror_hash if mirrored else position.hash
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        col = self.moves[i]
+        return COLS - 1 - col if mirrored else col
+
+
+_book = None
+
+
+def opening_book():
+    """The shipped opening book, loaded once."""
+    global _book
+    if _book is None:
+        _book = OpeningBook.load()
+    return _book
+
+
+class Solver:
+    def __init__(self, node_budget=40000, slice_nodes=512, table_bits=18, book=None):
+        self.node_budget = node_budget          # nodes per move
+        self.slice_nodes = slice_nodes          # nodes between yields
+        self.size = 1 << table_bits
+        self.table = [None] * self.size         # (hash, depth, flag, value, move, generation)
+        self.generation = 0
+        self.book = book
+        self.node_limit = None
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def best_move(self, position, depth=None):
+        """Column to play, searched to `depth` or for the node budget."""
+        search = self.search(position, depth)
+        while True:
+            try:
+                next(search)
+            except StopIteration as stop:
+                return stop.value
+
+    def search(self, position, depth=None):
+        """Generator form of best_move(): yields between slices, returns the column."""
+        if self.book is not None:
+            col = self.book.probe(position)
+            if col is not None and position.can_play(col):
+                return col
+        position = position.copy()
+        self.generation += 1
+        self.nodes = 0
+        self.depth_reached = 0
+        moves = [col for col in CENTRE_ORDER if position.can_play(col)]
+        for col in moves:
+            if position.is_winning_move(col):
+                return col
+
+        best = moves[0]
+        max_depth = depth or CELLS - position.moves
+        for d in range(1, max_depth + 1):
+            self.node_limit = self.node_budget if depth is None and d > 1 else None
+            try:
+                value, col = yield from self.search_root(position, moves, d)
+            except _Timeout:
+                break
+            best = col
+            self.depth_reached = d
+            # Search the best move first next time round
+            moves.remove(col)
+            moves.insert(0, col)
+            # A proven win or loss won't change with more depth
+            if abs(value) > WIN - CELLS - 1:
+                break
+        return best
+
+    def search_root(self, position, moves, depth):
+        alpha = -WIN
+        best_value, best_col = None, moves[0]
+        for col in moves:
+            position.play(col)
+            value = -(yield from self.negamax(position, depth - 1, -WIN, -alpha))
+            position.undo(col)
+            if best_value is None or value > best_value:
+                best_value, best_col = value, col
+            if value > alpha:
+                alpha = value
+        return best_value, best_col
+
+    def store(self, key, depth, flag, value, move):
+        slot = key & (self.size - 1)
+        old = self.table[slot]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.table[slot] = (key, depth, flag, value, move, self.generation)
+
+    def negamax(self, position, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes % self.slice_nodes:
+            if self.node_limit is not None and self.nodes > self.node_limit:
+                raise _Timeout
+            yield
+        moves_played = position.moves
+        if moves_played == CELLS:
+            return 0
+
+        me = moves_played & 1
+        mine, theirs = position.discs[me], position.discs[1 - me]
+        occupied = mine | theirs
+        playable = position.playable()
+        if winning_cells(mine, occupied) & playable:
+            return WIN - (moves_played + 1)
+        threats = winning_cells(theirs, occupied)
+        forced = threats & playable
+        if forced:
+            if forced & (forced - 1):
+                # Two threats at once: one of them gets through
+                return -(WIN - (moves_played + 2))
+            playable = forced
+        # Never fill the cell right under an opponent's winning cell
+        safe = playable & ~(threats >> 1)
+        if not safe:
+            return -(WIN - (moves_played + 2))
+        if depth == 0:
+            return evaluate(position)
+
+        key = position.hash
+        entry = self.table[key & (self.size - 1)]
+        tt_move = None
+        if entry is not None and entry[0] == key:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                value = entry[3]
+                if entry[2] == EXACT:
+                    return value
+                if entry[2] == LOWER and value > alpha:
+                    alpha = value
+                elif entry[2] == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        start_alpha = alpha
+        best_value = -WIN
+        best_move = None
+        order = CENTRE_ORDER if tt_move is None else (tt_move,) + CENTRE_ORDER
+        tried = 0
+        for col in order:
+            bit = 1 << (col * 7 + position.heights[col]) if position.heights[col] < 6 else 0
+            if not bit & safe or tried >> col & 1:
+                continue
+            tried |= 1 << col
+            position.play(col)
+            value = -(yield from self.negamax(position, depth - 1, -beta, -alpha))
+            position.undo(col)
+            if value > best_value:
+                best_value, best_move = value, col
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    break
+
+        if best_value <= start_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.store(key, depth, flag, best_value, best_move)
+        return best_value
+
+
+def book_positions(plies):
+    """Canonical non-final positions reachable in fewer than `plies` moves, as move lists."""
+    seen = set()
+    found = []
+
+    def walk(position, moves):
+        key = min(position.hash, position.mirror_hash)
+        if key in seen:
+            return
+        seen.add(key)
+        found.append(list(moves))
+        if len(moves) + 1 >= plies:
+            return
+        for col in range(COLS):
+            if position.can_play(col) and not position.is_winning_move(col):
+                position.play(col)
+                moves.append(col)
+                walk(position, moves)
+                moves.pop()
+                position.undo(col)
+
+    walk(Position(), [])
+    return found
+
+
+def search_book_entry(moves, depth):
+    position = Position()
+    for col in moves:
+        position.play(col)
+    col = Solver(table_bits=20).best_move(position, depth=depth)
+    if position.mirror_hash < position.hash:
+        return position.mirror_hash, COLS - 1 - col
+    return position.hash, col
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Connect Four opening book.")
+    parser.add_argument("--plies", type=int, default=5, help="book positions with fewer discs than this")
+    parser.add_argument("--depth", type=int, default=12, help="search depth per position")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("-o", "--output", default=BOOK_PATH, help="book file")
+    args = parser.parse_args()
+
+    positions = book_positions(args.plies)
+    print(f"Searching {len(positions)} positions to depth {args.depth} with {args.jobs} workers")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        entries = sorted(pool.map(search_book_entry, positions, [args.depth] * len(positions)))
+    book = OpeningBook(array("Q", (key for key, _ in entries)), bytes(col for _, col in entries))
+    book.save(args.output)
+    print(f"Wrote {len(book)} entries ({os.path.getsize(args.output)} bytes) to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,145 +1,450 @@
-
 import os
-import re
-import subprocess
+import sys
+import ast
+import json
 import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-ROOT_DIR = r"d:\Games"
-EXCLUDE_DIRS = {".git", "__pycache__", "venv", ".idea", ".vscode", "space_invaders"} # space_invaders already done
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+EXCLUDE_DIRS = {".git", "__pycache__", "venv", ".idea", ".vscode"}
+# Shared packages at the root that games import; copied into a game folder while it builds
+SHARED_PACKAGES = ["gamekit"]
+# Files inside a game folder that never end up in its bundle (staged shared copies are hashed separately)
+IGNORED_NAMES = {"build", "__pycache__", *SHARED_PACKAGES}
+MANIFEST_NAME = "build_manifest.json"
+# Single-bundle launcher; every pygame game folder is staged into it for its build
+LAUNCHER = "arcade"
 
-def convert_file(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+# Calls that mark a loop as a frame loop: it pumps events, presents a frame or paces itself
+FRAME_CALLS = {"pygame.display.flip", "pygame.display.update", "pygame.event.get",
+               "pygame.event.poll", "pygame.event.wait"}
+FRAME_METHODS = {"tick", "tick_busy_loop"}
+# Calls that stall the browser main thread no matter how often the loop yields
+BLOCKING_CALLS = {"time.sleep", "input"}
+BLOCKING_METHODS = {"mainloop"}
+EXIT_CALLS = {"sys.exit", "exit", "quit", "pygame.quit"}
 
-    if "import asyncio" in content:
-        print(f"Skipping {file_path} (already has asyncio)")
-        return False
-
-    print(f"Converting {file_path}...")
-
-    # 1. Add import asyncio
-    if "import sys" in content:
-        content = content.replace("import sys", "import sys\nimport asyncio")
-    else:
-        content = "import asyncio\n" + content
-
-    # 2. Async run method
-    # Pattern: def run(self):
-    content = re.sub(r"def run\(self\):", r"async def run(self):", content)
-
-    # 3. Add await asyncio.sleep(0) in while loop
-    # Find 'while running:' and inject await inside
-    # We assume 'while running:' is the main loop
-    lines = content.splitlines()
-    new_lines = []
-    in_run_loop = False
-    
-    for line in lines:
-        new_lines.append(line)
-        if "while running:" in line:
-            # Calculate indentation
-            indent = line.split("while")[0]
-            # Add sleep with extra indentation
-            new_lines.append(f"{indent}    await asyncio.sleep(0)")
-
-    content = "\n".join(new_lines)
-
-    # 4. Refactor main block
-    # Check for different main block patterns
-    if 'if __name__ == "__main__":' in content:
-        # We need to replace the entire block
-        # Pattern 1: game = Game(); game.run()
-        # Pattern 2: Game().run()
-        
-        main_block_pattern = r'if __name__ == "__main__":\s+(.*)'
-        
-        # We will replace the standard block with our async block
-        # Using a simpler replace for the common specific patterns found in this codebase
-        
-        blocks_to_replace = [
-            """if __name__ == "__main__":
-    game = Game()
-    game.run()""",
-            """if __name__ == "__main__":
-    Game().run()"""
-        ]
-        
-        replacement = """async def main():
-    game = Game()
+YIELD_STMT = "await asyncio.sleep(0)"
+ASYNC_MAIN = """async def main():
+    game = {cls}()
     await game.run()
 
 if __name__ == "__main__":
-    asyncio.run(main())"""
-
-        replaced = False
-        for block in blocks_to_replace:
-            if block in content:
-                content = content.replace(block, replacement)
-                replaced = True
-                break
-        
-        if not replaced:
-             # Fallback: simple text append if specific pattern match fails, or manual check needed
-             # But for now let's try a regex replacement for the end of file
-             content = re.sub(r'if __name__ == "__main__":\s+game = Game\(\)\s+game\.run\(\)', replacement, content, flags=re.DOTALL)
-             content = re.sub(r'if __name__ == "__main__":\s+Game\(\)\.run\(\)', replacement, content, flags=re.DOTALL)
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
-    
-    return True
-
-def build_game(folder_name, file_name):
-    # Construct paths
-    game_dir = os.path.join(ROOT_DIR, folder_name)
-    script_path = os.path.join(game_dir, file_name)
-    
-    print(f"Building {folder_name}...")
+    asyncio.run(main())
+"""
+
+def dotted_name(node):
+    """Return 'a.b.c' for a Name/Attribute chain, or None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+def walk_local(nodes):
+    """Walk statements without descending into nested functions, lambdas or classes."""
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                stack.append(child)
+
+def loop_calls(loop):
+    calls = set()
+    for node in walk_local(loop.body + loop.orelse):
+        if isinstance(node, ast.Call):
+            name = dotted_name(node.func)
+            if name:
+                calls.add(name)
+    return calls
+
+def is_frame_loop(loop):
+    for name in loop_calls(loop):
+        if name in FRAME_CALLS or name.rsplit(".", 1)[-1] in FRAME_METHODS:
+            return True
+    return False
+
+def yields_every_iteration(loop):
+    """True if a top-level statement of the loop body awaits."""
+    if isinstance(loop, ast.AsyncFor):
+        return True
+    for stmt in loop.body:
+        if isinstance(stmt, (ast.Expr, ast.Assign, ast.AugAssign, ast.AnnAssign, ast.Return)):
+            if any(isinstance(n, ast.Await) for n in ast.walk(stmt)):
+                return True
+    return False
+
+def can_leave(loop):
+    """True if a while-loop has a break, return, raise or exit call at its own level."""
+    stack = list(loop.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Break, ast.Return, ast.Raise)):
+            return True
+        if isinstance(node, ast.Call) and dotted_name(node.func) in EXIT_CALLS:
+            return True
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+                             ast.While, ast.For, ast.AsyncFor)):
+            # A break in a nested loop only leaves that loop, but returns and exits still count
+            if isinstance(node, (ast.While, ast.For, ast.AsyncFor)):
+                stack.extend(n for n in walk_local(node.body) if isinstance(n, (ast.Return, ast.Raise, ast.Call)))
+            continue
+        stack.extend(ast.iter_child_nodes(node))
+    return False
+
+class LoopScanner(ast.NodeVisitor):
+    """Collect frame loops, the function enclosing each one, and risky blocking code."""
+
+    def __init__(self):
+        self.functions = []
+        self.frame_loops = []   # (loop, enclosing function or None)
+        self.findings = []      # (line, kind, detail)
+
+    def visit_FunctionDef(self, node):
+        self.functions.append(node)
+        self.generic_visit(node)
+        self.functions.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_loop(self, node):
+        func = self.functions[-1] if self.functions else None
+        if is_frame_loop(node):
+            if not yields_every_iteration(node):
+                self.frame_loops.append((node, func))
+        elif isinstance(node, ast.While) and isinstance(node.test, ast.Constant) and node.test.value \
+                and not can_leave(node):
+            self.findings.append((node.lineno, "unbounded", "'while True' loop never breaks, returns or yields"))
+        self.generic_visit(node)
+
+    visit_While = visit_For = visit_loop
+
+    def visit_Call(self, node):
+        name = dotted_name(node.func)
+        if name and (name in BLOCKING_CALLS or name.rsplit(".", 1)[-1] in BLOCKING_METHODS):
+            self.findings.append((node.lineno, "blocking-call", f"{name}() blocks the browser event loop"))
+        self.generic_visit(node)
+
+def find_main_block(tree):
+    for node in tree.body:
+        if isinstance(node, ast.If) and isinstance(node.test, ast.Compare) \
+                and dotted_name(node.test.left) == "__name__":
+            return node
+    return None
+
+def sync_run_class(block, async_classes):
+    """If a __main__ block just calls Cls().run() without awaiting, return Cls."""
+    instances = {}
+    for stmt in block.body:
+        if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Call) \
+                and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            instances[stmt.targets[0].id] = dotted_name(stmt.value.func)
+        elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call) \
+                and isinstance(stmt.value.func, ast.Attribute) and stmt.value.func.attr == "run":
+            owner = stmt.value.func.value
+            cls = dotted_name(owner.func) if isinstance(owner, ast.Call) else instances.get(dotted_name(owner))
+            if cls in async_classes:
+                return cls
+    return None
+
+def convert_file(file_path, write=True):
+    """Make every frame loop in a game yield to the browser once per iteration.
+
+    Edits are applied to the original text at positions found with ast, so
+    comments and formatting survive. Returns (changed, findings) where
+    findings is a list of (line, kind, detail) tuples describing what was
+    changed and what could still block.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    tree = ast.parse(content, filename=file_path)
+    scanner = LoopScanner()
+    scanner.visit(tree)
+    findings = list(scanner.findings)
+    lines = content.splitlines(keepends=True)
+    edits = []  # (line index, kind, payload), applied bottom-up
+
+    # 1. Yield at the top of each frame loop so 'continue' can never skip it
+    made_async = set()
+    for loop, func in scanner.frame_loops:
+        if func is None or (isinstance(func, ast.FunctionDef) and func.name != "run"):
+            where = f"in {func.name}()" if func else "at module level"
+            findings.append((loop.lineno, "blocking", f"frame loop {where} cannot await; make it async by hand"))
+            continue
+        first = loop.body[0]
+        if first.lineno == loop.lineno:
+            findings.append((loop.lineno, "blocking", "frame loop body shares the loop line; split it to add a yield"))
+            continue
+        if isinstance(func, ast.FunctionDef) and func not in made_async:
+            made_async.add(func)
+            edits.append((func.lineno - 1, "async", func.col_offset))
+        edits.append((first.lineno - 1, "insert", " " * first.col_offset + YIELD_STMT + "\n"))
+        findings.append((loop.lineno, "yield-added", f"{YIELD_STMT} added to frame loop"))
+
+    # 2. The __main__ block must await an async run() instead of dropping the coroutine
+    async_classes = set()
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if item.__class__ is ast.AsyncFunctionDef or item in made_async:
+                    if item.name == "run":
+                        async_classes.add(node.name)
+    block = find_main_block(tree)
+    cls = block and sync_run_class(block, async_classes)
+    if cls:
+        edits.append((block.lineno - 1, "replace", (block.end_lineno, ASYNC_MAIN.format(cls=cls))))
+        findings.append((block.lineno, "main-async", f"__main__ now awaits {cls}().run()"))
+
+    # 3. import asyncio next to the other imports
+    has_import = any(isinstance(n, ast.Import) and any(a.name == "asyncio" for a in n.names) for n in tree.body)
+    if edits and not has_import:
+        imports = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+        if imports:
+            anchor = next((n for n in imports if any(a.name == "sys" for a in getattr(n, "names", []))
+                           and isinstance(n, ast.Import)), imports[-1])
+            at = anchor.end_lineno
+        else:
+            doc = tree.body[0] if tree.body and isinstance(tree.body[0], ast.Expr) \
+                and isinstance(tree.body[0].value, ast.Constant) else None
+            at = doc.end_lineno if doc else 0
+        edits.append((at, "insert", "import asyncio\n"))
+
+    if not edits:
+        return False, sorted(findings)
+
+    for index, kind, payload in sorted(edits, key=lambda e: (e[0], e[1] != "insert"), reverse=True):
+        if kind == "insert":
+            if index > 0 and not lines[index - 1].endswith("\n"):
+                lines[index - 1] += "\n"
+            lines.insert(index, payload)
+        elif kind == "async":
+            line = lines[index]
+            lines[index] = line[:payload] + line[payload:].replace("def ", "async def ", 1)
+        elif kind == "replace":
+            end, text = payload
+            lines[index:end] = [text]
+
+    if write:
+        print(f"Converting {file_path}...")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("".join(lines))
+    return True, sorted(findings)
+
+def print_report(report):
+    """Print converter findings grouped by file, most serious first."""
+    order = {"blocking": 0, "unbounded": 1, "blocking-call": 2, "main-async": 3, "yield-added": 4}
+    for file_path in sorted(report):
+        findings = sorted(report[file_path], key=lambda f: (order.get(f[1], 9), f[0]))
+        if not findings:
+            continue
+        print(os.path.relpath(file_path, ROOT_DIR))
+        for line, kind, detail in findings:
+            print(f"  {line:>4}  {kind:<14}{detail}")
+
+def shared_packages_used(game_dir):
+    """Return the shared packages imported by any script in a game folder."""
+    used = []
+    for name in os.listdir(game_dir):
+        if name.endswith(".py"):
+            with open(os.path.join(game_dir, name), "r", encoding="utf-8") as f:
+                source = f.read()
+            used.extend(pkg for pkg in SHARED_PACKAGES
+                        if pkg not in used and (f"import {pkg}" in source or f"from {pkg}" in source))
+    return used
+
+def launcher_games(root_dir):
+    """Return the game folders the launcher bundles: pygame games with a Game class."""
+    games = []
+    for folder, script in find_games(root_dir):
+        if folder == LAUNCHER:
+            continue
+        with open(os.path.join(root_dir, folder, script), "r", encoding="utf-8") as f:
+            source = f.read()
+        if "import pygame" in source and "\nclass Game" in source:
+            games.append(folder)
+    return games
+
+def hash_tree(digest, top, prefix=""):
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_NAMES)
+        for name in sorted(filenames):
+            if name.endswith((".pyc", ".pyo")):
+                continue
+            path = os.path.join(dirpath, name)
+            rel = prefix + os.path.relpath(path, top).replace(os.sep, "/")
+            digest.update(rel.encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+
+def hash_game(game_dir, root_dir=ROOT_DIR):
+    """Hash every source and asset file that pygbag packs for one game."""
+    digest = hashlib.sha256()
+    hash_tree(digest, game_dir)
+    for pkg in shared_packages_used(game_dir):
+        hash_tree(digest, os.path.join(root_dir, pkg), prefix=pkg + "/")
+    if os.path.basename(os.path.normpath(game_dir)) == LAUNCHER:
+        for folder in launcher_games(root_dir):
+            hash_tree(digest, os.path.join(root_dir, folder), prefix=folder + "/")
+    return digest.hexdigest()
+
+def load_manifest(root_dir):
+    path = os.path.join(root_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
     try:
-        # Run pygbag build
-        # We use python -m pygbag
-        cmd = [sys.executable, "-m", "pygbag", "--build", script_path]
-        subprocess.run(cmd, check=True, cwd=ROOT_DIR) # Run from root so paths work like space_invaders
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to build {folder_name}: {e}")
-    except Exception as e:
-        print(f"Error building {folder_name}: {e}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable manifest {path}: {e}")
+        return {}
 
-def main():
-    import sys
-    # Iterate over all directories
-    for start_dir in os.listdir(ROOT_DIR):
-        full_path = os.path.join(ROOT_DIR, start_dir)
-        if not os.path.isdir(full_path):
+def save_manifest(root_dir, manifest):
+    path = os.path.join(root_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+def find_games(root_dir, only=None):
+    """Yield (folder_name, script_name) for every game folder under root_dir."""
+    for start_dir in sorted(os.listdir(root_dir)):
+        full_path = os.path.join(root_dir, start_dir)
+        if not os.path.isdir(full_path) or start_dir in EXCLUDE_DIRS or start_dir.startswith("."):
             continue
-        
-        if start_dir in EXCLUDE_DIRS:
+        if only and start_dir not in only:
             continue
 
-        # Look for the main game python file
-        # Usually folder ending in _game or just the name
-        
         # Assumption: file name matches folder name, or folder_name.py
         expected_script = f"{start_dir}.py"
-        script_path = os.path.join(full_path, expected_script)
-        
-        if not os.path.exists(script_path):
-            print(f"Could not find script {expected_script} in {start_dir}")
+        if not os.path.exists(os.path.join(full_path, expected_script)):
+            if only:
+                print(f"Could not find script {expected_script} in {start_dir}")
             continue
+        yield start_dir, expected_script
+
+def build_game(root_dir, folder_name, file_name):
+    """Run one pygbag build. Executed inside a worker process."""
+    # Passing relative path matching how we did space_invaders
+    rel_script_path = os.path.join(folder_name, file_name)
+    cmd = [sys.executable, "-m", "pygbag", "--build", rel_script_path]
+    start = time.perf_counter()
+
+    # pygbag only packs the game folder, so shared packages (and, for the
+    # launcher, the games themselves) are copied in for the build
+    game_dir = os.path.join(root_dir, folder_name)
+    copies = shared_packages_used(game_dir)
+    if folder_name == LAUNCHER:
+        copies += launcher_games(root_dir)
+    staged = []
+    try:
+        for name in copies:
+            target = os.path.join(game_dir, name)
+            if not os.path.exists(target):
+                shutil.copytree(os.path.join(root_dir, name), target,
+                                ignore=shutil.ignore_patterns(*IGNORED_NAMES, "*.pyc"))
+                staged.append(target)
+        # Run from root so paths work like space_invaders
+        result = subprocess.run(cmd, cwd=root_dir, capture_output=True, text=True)
+        ok = result.returncode == 0
+        log = (result.stdout + result.stderr)[-2000:]
+    except OSError as e:
+        ok, log = False, str(e)
+    finally:
+        for target in staged:
+            shutil.rmtree(target, ignore_errors=True)
+    return folder_name, ok, time.perf_counter() - start, log
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert games to async and build them with pygbag.")
+    parser.add_argument("games", nargs="*", help="only process these game folders")
+    parser.add_argument("--root", default=ROOT_DIR, help="arcade root directory")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of pygbag builds to run at once")
+    parser.add_argument("--force", action="store_true", help="rebuild games even if unchanged")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report conversions and which games would build without writing anything")
+    parser.add_argument("--convert-only", action="store_true", help="convert the games but skip pygbag")
+    parser.add_argument("--report", metavar="FILE", help="also write the loop report as JSON")
+    args = parser.parse_args()
+
+    root_dir = os.path.abspath(args.root)
+    manifest = load_manifest(root_dir)
+    pending = {}
+    skipped = 0
+    report = {}
 
-        # Convert
+    for folder_name, script_name in find_games(root_dir, set(args.games)):
+        game_dir = os.path.join(root_dir, folder_name)
+        script_path = os.path.join(game_dir, script_name)
         try:
-            convert_file(script_path)
-            # Build
-            # Passing relative path to build_game matching how we did space_invaders
-            rel_script_path = os.path.join(start_dir, expected_script)
-            
-            # Run pygbag command directly here to ensure context
-            print(f"Building {rel_script_path}...")
-            subprocess.run(["python", "-m", "pygbag", "--build", rel_script_path], cwd=ROOT_DIR, check=False)
-            
-        except Exception as e:
-            print(f"Failed processing {start_dir}: {e}")
+            _, report[script_path] = convert_file(script_path, write=not args.dry_run)
+        except (SyntaxError, UnicodeDecodeError) as e:
+            print(f"Failed converting {folder_name}: {e}")
+            continue
+
+        digest = hash_game(game_dir, root_dir)
+        built = os.path.exists(os.path.join(game_dir, "build", "web", "index.html"))
+        if not args.force and built and manifest.get(folder_name, {}).get("hash") == digest:
+            skipped += 1
+            continue
+        pending[folder_name] = (script_name, digest)
+
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({os.path.relpath(path, root_dir).replace(os.sep, "/"):
+                       [{"line": line, "kind": kind, "detail": detail} for line, kind, detail in findings]
+                       for path, findings in sorted(report.items())}, f, indent=2)
+    if args.convert_only:
+        return
+
+    print(f"{len(pending)} game(s) to build, {skipped} unchanged")
+    if args.dry_run or not pending:
+        for folder_name in pending:
+            print(f"  would build {folder_name}")
+        return
+
+    timings = []
+    failed = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(build_game, root_dir, folder_name, script_name)
+                   for folder_name, (script_name, _) in pending.items()]
+        for future in as_completed(futures):
+            folder_name, ok, elapsed, log = future.result()
+            timings.append((elapsed, folder_name, ok))
+            if ok:
+                print(f"Built {folder_name} in {elapsed:.1f}s")
+                manifest[folder_name] = {"hash": pending[folder_name][1],
+                                         "seconds": round(elapsed, 2),
+                                         "built_at": int(time.time())}
+                # Saved after every build so an interrupted run keeps its progress
+                save_manifest(root_dir, manifest)
+            else:
+                print(f"Failed to build {folder_name} after {elapsed:.1f}s:\n{log}")
+                failed.append(folder_name)
+
+    total = time.perf_counter() - start
+    serial = sum(t for t, _, _ in timings)
+    print(f"\n{'game':<24}{'seconds':>9}  status")
+    for elapsed, folder_name, ok in sorted(timings, reverse=True):
+        print(f"{folder_name:<24}{elapsed:>9.1f}  {'ok' if ok else 'FAILED'}")
+    print(f"Wall time {total:.1f}s for {serial:.1f}s of build work ({len(failed)} failed)")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
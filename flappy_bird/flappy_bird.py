@@ -11,8 +11,13 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 # Constants
@@ -110,6 +115,7 @@ class Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("🐦 Flappy Bird")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 74)
         self.small_font = pygame.font.Font(None, 36)
         self.reset()
@@ -199,14 +205,14 @@ class Game:
         self.bird.draw(self.screen)
         
         # Draw score
-        score_text = self.font.render(str(self.score), True, WHITE)
-        score_shadow = self.font.render(str(self.score), True, BLACK)
+        score_text = render_text(self.font, str(self.score), True, WHITE)
+        score_shadow = render_text(self.font, str(self.score), True, BLACK)
         self.screen.blit(score_shadow, (WINDOW_WIDTH // 2 - score_text.get_width() // 2 + 2, 52))
         self.screen.blit(score_text, (WINDOW_WIDTH // 2 - score_text.get_width() // 2, 50))
         
         # Draw start message
         if not self.started and not self.game_over:
-            start_text = self.small_font.render("Press SPACE to start", True, WHITE)
+            start_text = render_text(self.small_font, "Press SPACE to start", True, WHITE)
             self.screen.blit(start_text, (WINDOW_WIDTH // 2 - start_text.get_width() // 2, WINDOW_HEIGHT // 2))
         
         # Draw game over
@@ -216,10 +222,10 @@ class Game:
             overlay.fill(BLACK)
             self.screen.blit(overlay, (0, 0))
             
-            game_over_text = self.font.render("GAME OVER", True, WHITE)
-            score_text = self.small_font.render(f"Score: {self.score}", True, WHITE)
-            high_score_text = self.small_font.render(f"Best: {self.high_score}", True, YELLOW)
-            restart_text = self.small_font.render("Press R to restart", True, WHITE)
+            game_over_text = render_text(self.font, "GAME OVER", True, WHITE)
+            score_text = render_text(self.small_font, f"Score: {self.score}", True, WHITE)
+            high_score_text = render_text(self.small_font, f"Best: {self.high_score}", True, YELLOW)
+            restart_text = render_text(self.small_font, "Press R to restart", True, WHITE)
             
             self.screen.blit(game_over_text, (WINDOW_WIDTH // 2 - game_over_text.get_width() // 2, WINDOW_HEIGHT // 2 - 80))
             self.screen.blit(score_text, (WINDOW_WIDTH // 2 - score_text.get_width() // 2, WINDOW_HEIGHT // 2 - 10))
@@ -233,7 +239,8 @@ class Game:
         while running:
             await asyncio.sleep(0)
             running = self.handle_input()
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
         
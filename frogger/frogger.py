@@ -10,8 +10,13 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 WIDTH, HEIGHT = 600, 600
@@ -31,6 +36,7 @@ class Game:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("🐸 Frogger")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 36)
         self.reset()
     
@@ -163,7 +169,7 @@ class Game:
         pygame.draw.circle(self.screen, WHITE, (self.frog[0] + 35, self.frog[1] + 15), 5)
         
         # Draw HUD
-        text = self.font.render(f"Score: {self.score}  Lives: {self.lives}", True, WHITE)
+        text = render_text(self.font, f"Score: {self.score}  Lives: {self.lives}", True, WHITE)
         self.screen.blit(text, (10, HEIGHT - 35))
         
         if self.game_over:
@@ -171,13 +177,14 @@ class Game:
             overlay.set_alpha(180)
             overlay.fill((0, 0, 0))
             self.screen.blit(overlay, (0, 0))
-            text = self.font.render(f"Game Over! Score: {self.score}", True, WHITE)
+            text = render_text(self.font, f"Game Over! Score: {self.score}", True, WHITE)
             self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2))
         
         pygame.display.flip()
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
@@ -188,7 +195,8 @@ class Game:
                     if event.key == pygame.K_LEFT: self.move_frog(-CELL, 0)
                     if event.key == pygame.K_RIGHT: self.move_frog(CELL, 0)
             
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
 
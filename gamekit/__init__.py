@@ -0,0 +1,8 @@
+"""
+🧰 gamekit
+Shared helpers for the pygame games in this collection.
+
+Games import it through a small path bootstrap so they still run with
+`python game/game.py`; convert_all.py copies the package into each game
+folder while pygbag builds it.
+"""
@@ -0,0 +1,50 @@
+"""
+Pre-rendered background layers.
+
+Backgrounds that never change (gradients, sun, clouds...) are painted once
+per window size onto a surface and then drawn with a single blit per frame.
+"""
+
+import pygame
+
+_layers = {}
+
+
+def layer(key, size, paint):
+    """Return the cached surface for `key` at `size`, painting it on first use.
+
+    `paint(surface)` draws the static content; it only runs again when the
+    window size changes or the cache is cleared.
+    """
+    size = (int(size[0]), int(size[1]))
+    surface = _layers.get((key, size))
+    if surface is None:
+        surface = pygame.Surface(size)
+        paint(surface)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _layers[(key, size)] = surface
+    return surface
+
+
+def paint_gradient(surface, top, bottom):
+    """Fill `surface` with a vertical gradient from `top` to `bottom`."""
+    width, height = surface.get_size()
+    column = pygame.Surface((1, height))
+    for y in range(height):
+        ratio = y / height
+        column.set_at((0, y), (int(top[0] + (bottom[0] - top[0]) * ratio),
+                               int(top[1] + (bottom[1] - top[1]) * ratio),
+                               int(top[2] + (bottom[2] - top[2]) * ratio)))
+    surface.blit(pygame.transform.scale(column, (width, height)), (0, 0))
+
+
+def gradient(size, top, bottom):
+    """Return a cached vertical gradient surface of `size`."""
+    return layer(("gradient", tuple(top), tuple(bottom)), size,
+                 lambda surface: paint_gradient(surface, top, bottom))
+
+
+def clear():
+    """Drop every cached layer, e.g. after the display mode changes."""
+    _layers.clear()
@@ -0,0 +1,88 @@
+"""
+Dirty-region rendering for games that only change on input.
+
+The game marks the screen regions its state changes touch; render() then
+repaints just those regions (by clipping the game's normal paint function)
+and pushes them with pygame.display.update(rects). When nothing is marked
+the frame is skipped entirely, so an idle board costs no drawing at all.
+
+    self.dirty = DirtyRects()
+    ...
+    self.dirty.mark(tile_rect)          # after a state change
+    self.dirty.mark_all()               # after reset, overlays, window expose
+    ...
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
+
+Paint functions can skip work outside the region being repainted by testing
+items against screen.get_clip().
+"""
+
+import pygame
+
+# Window events after which the whole window has to be repainted
+EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, pygame.VIDEORESIZE,
+                 getattr(pygame, "WINDOWEXPOSED", -1), getattr(pygame, "WINDOWRESTORED", -1),
+                 getattr(pygame, "WINDOWSIZECHANGED", -1)}
+
+
+class DirtyRects:
+    def __init__(self):
+        self.rects = []
+        self.full = True
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
+    @property
+    def idle(self):
+        return not self.full and not self.rects
+
+    def mark(self, *rects):
+        """Mark one or more regions (Rect or (x, y, w, h)) as needing a repaint."""
+        if not self.full:
+            self.rects.extend(pygame.Rect(r) for r in rects)
+
+    def mark_all(self):
+        self.full = True
+        self.rects = []
+
+    def handle_event(self, event):
+        if event.type in EXPOSE_EVENTS:
+            self.mark_all()
+
+    def merged(self):
+        """Return the marked rects with overlapping ones merged together."""
+        rects = [r for r in self.rects if r.w > 0 and r.h > 0]
+        merged = True
+        while merged and len(rects) > 1:
+            merged = False
+            for i in range(len(rects)):
+                hit = rects[i].collidelist(rects[i + 1:])
+                if hit != -1:
+                    other = rects.pop(i + 1 + hit)
+                    rects[i] = rects[i].union(other)
+                    merged = True
+                    break
+        return rects
+
+    def render(self, surface, paint):
+        """Repaint and present the dirty regions. Returns False on idle frames."""
+        if self.idle:
+            self.frames_skipped += 1
+            return False
+        if self.full:
+            surface.set_clip(None)
+            paint()
+            pygame.display.flip()
+        else:
+            screen_rect = surface.get_rect()
+            rects = [r.clip(screen_rect) for r in self.merged()]
+            for rect in rects:
+                surface.set_clip(rect)
+                paint()
+            surface.set_clip(None)
+            pygame.display.update(rects)
+        self.full = False
+        self.rects = []
+        self.frames_drawn += 1
+        return True
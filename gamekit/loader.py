@@ -0,0 +1,24 @@
+"""
+Importing games by folder name.
+
+Game scripts are not a package (and "2048" is not a valid module name), so
+tools load <folder>/<folder>.py straight from its path.
+"""
+
+import os
+import sys
+import importlib.util
+
+
+def load_game_module(folder, root_dir, prefix="game_"):
+    """Import <root_dir>/<folder>/<folder>.py as module `<prefix><folder>` and return it."""
+    path = os.path.join(root_dir, folder, f"{folder}.py")
+    spec = importlib.util.spec_from_file_location(f"{prefix}{folder}", path)
+    module = importlib.util.module_from_spec(spec)
+    # Games import their sibling modules by plain name
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(os.path.dirname(path))
+    return module
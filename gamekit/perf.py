@@ -0,0 +1,149 @@
+"""
+Per-frame instrumentation with an F3 overlay.
+
+A game creates a PerfMonitor, feeds it its events and laps its frame:
+
+    self.perf = PerfMonitor(entities=lambda: {"bullets": len(self.bullets)})
+    ...
+    for event in pygame.event.get():
+        self.perf.handle_event(event)
+    self.perf.begin_frame()
+    for _ in range(self.timestep.advance()):
+        self.update()
+    self.perf.lap("update")
+    self.draw()                       # calls self.perf.draw_overlay(self.screen) before flip
+    self.perf.lap("draw")
+    self.perf.end_frame()
+
+Every frame (FPS, update/draw ms, draw calls, entity counts) goes into a
+ring buffer. F3 toggles the overlay, F4 writes the buffer to a JSON file and
+prints where it went. Draw calls are the pygame.draw primitives issued during
+the frame; they are only counted while the overlay is visible, since
+counting wraps every pygame.draw function.
+"""
+
+import json
+import time
+from collections import deque
+
+import pygame
+
+DRAW_FUNCTIONS = ("rect", "polygon", "circle", "ellipse", "arc", "line", "lines", "aaline", "aalines")
+
+_draw_calls = 0
+_original_draw = {}
+
+
+def _counted(fn):
+    def wrapper(*args, **kwargs):
+        global _draw_calls
+        _draw_calls += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def count_draw_calls(enabled):
+    """Install or remove the pygame.draw call counters."""
+    if enabled and not _original_draw:
+        for name in DRAW_FUNCTIONS:
+            _original_draw[name] = getattr(pygame.draw, name)
+            setattr(pygame.draw, name, _counted(_original_draw[name]))
+    elif not enabled and _original_draw:
+        for name, fn in _original_draw.items():
+            setattr(pygame.draw, name, fn)
+        _original_draw.clear()
+
+
+class PerfMonitor:
+    def __init__(self, entities=None, capacity=600, clock=time.perf_counter):
+        self.entities = entities
+        self.frames = deque(maxlen=capacity)
+        self.clock = clock
+        self.visible = False
+        self.frame = 0
+        self.started = None
+        self.interval = 0.0
+        self.last_lap = None
+        self.laps = {}
+        self.draw_calls_at_start = 0
+        self.font = None
+        self.overlay = None
+        self.overlay_frame = -1
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_F3:
+            self.visible = not self.visible
+            count_draw_calls(self.visible)
+        elif event.key == pygame.K_F4:
+            path = f"perf-{int(time.time())}.json"
+            self.dump(path)
+            print(f"Wrote {len(self.frames)} frames to {path}")
+
+    def begin_frame(self):
+        now = self.clock()
+        self.interval = now - self.started if self.started is not None else 0.0
+        self.started = self.last_lap = now
+        self.laps = {}
+        self.draw_calls_at_start = _draw_calls
+
+    def lap(self, name):
+        """Charge the time since the previous lap (or begin_frame) to `name`."""
+        now = self.clock()
+        self.laps[name] = self.laps.get(name, 0.0) + now - self.last_lap
+        self.last_lap = now
+
+    def end_frame(self):
+        record = {
+            "frame": self.frame,
+            "interval_ms": round(self.interval * 1000, 3),
+            "update_ms": round(self.laps.get("update", 0.0) * 1000, 3),
+            "draw_ms": round(self.laps.get("draw", 0.0) * 1000, 3),
+            "draw_calls": _draw_calls - self.draw_calls_at_start if self.visible else None,
+            "entities": self.entities() if self.entities else {},
+        }
+        self.frames.append(record)
+        self.frame += 1
+
+    def fps(self, window=30):
+        """Frames per second over the last `window` frames."""
+        recent = [f["interval_ms"] for f in list(self.frames)[-window:] if f["interval_ms"]]
+        return 1000 * len(recent) / sum(recent) if recent else 0.0
+
+    def draw_overlay(self, surface):
+        if not self.visible or not self.frames:
+            return
+        # Numbers change every frame; refresh the overlay a few times a second
+        # so it stays readable and does not rasterize text every frame
+        if self.overlay is None or self.frame - self.overlay_frame >= 15:
+            self.overlay = self.render_overlay()
+            self.overlay_frame = self.frame
+        surface.blit(self.overlay, (surface.get_width() - self.overlay.get_width() - 8, 8))
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        last = self.frames[-1]
+        lines = [
+            f"FPS {self.fps():.0f}",
+            f"update {last['update_ms']:.2f} ms",
+            f"draw {last['draw_ms']:.2f} ms",
+            f"draw calls {last['draw_calls'] if last['draw_calls'] is not None else '-'}",
+        ]
+        lines += [f"{name} {count}" for name, count in last["entities"].items()]
+        texts = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(t.get_width() for t in texts) + 12
+        overlay = pygame.Surface((width, len(texts) * 18 + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        for i, text in enumerate(texts):
+            overlay.blit(text, (6, 4 + i * 18))
+        return overlay
+
+    def dump(self, path=None):
+        """Return the ring buffer as JSON, also writing it to `path` if given."""
+        data = json.dumps({"frames": list(self.frames)}, indent=1)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return data
@@ -0,0 +1,301 @@
+"""
+Deterministic session recording and replay.
+
+A Recorder sits between a game and pygame's input and clock functions while
+it is played; a Replayer feeds the same frames back to a fresh Game with the
+same random seed, as fast as the game can run.
+
+Everything a game can observe is pinned down per frame (a frame starts at
+each pygame.event.get() call):
+
+- the global random module is seeded once before Game() is created
+- pygame.event.get() returns only input events (keys, mouse, QUIT)
+- pygame.key.get_pressed() and pygame.mouse.get_pos() are derived from
+  those events, so they are identical in both modes
+- pygame.time.get_ticks() is frozen for the whole frame
+- Game.timestep.advance() returns the recorded number of steps
+- work whose outcome depends on the wall clock, like a time-budgeted search,
+  goes through pinned(), which logs what it settled on for the replay
+
+A log stores the seed, one compact entry per frame ([tick delta], plus the
+step count and encoded events when there are any), the pinned values by
+frame and a digest of the game state every CHECKPOINT_EVERY frames and at
+the end.
+"""
+
+import os
+import json
+import random
+import hashlib
+
+import pygame
+
+FORMAT = 1
+CHECKPOINT_EVERY = 60
+INPUT_EVENTS = {pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEMOTION,
+                pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL}
+
+
+_session = None
+
+
+class ReplayFinished(Exception):
+    """Raised from pygame.event.get() once every recorded frame has been played."""
+
+
+class NullClock:
+    """pygame.time.Clock stand-in that never waits."""
+
+    def tick(self, framerate=0):
+        return 0
+
+    def get_fps(self):
+        return 0.0
+
+
+class InputState:
+    """Held keys and mouse position, tracked from the event stream."""
+
+    def __init__(self, mouse_pos=(0, 0)):
+        self.keys = set()
+        self.mouse_pos = tuple(mouse_pos)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+    def feed(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.keys.add(event.key)
+            elif event.type == pygame.KEYUP:
+                self.keys.discard(event.key)
+            elif event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.mouse_pos = tuple(event.pos)
+
+
+def new_seed():
+    return int.from_bytes(os.urandom(4), "little")
+
+
+def encode_event(event):
+    attrs = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            attrs[name] = list(value)
+        elif isinstance(value, (bool, int, float, str)) and name != "window":
+            attrs[name] = value
+    return [event.type, attrs]
+
+
+def decode_event(data):
+    event_type, attrs = data
+    return pygame.event.Event(event_type, {k: tuple(v) if isinstance(v, list) else v for k, v in attrs.items()})
+
+
+class _Unrecordable(Exception):
+    pass
+
+
+def _plain(value, module, depth):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v, module, depth) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v, module, depth) for k, v in value.items()}
+    if isinstance(value, pygame.Rect):
+        return list(value)
+    if type(value).__module__ == module and hasattr(value, "__dict__") and depth < 3:
+        return _fields(value, module, depth + 1)
+    raise _Unrecordable
+
+
+def _fields(obj, module, depth):
+    fields = {}
+    for name, value in vars(obj).items():
+        try:
+            fields[name] = _plain(value, module, depth)
+        except _Unrecordable:
+            pass
+    return fields
+
+
+def snapshot(game):
+    """Return the game's state as plain data: its attributes, minus surfaces, clocks and helpers.
+
+    Objects whose class is defined in the game module (pieces, ships, birds...)
+    are followed; anything else that is not plain data is left out.
+    """
+    return _fields(game, type(game).__module__, 0)
+
+
+def state_digest(game):
+    data = json.dumps(snapshot(game), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+def pinned(run):
+    """Call run(pin), which returns (result, value), and return the result.
+
+    `value` is plain data that pins down how the work came out, e.g. the depth
+    a time-budgeted search reached. Outside a session and while recording,
+    run gets None and works as it likes; the recording logs the value, and
+    the replay passes it back in so run can repeat the same work.
+    """
+    if _session is None:
+        return run(None)[0]
+    return _session.pinned(run)
+
+
+class _Session:
+    """Installs the pygame hooks shared by recording and replay.
+
+    Subclasses provide next_frame(), which stands in for pygame.event.get().
+    """
+
+    def __init__(self):
+        self.game = None
+        self.frame = 0
+        self.steps = 1
+        self.ticks = 0
+        self.input = InputState()
+        self.saved = {}
+
+    def install(self):
+        global _session
+        _session = self
+        self.saved = {
+            (pygame.event, "get"): pygame.event.get,
+            (pygame.key, "get_pressed"): pygame.key.get_pressed,
+            (pygame.mouse, "get_pos"): pygame.mouse.get_pos,
+            (pygame.time, "get_ticks"): pygame.time.get_ticks,
+        }
+        pygame.event.get = self.next_frame
+        pygame.key.get_pressed = lambda: self.input
+        pygame.mouse.get_pos = lambda: self.input.mouse_pos
+        pygame.time.get_ticks = lambda: self.ticks
+
+    def remove(self):
+        global _session
+        if _session is self:
+            _session = None
+        for (module, name), fn in self.saved.items():
+            setattr(module, name, fn)
+        self.saved = {}
+
+    def attach(self, game):
+        """Hook the game's own fixed-timestep clock, if it has one."""
+        self.game = game
+        timestep = getattr(game, "timestep", None)
+        if timestep is not None:
+            self.advance = timestep.advance
+            timestep.advance = self.timestep_advance
+
+    def timestep_advance(self):
+        return self.steps
+
+
+class Recorder(_Session):
+    def __init__(self, game_name, seed=None):
+        super().__init__()
+        self.game_name = game_name
+        self.seed = new_seed() if seed is None else seed
+        self.frames = []
+        self.checkpoints = {}
+        self.pins = {}
+
+    def install(self):
+        super().install()
+        random.seed(self.seed)
+        self.real_get = self.saved[(pygame.event, "get")]
+        self.real_ticks = self.saved[(pygame.time, "get_ticks")]
+        self.start_ticks = self.ticks = self.real_ticks()
+        self.start_mouse = self.saved[(pygame.mouse, "get_pos")]()
+        self.input = InputState(self.start_mouse)
+
+    def timestep_advance(self):
+        self.steps = self.advance()
+        if self.frames:
+            self.frames[-1][1] = self.steps
+        return self.steps
+
+    def next_frame(self, *args, **kwargs):
+        if self.game is not None and self.frame % CHECKPOINT_EVERY == 0:
+            self.checkpoints[str(self.frame)] = state_digest(self.game)
+        events = [e for e in self.real_get() if e.type in INPUT_EVENTS]
+        ticks = self.real_ticks()
+        self.frames.append([ticks - self.ticks, 1, *map(encode_event, events)])
+        self.ticks = ticks
+        self.frame += 1
+        self.input.feed(events)
+        return events
+
+    def pinned(self, run):
+        result, value = run(None)
+        self.pins.setdefault(str(self.frame), []).append(value)
+        return result
+
+    def log(self, finished=True):
+        """Return the session as a JSON-ready dict; `finished` is False if it was cut off mid-frame."""
+        frames = [f if len(f) > 2 or f[1] != 1 else f[:1] for f in self.frames]
+        return {
+            "format": FORMAT,
+            "game": self.game_name,
+            "seed": self.seed,
+            "start_ticks": self.start_ticks,
+            "mouse_pos": list(self.start_mouse),
+            "frames": frames,
+            "pins": self.pins,
+            "checkpoints": self.checkpoints,
+            "final": state_digest(self.game) if finished and self.game is not None else None,
+        }
+
+
+class Replayer(_Session):
+    def __init__(self, log):
+        super().__init__()
+        if log.get("format") != FORMAT:
+            raise ValueError(f"unsupported replay format {log.get('format')!r}")
+        self.log = log
+        self.mismatches = []
+        # pinned() calls made so far in the current frame
+        self.pin_index = 0
+
+    def install(self):
+        super().install()
+        random.seed(self.log["seed"])
+        self.ticks = self.log["start_ticks"]
+        self.input = InputState(self.log["mouse_pos"])
+
+    def attach(self, game):
+        super().attach(game)
+        game.clock = NullClock()
+
+    def check(self, label, expected):
+        actual = state_digest(self.game)
+        if expected is not None and actual != expected:
+            self.mismatches.append((label, expected, actual))
+
+    def next_frame(self, *args, **kwargs):
+        if self.game is not None and self.frame % CHECKPOINT_EVERY == 0:
+            self.check(f"frame {self.frame}", self.log["checkpoints"].get(str(self.frame)))
+        frames = self.log["frames"]
+        if self.frame >= len(frames):
+            raise ReplayFinished
+        entry = frames[self.frame]
+        self.ticks += entry[0]
+        self.steps = entry[1] if len(entry) > 1 else 1
+        events = [decode_event(e) for e in entry[2:]]
+        self.frame += 1
+        self.pin_index = 0
+        self.input.feed(events)
+        return events
+
+    def pinned(self, run):
+        values = self.log.get("pins", {}).get(str(self.frame), [])
+        if self.pin_index >= len(values):
+            # Not in the recording: the game has already diverged, and a checkpoint will say so
+            return run(None)[0]
+        value = values[self.pin_index]
+        self.pin_index += 1
+        return run(value)[0]
@@ -0,0 +1,65 @@
+"""
+Cached text rendering.
+
+Font.render() rasterizes every glyph on every call, and most text in these
+games (scores, labels, tile numbers) is the same from one frame to the next.
+render_text() keeps the rendered surfaces in a small LRU cache keyed by
+(font, text, antialias, color, background), so unchanged text costs a dict
+lookup instead of a rasterization:
+
+    self.screen.blit(render_text(self.font, f"Score: {self.score}", True, WHITE), (10, 10))
+
+Cached surfaces are shared between callers, so blit them but never draw on
+them or change their alpha.
+"""
+
+from collections import OrderedDict
+
+
+def _color_key(color):
+    return None if color is None else tuple(color)
+
+
+class TextCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Font.render() with the result cached; same arguments, same surface."""
+        key = (font, text, antialias, _color_key(color), _color_key(background))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Shared by every game in the process
+cache = TextCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    return cache.render(font, text, antialias, color, background)
@@ -0,0 +1,66 @@
+"""
+Fixed-timestep simulation clock.
+
+Game logic counts time in update() calls (drop timers, spawn timers...), so
+update() has to run at a fixed rate no matter how fast frames are drawn.
+FixedTimestep accumulates real elapsed time and says how many simulation
+steps are due before the next draw:
+
+    for _ in range(self.timestep.advance()):
+        self.update()
+    self.draw()
+
+On a slow tab several steps run per drawn frame; after a long stall (tab in
+the background) the backlog is capped at max_steps and the rest is dropped
+instead of fast-forwarding the game.
+"""
+
+import time
+
+
+class FixedTimestep:
+    def __init__(self, hz=60, max_steps=5, now=time.perf_counter):
+        self.hz = hz
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.now = now
+        self.accumulator = 0.0
+        self.last = None
+        self.steps = 0      # simulation steps run so far
+        self.dropped = 0    # steps skipped because the loop fell too far behind
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.last = None
+
+    def advance(self):
+        """Return the number of update() steps due since the previous call."""
+        now = self.now()
+        if self.last is None:
+            # First frame: simulate one step so the opening frame is not empty
+            self.last = now
+            self.steps += 1
+            return 1
+        elapsed = now - self.last
+        self.last = now
+
+        # Snap frame times that are within 1/8 step of a whole number of steps,
+        # so a display running at the simulation rate gets exactly one step per
+        # frame instead of jittering between 0 and 2.
+        whole = round(elapsed / self.dt)
+        if whole and abs(elapsed - whole * self.dt) < self.dt / 8:
+            elapsed = whole * self.dt
+
+        self.accumulator += max(0.0, elapsed)
+        steps = int(self.accumulator / self.dt + 1e-6)
+        self.accumulator = max(0.0, self.accumulator - steps * self.dt)
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step left in the accumulator, for interpolated drawing."""
+        return self.accumulator / self.dt
@@ -0,0 +1,92 @@
+"""
+Background work for game loops.
+
+Long computations (a puzzle generator) run on a worker thread so the game
+keeps drawing at full frame rate; the loop polls the returned Future once
+per frame. Browser builds have no threads, so there the work runs inside
+run_in_background() and the Future comes back already done.
+
+    self.job = run_in_background(generate, rng)
+    ...
+    if self.job is not None and self.job.done():
+        puzzle = self.job.result()
+        self.job = None
+
+Work written as a generator that yields every few milliseconds (an AI
+search) runs on the game loop itself instead, one slice per frame. That
+never blocks the browser, and since it needs no thread it finishes on the
+same frame every time, which keeps recorded sessions replayable.
+
+    self.search = run_in_steps(ai.search(position.copy()))
+    ...
+    if self.search is not None and self.search.step():
+        move = self.search.result()
+        self.search = None
+"""
+
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+
+THREADS = sys.platform != "emscripten"
+MAX_WORKERS = 2
+
+_executor = None
+
+
+def run_in_background(fn, *args, **kwargs):
+    """Start fn(*args, **kwargs) off the game loop and return its Future.
+
+    Drop the Future to ignore a result that is no longer wanted (e.g. after
+    a restart); the call itself cannot be interrupted, so keep it bounded.
+    """
+    global _executor
+    if not THREADS:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="gamekit")
+    return _executor.submit(fn, *args, **kwargs)
+
+
+class Steps:
+    """A generator run one slice per step(), with a Future's done() and result()."""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.finished = False
+        self.value = None
+        self.error = None
+
+    def step(self):
+        """Run the generator up to its next yield; True once it has returned."""
+        if not self.finished:
+            try:
+                next(self.steps)
+            except StopIteration as stop:
+                self.finished = True
+                self.value = stop.value
+            except Exception as e:
+                self.finished = True
+                self.error = e
+        return self.finished
+
+    def done(self):
+        return self.finished
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def run_in_steps(steps):
+    """Wrap a generator so the game loop can advance it a slice per frame.
+
+    Drop the result to abandon the work; the generator is simply never
+    resumed again.
+    """
+    return Steps(steps)
@@ -10,8 +10,13 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+
 pygame.init()
 
 CELL = 25
@@ -24,12 +29,15 @@ GREEN = (50, 200, 100)
 RED = (200, 50, 50)
 BLUE = (50, 100, 200)
 
+HEADER_RECT = pygame.Rect(0, 0, WIDTH, 40)
+
 class Game:
     def __init__(self):
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT + 40))
         pygame.display.set_caption("🏃 Maze Runner")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 30)
+        self.dirty = DirtyRects()
         self.reset()
     
     def reset(self):
@@ -39,6 +47,10 @@ class Game:
         self.maze[self.exit_pos[1]][self.exit_pos[0]] = 0
         self.moves = 0
         self.won = False
+        self.dirty.mark_all()
+    
+    def cell_rect(self, x, y):
+        return pygame.Rect(x * CELL, y * CELL + 40, CELL, CELL)
     
     def generate_maze(self):
         maze = [[1] * COLS for _ in range(ROWS)]
@@ -61,16 +73,22 @@ class Game:
             return
         nx, ny = self.player[0] + dx, self.player[1] + dy
         if 0 <= nx < COLS and 0 <= ny < ROWS and self.maze[ny][nx] == 0:
+            self.dirty.mark(self.cell_rect(*self.player), self.cell_rect(nx, ny), HEADER_RECT)
             self.player = [nx, ny]
             self.moves += 1
             if self.player == self.exit_pos:
                 self.won = True
     
-    def draw(self):
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        clip = self.screen.get_clip()
         self.screen.fill(BLACK)
         
-        for y in range(ROWS):
-            for x in range(COLS):
+        # Only the rows and columns the clip rect overlaps
+        y0, y1 = max(0, (clip.top - 40) // CELL), min(ROWS, (clip.bottom - 40) // CELL + 1)
+        x0, x1 = max(0, clip.left // CELL), min(COLS, clip.right // CELL + 1)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
                 if self.maze[y][x] == 1:
                     pygame.draw.rect(self.screen, WHITE, (x * CELL, y * CELL + 40, CELL, CELL))
         
@@ -84,18 +102,21 @@ class Game:
         
         # Draw header
         pygame.draw.rect(self.screen, BLUE, (0, 0, WIDTH, 40))
-        text = self.font.render(f"Moves: {self.moves}", True, WHITE)
+        text = render_text(self.font, f"Moves: {self.moves}", True, WHITE)
         self.screen.blit(text, (10, 10))
         
         if self.won:
-            text = self.font.render("🎉 You escaped!", True, GREEN)
+            text = render_text(self.font, "🎉 You escaped!", True, GREEN)
             self.screen.blit(text, (WIDTH // 2 - 60, 10))
-        
-        pygame.display.flip()
+    
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.dirty.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
@@ -10,8 +10,14 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit import background
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 SIZE = 520
@@ -50,18 +56,14 @@ class Game:
         self.screen = pygame.display.set_mode((SIZE, SIZE + 80))
         pygame.display.set_caption("🎴 Memory Match")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 60)
         self.title_font = pygame.font.Font(None, 42)
         self.small_font = pygame.font.Font(None, 28)
         self.reset()
     
     def draw_gradient_bg(self):
-        for y in range(SIZE + 80):
-            ratio = y / (SIZE + 80)
-            r = int(BG_GRADIENT_TOP[0] + (BG_GRADIENT_BOTTOM[0] - BG_GRADIENT_TOP[0]) * ratio)
-            g = int(BG_GRADIENT_TOP[1] + (BG_GRADIENT_BOTTOM[1] - BG_GRADIENT_TOP[1]) * ratio)
-            b = int(BG_GRADIENT_TOP[2] + (BG_GRADIENT_BOTTOM[2] - BG_GRADIENT_TOP[2]) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SIZE, y))
+        self.screen.blit(background.gradient(self.screen.get_size(), BG_GRADIENT_TOP, BG_GRADIENT_BOTTOM), (0, 0))
     
     def reset(self):
         cards = SYMBOLS[:8] * 2
@@ -128,12 +130,12 @@ class Game:
             self.screen.blit(glow_surf, glow_rect)
             
             pygame.draw.rect(self.screen, CARD_MATCHED, (x, y, w, h), border_radius=12)
-            symbol = self.font.render(card.symbol, True, WHITE)
+            symbol = render_text(self.font, card.symbol, True, WHITE)
             self.screen.blit(symbol, (x + w//2 - 18, y + h//2 - 18))
         elif card.revealed:
             pygame.draw.rect(self.screen, CARD_FRONT, (x, y, w, h), border_radius=12)
             pygame.draw.rect(self.screen, ACCENT, (x, y, w, h), width=3, border_radius=12)
-            symbol = self.font.render(card.symbol, True, (50, 50, 80))
+            symbol = render_text(self.font, card.symbol, True, (50, 50, 80))
             self.screen.blit(symbol, (x + w//2 - 18, y + h//2 - 18))
         else:
             # Card back with pattern
@@ -147,14 +149,14 @@ class Game:
         self.draw_gradient_bg()
         
         # Header
-        title = self.title_font.render("🎴 Memory Match", True, WHITE)
+        title = render_text(self.title_font, "🎴 Memory Match", True, WHITE)
         self.screen.blit(title, (SIZE // 2 - title.get_width() // 2, 15))
         
         # Stats
         elapsed = (pygame.time.get_ticks() - self.start_time) // 1000
-        moves_text = self.small_font.render(f"Moves: {self.moves}", True, GOLD)
-        time_text = self.small_font.render(f"Time: {elapsed}s", True, (150, 200, 255))
-        pairs_text = self.small_font.render(f"Pairs: {self.pairs_found}/8", True, CARD_MATCHED_GLOW)
+        moves_text = render_text(self.small_font, f"Moves: {self.moves}", True, GOLD)
+        time_text = render_text(self.small_font, f"Time: {elapsed}s", True, (150, 200, 255))
+        pairs_text = render_text(self.small_font, f"Pairs: {self.pairs_found}/8", True, CARD_MATCHED_GLOW)
         
         self.screen.blit(moves_text, (20, 55))
         self.screen.blit(time_text, (SIZE // 2 - time_text.get_width() // 2, 55))
@@ -170,9 +172,9 @@ class Game:
             overlay.fill((20, 20, 40, 200))
             self.screen.blit(overlay, (0, 0))
             
-            win_text = self.title_font.render("🎉 You Won! 🎉", True, GOLD)
-            stats_text = self.small_font.render(f"Completed in {self.moves} moves and {elapsed} seconds!", True, WHITE)
-            restart_text = self.small_font.render("Press R to play again", True, (150, 200, 255))
+            win_text = render_text(self.title_font, "🎉 You Won! 🎉", True, GOLD)
+            stats_text = render_text(self.small_font, f"Completed in {self.moves} moves and {elapsed} seconds!", True, WHITE)
+            restart_text = render_text(self.small_font, "Press R to play again", True, (150, 200, 255))
             
             self.screen.blit(win_text, (SIZE // 2 - win_text.get_width() // 2, SIZE // 2 - 40))
             self.screen.blit(stats_text, (SIZE // 2 - stats_text.get_width() // 2, SIZE // 2 + 20))
@@ -182,6 +184,7 @@ class Game:
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
@@ -194,7 +197,8 @@ class Game:
                         if 0 <= row < GRID and 0 <= col < GRID:
                             self.click(row, col)
             
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
 
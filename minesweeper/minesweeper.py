@@ -1,4 +1,3 @@
-import asyncio
 """
 💣 Minesweeper
 Find all mines without detonating!
@@ -6,108 +5,262 @@ Find all mines without detonating!
 Controls:
 - Left click to reveal
 - Right click to flag
-- R to restart
+- L to change board size (up to 100x100)
+- ESC to quit, R to restart
 """
 
-import tkinter as tk
-from tkinter import messagebox
+import pygame
 import random
+import sys
+import os
+import asyncio
+from collections import deque
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+
+pygame.init()
+
+# (name, rows, cols, mines)
+LEVELS = [("Classic", 10, 10, 15), ("Expert", 16, 30, 99), ("Huge", 100, 100, 1500)]
+HEADER = 50
+MARGIN = 10
+MIN_WIDTH = 420
+# Cells shrink so big boards still fit on screen
+MAX_CELL = 32
+MAX_BOARD_W, MAX_BOARD_H = 900, 700
+
+BG = (51, 51, 51)
+HIDDEN = (102, 102, 102)
+HIDDEN_LIGHT = (136, 136, 136)
+OPEN = (204, 204, 204)
+GRID = (153, 153, 153)
+BOOM = (255, 0, 0)
+MINE_BG = (255, 102, 102)
+MINE = (20, 20, 20)
+FLAG = (220, 30, 30)
+WHITE = (255, 255, 255)
+NUMBER_COLORS = [None, (0, 0, 255), (0, 128, 0), (255, 0, 0), (128, 0, 128),
+                 (128, 0, 0), (0, 170, 170), (0, 0, 0), (128, 128, 128)]
+
+
+def neighbour_table(rows, cols):
+    """Indices of the up to 8 cells around each cell of a rows x cols board, cells numbered row by row."""
+    table = []
+    for r in range(rows):
+        for c in range(cols):
+            table.append([nr * cols + nc
+                          for nr in range(max(r - 1, 0), min(r + 2, rows))
+                          for nc in range(max(c - 1, 0), min(c + 2, cols))
+                          if nr != r or nc != c])
+    return table
 
-class Minesweeper:
-    def __init__(self, rows=10, cols=10, mines=15):
-        self.rows, self.cols, self.mine_count = rows, cols, mines
-        self.window = tk.Tk()
-        self.window.title("💣 Minesweeper")
-        self.window.configure(bg='#333')
-        self.buttons = {}
+class Game:
+    def __init__(self):
+        pygame.display.set_caption("💣 Minesweeper")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 30)
+        self.dirty = DirtyRects()
+        self.set_level(0)
+
+    def set_level(self, level):
+        self.level = level
+        self.name, self.rows, self.cols, self.mine_count = LEVELS[level]
+        self.cell = max(min(MAX_CELL, MAX_BOARD_W // self.cols, MAX_BOARD_H // self.rows), 4)
+        board_w, board_h = self.cols * self.cell, self.rows * self.cell
+        width = max(board_w + 2 * MARGIN, MIN_WIDTH)
+        self.screen = pygame.display.set_mode((width, HEADER + board_h + MARGIN))
+        self.board_rect = pygame.Rect((width - board_w) // 2, HEADER, board_w, board_h)
+        self.header_rect = pygame.Rect(0, 0, width, HEADER)
+        self.neighbours = neighbour_table(self.rows, self.cols)
+        # The whole board is one surface; only cells that change are drawn onto it
+        self.canvas = pygame.Surface(self.board_rect.size)
+        self.sprites = self.make_sprites()
         self.reset()
-        self.window.bind('r', lambda e: self.reset())
-    
+
+    def make_sprites(self):
+        size = self.cell
+        sprites = {}
+        hidden = pygame.Surface((size, size))
+        hidden.fill(HIDDEN)
+        pygame.draw.line(hidden, HIDDEN_LIGHT, (0, 0), (size - 1, 0))
+        pygame.draw.line(hidden, HIDDEN_LIGHT, (0, 0), (0, size - 1))
+        if size >= 12:
+            pygame.draw.rect(hidden, BG, hidden.get_rect(), 1)
+        sprites["hidden"] = hidden
+
+        flag = hidden.copy()
+        pole_x = size // 2
+        pygame.draw.line(flag, MINE, (pole_x, size // 5), (pole_x, size - size // 5))
+        pygame.draw.polygon(flag, FLAG, [(pole_x, size // 5), (pole_x - size // 3, size // 3), (pole_x, size // 2)])
+        sprites["flag"] = flag
+
+        number_font = pygame.font.Font(None, max(size + size // 4, 8))
+        for count in range(9):
+            tile = pygame.Surface((size, size))
+            tile.fill(OPEN)
+            pygame.draw.rect(tile, GRID, tile.get_rect(), 1)
+            if count:
+                text = number_font.render(str(count), True, NUMBER_COLORS[count])
+                tile.blit(text, text.get_rect(center=(size // 2, size // 2 + 1)))
+            sprites[count] = tile
+
+        for key, color in (("mine", MINE_BG), ("boom", BOOM)):
+            tile = pygame.Surface((size, size))
+            tile.fill(color)
+            pygame.draw.rect(tile, GRID, tile.get_rect(), 1)
+            pygame.draw.circle(tile, MINE, (size // 2, size // 2), max(size // 4, 1))
+            sprites[key] = tile
+        return sprites
+
     def reset(self):
-        for btn in self.buttons.values():
-            btn.destroy()
-        self.buttons = {}
-        self.board = [[0] * self.cols for _ in range(self.rows)]
-        self.revealed = [[False] * self.cols for _ in range(self.rows)]
-        self.flagged = [[False] * self.cols for _ in range(self.rows)]
+        cells = self.rows * self.cols
+        self.mines = bytearray(cells)
+        # Mines around each cell, filled in once the mines are placed
+        self.board = bytearray(cells)
+        self.revealed = bytearray(cells)
+        self.flagged = bytearray(cells)
+        # Kept up to date by reveal(), so the win check is a comparison
+        self.unrevealed = cells
+        self.flags = 0
         self.game_over = False
+        self.won = False
+        self.exploded = None
         self.first_click = True
-        
-        for r in range(self.rows):
-            for c in range(self.cols):
-                btn = tk.Button(self.window, width=2, height=1, font=('Arial', 12, 'bold'),
-                               bg='#666', activebackground='#888')
-                btn.grid(row=r, column=c, padx=1, pady=1)
-                btn.bind('<Button-1>', lambda e, r=r, c=c: self.reveal(r, c))
-                btn.bind('<Button-3>', lambda e, r=r, c=c: self.toggle_flag(r, c))
-                self.buttons[(r, c)] = btn
-    
-    def place_mines(self, first_r, first_c):
-        positions = [(r, c) for r in range(self.rows) for c in range(self.cols)
-                    if abs(r - first_r) > 1 or abs(c - first_c) > 1]
-        mines = random.sample(positions, min(self.mine_count, len(positions)))
-        for r, c in mines:
-            self.board[r][c] = -1
-        
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.board[r][c] != -1:
-                    count = sum(1 for dr in [-1, 0, 1] for dc in [-1, 0, 1]
-                               if 0 <= r+dr < self.rows and 0 <= c+dc < self.cols
-                               and self.board[r+dr][c+dc] == -1)
-                    self.board[r][c] = count
-    
+        hidden = self.sprites["hidden"]
+        self.canvas.fill(HIDDEN)
+        self.canvas.blits([(hidden, (c * self.cell, r * self.cell)) for r in range(self.rows) for c in range(self.cols)],
+                          doreturn=False)
+        self.dirty.mark_all()
+
+    def place_mines(self, first):
+        safe = set(self.neighbours[first])
+        safe.add(first)
+        positions = [i for i in range(self.rows * self.cols) if i not in safe]
+        for i in random.sample(positions, min(self.mine_count, len(positions))):
+            self.mines[i] = 1
+            for j in self.neighbours[i]:
+                self.board[j] += 1
+
+    def sprite(self, i):
+        if self.revealed[i]:
+            if self.mines[i]:
+                return self.sprites["boom" if i == self.exploded else "mine"]
+            return self.sprites[self.board[i]]
+        if self.flagged[i]:
+            return self.sprites["flag"]
+        if self.game_over and self.mines[i]:
+            return self.sprites["mine"]
+        return self.sprites["hidden"]
+
+    def redraw(self, cells):
+        """Draw `cells` onto the board surface and mark the area they span for repainting."""
+        size, cols = self.cell, self.cols
+        top, left, bottom, right = self.rows, cols, -1, -1
+        blits = []
+        for i in cells:
+            r, c = divmod(i, cols)
+            blits.append((self.sprite(i), (c * size, r * size)))
+            top, bottom = min(top, r), max(bottom, r)
+            left, right = min(left, c), max(right, c)
+        if not blits:
+            return
+        self.canvas.blits(blits, doreturn=False)
+        self.dirty.mark((self.board_rect.x + left * size, self.board_rect.y + top * size,
+                         (right - left + 1) * size, (bottom - top + 1) * size))
+
     def reveal(self, r, c):
-        if self.game_over or self.flagged[r][c] or self.revealed[r][c]:
+        i = r * self.cols + c
+        if self.game_over or self.flagged[i] or self.revealed[i]:
             return
-        
+
         if self.first_click:
-            self.place_mines(r, c)
+            self.place_mines(i)
             self.first_click = False
-        
-        self.revealed[r][c] = True
-        btn = self.buttons[(r, c)]
-        
-        if self.board[r][c] == -1:
-            btn.config(text='💣', bg='red')
+
+        self.revealed[i] = 1
+        self.unrevealed -= 1
+        if self.mines[i]:
+            self.exploded = i
             self.game_over = True
             self.reveal_all()
-            messagebox.showinfo("Game Over", "💥 BOOM! You hit a mine!")
-        elif self.board[r][c] == 0:
-            btn.config(text='', bg='#ccc', relief='sunken')
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        self.reveal(nr, nc)
-        else:
-            colors = ['', 'blue', 'green', 'red', 'purple', 'maroon', 'cyan', 'black', 'gray']
-            btn.config(text=str(self.board[r][c]), fg=colors[self.board[r][c]], 
-                      bg='#ccc', relief='sunken')
-        
+            return
+
+        # Breadth-first flood fill: every empty (0) cell opens the cells around it
+        revealed, flagged, board, neighbours = self.revealed, self.flagged, self.board, self.neighbours
+        opened = []
+        queue = deque([i] if not board[i] else [])
+        while queue:
+            for j in neighbours[queue.popleft()]:
+                if not revealed[j] and not flagged[j]:
+                    revealed[j] = 1
+                    opened.append(j)
+                    if not board[j]:
+                        queue.append(j)
+        self.unrevealed -= len(opened)
+        self.redraw(opened + [i])
         self.check_win()
-    
+
     def toggle_flag(self, r, c):
-        if self.game_over or self.revealed[r][c]:
+        i = r * self.cols + c
+        if self.game_over or self.revealed[i]:
             return
-        self.flagged[r][c] = not self.flagged[r][c]
-        self.buttons[(r, c)].config(text='🚩' if self.flagged[r][c] else '')
-    
+        self.flagged[i] ^= 1
+        self.flags += 1 if self.flagged[i] else -1
+        self.redraw([i])
+        self.dirty.mark(self.header_rect)
+
     def reveal_all(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.board[r][c] == -1:
-                    self.buttons[(r, c)].config(text='💣', bg='#ff6666')
-    
+        self.redraw([i for i, mine in enumerate(self.mines) if mine])
+        self.dirty.mark(self.header_rect)
+
     def check_win(self):
-        unrevealed = sum(1 for r in range(self.rows) for c in range(self.cols)
-                        if not self.revealed[r][c])
-        if unrevealed == self.mine_count:
+        if self.unrevealed == self.mine_count:
             self.game_over = True
-            messagebox.showinfo("Congratulations!", "🎉 You won!")
-    
+            self.won = True
+            self.dirty.mark(self.header_rect)
+
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        if not self.board_rect.contains(self.screen.get_clip()):
+            self.screen.fill(BG)
+            left = render_text(self.font, f"{self.name}   Mines: {self.mine_count - self.flags}", True, WHITE)
+            self.screen.blit(left, (MARGIN, HEADER // 2 - left.get_height() // 2))
+            if self.game_over:
+                status = "You won!" if self.won else "BOOM! Press R"
+                right = render_text(self.font, status, True, WHITE)
+                self.screen.blit(right, (self.header_rect.right - right.get_width() - MARGIN,
+                                         HEADER // 2 - right.get_height() // 2))
+        self.screen.blit(self.canvas, self.board_rect)
+
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
+
     async def run(self):
-        self.window.mainloop()
+        while True:
+            await asyncio.sleep(0)
+            for event in pygame.event.get():
+                self.dirty.handle_event(event)
+                if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
+                    if event.key == pygame.K_r: self.reset()
+                    if event.key == pygame.K_l: self.set_level((self.level + 1) % len(LEVELS))
+                if event.type == pygame.MOUSEBUTTONDOWN and self.board_rect.collidepoint(event.pos):
+                    c = (event.pos[0] - self.board_rect.x) // self.cell
+                    r = (event.pos[1] - self.board_rect.y) // self.cell
+                    if event.button == 1:
+                        self.reveal(r, c)
+                    elif event.button == 3:
+                        self.toggle_flag(r, c)
+
+            self.draw()
+            self.clock.tick(60)
+
+async def main():
+    game = Game()
+    await game.run()
 
 if __name__ == "__main__":
-    Minesweeper().run()
\ No newline at end of file
+    asyncio.run(main())
@@ -10,9 +10,15 @@ Controls:
 
 import pygame
 import sys
+import os
 import asyncio
 import math
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit import background
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 WIDTH, HEIGHT = 800, 450
@@ -107,27 +113,23 @@ class Game:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("🎮 Platformer")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 48)
         self.small_font = pygame.font.Font(None, 28)
         self.reset()
     
-    def draw_sky(self):
-        for y in range(HEIGHT):
-            ratio = y / HEIGHT
-            r = int(SKY_TOP[0] + (SKY_BOTTOM[0] - SKY_TOP[0]) * ratio)
-            g = int(SKY_TOP[1] + (SKY_BOTTOM[1] - SKY_TOP[1]) * ratio)
-            b = int(SKY_TOP[2] + (SKY_BOTTOM[2] - SKY_TOP[2]) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+    def draw_sky(self, surface):
+        background.paint_gradient(surface, SKY_TOP, SKY_BOTTOM)
     
-    def draw_clouds(self):
+    def draw_clouds(self, surface):
         clouds = [(100, 60), (300, 40), (550, 70), (700, 30)]
         for cx, cy in clouds:
-            pygame.draw.ellipse(self.screen, CLOUD, (cx, cy, 80, 40))
-            pygame.draw.ellipse(self.screen, CLOUD, (cx + 20, cy - 15, 60, 35))
-            pygame.draw.ellipse(self.screen, CLOUD, (cx + 50, cy, 70, 35))
+            pygame.draw.ellipse(surface, CLOUD, (cx, cy, 80, 40))
+            pygame.draw.ellipse(surface, CLOUD, (cx + 20, cy - 15, 60, 35))
+            pygame.draw.ellipse(surface, CLOUD, (cx + 50, cy, 70, 35))
     
-    def draw_sun(self):
-        pygame.draw.circle(self.screen, SUN, (700, 80), 50)
+    def draw_sun(self, surface):
+        pygame.draw.circle(surface, SUN, (700, 80), 50)
         # Sun rays
         for angle in range(0, 360, 30):
             rad = math.radians(angle)
@@ -135,7 +137,13 @@ class Game:
             y1 = 80 + math.sin(rad) * 55
             x2 = 700 + math.cos(rad) * 70
             y2 = 80 + math.sin(rad) * 70
-            pygame.draw.line(self.screen, SUN, (x1, y1), (x2, y2), 3)
+            pygame.draw.line(surface, SUN, (x1, y1), (x2, y2), 3)
+    
+    def paint_scenery(self, surface):
+        # Static backdrop, painted once into a cached layer
+        self.draw_sky(surface)
+        self.draw_sun(surface)
+        self.draw_clouds(surface)
     
     def reset(self):
         self.player = Player(50, 300)
@@ -151,6 +159,13 @@ class Game:
         self.won = False
         self.coins_collected = 0
     
+    def update(self):
+        if self.won:
+            return
+        self.player.update(self.platforms)
+        if self.player.rect.colliderect(self.goal):
+            self.won = True
+    
     def draw_platform(self, p):
         rect = p['rect']
         # Dirt layer
@@ -179,9 +194,7 @@ class Game:
         pygame.draw.circle(self.screen, GOLD, (self.goal.x + 28, self.goal.y + 10), 6)
     
     def draw(self):
-        self.draw_sky()
-        self.draw_sun()
-        self.draw_clouds()
+        self.screen.blit(background.layer("platformer-scenery", self.screen.get_size(), self.paint_scenery), (0, 0))
         
         for p in self.platforms:
             self.draw_platform(p)
@@ -195,8 +208,8 @@ class Game:
             overlay.fill((255, 255, 255, 150))
             self.screen.blit(overlay, (0, 0))
             
-            text = self.font.render("🎉 You Win! 🎉", True, (50, 50, 50))
-            hint = self.small_font.render("Press R to play again", True, (80, 80, 80))
+            text = render_text(self.font, "🎉 You Win! 🎉", True, (50, 50, 50))
+            hint = render_text(self.small_font, "Press R to play again", True, (80, 80, 80))
             self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 30))
             self.screen.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT // 2 + 20))
         
@@ -204,6 +217,7 @@ class Game:
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
@@ -211,11 +225,8 @@ class Game:
                     if event.key == pygame.K_r: self.reset()
                     if event.key == pygame.K_SPACE: self.player.jump()
             
-            if not self.won:
-                self.player.update(self.platforms)
-                if self.player.rect.colliderect(self.goal):
-                    self.won = True
-            
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
 
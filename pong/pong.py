@@ -11,8 +11,13 @@ Controls:
 
 import pygame
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 # Constants
@@ -84,6 +89,7 @@ class Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("🏓 Pong")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 74)
         self.small_font = pygame.font.Font(None, 36)
         self.reset()
@@ -108,25 +114,25 @@ class Game:
                     elif not self.ball.active:
                         self.ball.active = True
         
-        if not self.game_over:
-            keys = pygame.key.get_pressed()
-            # Player 1 controls
-            if keys[pygame.K_w]:
-                self.paddle1.move(-1)
-            if keys[pygame.K_s]:
-                self.paddle1.move(1)
-            # Player 2 controls
-            if keys[pygame.K_UP]:
-                self.paddle2.move(-1)
-            if keys[pygame.K_DOWN]:
-                self.paddle2.move(1)
-        
         return True
     
     def update(self):
         if self.game_over:
             return
         
+        # Held keys are polled per simulation step so paddle speed doesn't follow the frame rate
+        keys = pygame.key.get_pressed()
+        # Player 1 controls
+        if keys[pygame.K_w]:
+            self.paddle1.move(-1)
+        if keys[pygame.K_s]:
+            self.paddle1.move(1)
+        # Player 2 controls
+        if keys[pygame.K_UP]:
+            self.paddle2.move(-1)
+        if keys[pygame.K_DOWN]:
+            self.paddle2.move(1)
+        
         self.ball.update()
         
         # Check paddle collisions
@@ -176,14 +182,14 @@ class Game:
         self.ball.draw(self.screen)
         
         # Draw scores
-        score1_text = self.font.render(str(self.paddle1.score), True, CYAN)
-        score2_text = self.font.render(str(self.paddle2.score), True, MAGENTA)
+        score1_text = render_text(self.font, str(self.paddle1.score), True, CYAN)
+        score2_text = render_text(self.font, str(self.paddle2.score), True, MAGENTA)
         self.screen.blit(score1_text, (WINDOW_WIDTH // 4, 20))
         self.screen.blit(score2_text, (3 * WINDOW_WIDTH // 4 - score2_text.get_width(), 20))
         
         # Draw instructions
         if not self.ball.active and not self.game_over:
-            instructions = self.small_font.render("Press SPACE to start", True, WHITE)
+            instructions = render_text(self.small_font, "Press SPACE to start", True, WHITE)
             self.screen.blit(instructions, (WINDOW_WIDTH // 2 - instructions.get_width() // 2, WINDOW_HEIGHT - 50))
         
         # Draw game over
@@ -194,8 +200,8 @@ class Game:
             self.screen.blit(overlay, (0, 0))
             
             winner_color = CYAN if self.winner == "Player 1" else MAGENTA
-            winner_text = self.font.render(f"{self.winner} Wins!", True, winner_color)
-            restart_text = self.small_font.render("Press SPACE to restart", True, WHITE)
+            winner_text = render_text(self.font, f"{self.winner} Wins!", True, winner_color)
+            restart_text = render_text(self.small_font, "Press SPACE to restart", True, WHITE)
             
             self.screen.blit(winner_text, (WINDOW_WIDTH // 2 - winner_text.get_width() // 2, WINDOW_HEIGHT // 2 - 40))
             self.screen.blit(restart_text, (WINDOW_WIDTH // 2 - restart_text.get_width() // 2, WINDOW_HEIGHT // 2 + 30))
@@ -207,7 +213,8 @@ class Game:
         while running:
             await asyncio.sleep(0)
             running = self.handle_input()
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
         
@@ -0,0 +1,127 @@
+"""
+🎬 Record and replay game sessions
+
+Records a pygame game session (seed + per-frame input log) and replays it
+headlessly as fast as the game runs, checking that the game state matches the
+recording at every checkpoint and at the end.
+
+Usage:
+    python replay.py record tetris                  # play normally, ESC to stop
+    python replay.py record tetris --seed 42 -o tetris.replay.json
+    python replay.py play tetris.replay.json        # exits 1 if the state diverged
+    python replay.py play tetris.replay.json --repeat 20 --profile
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+import pygame
+
+from gamekit.loader import load_game_module
+from gamekit.replay import Recorder, Replayer, ReplayFinished
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_game(module, session):
+    """Create a Game under `session`'s hooks and run it until it exits or the log runs out."""
+    pygame.init()
+    session.install()
+    try:
+        game = module.Game()
+        session.attach(game)
+        asyncio.run(game.run())
+    except (SystemExit, ReplayFinished):
+        pass
+    finally:
+        session.remove()
+    return game
+
+
+def record(args):
+    module = load_game_module(args.game, ROOT_DIR, prefix="replay_")
+    recorder = Recorder(args.game, seed=args.seed)
+    finished = True
+    try:
+        run_game(module, recorder)
+    except KeyboardInterrupt:
+        # Stopped mid-frame, so the final state would not match a replay
+        finished = False
+    log = recorder.log(finished)
+    path = args.output or f"{args.game}-{recorder.seed}.replay.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(log, f, separators=(",", ":"))
+    print(f"Recorded {len(log['frames'])} frames of {args.game} (seed {recorder.seed}) to {path}")
+
+
+def play_once(module, log):
+    replayer = Replayer(log)
+    # Keep the display alive when the recorded session ends with ESC
+    quit_pygame, pygame.quit = pygame.quit, lambda: None
+    try:
+        run_game(module, replayer)
+    finally:
+        pygame.quit = quit_pygame
+    replayer.check("final state", log["final"])
+    return replayer
+
+
+def play(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    with open(args.log, "r", encoding="utf-8") as f:
+        log = json.load(f)
+    module = load_game_module(log["game"], ROOT_DIR, prefix="replay_")
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        replayer = play_once(module, log)
+    elapsed = time.perf_counter() - start
+    if profiler:
+        import pstats
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+    frames = len(log["frames"]) * args.repeat
+    print(f"Replayed {frames} frames of {log['game']} in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s)")
+    if replayer.mismatches:
+        for label, expected, actual in replayer.mismatches:
+            print(f"  {label}: expected {expected}, got {actual}")
+        print("State diverged from the recording")
+        sys.exit(1)
+    print(f"State matched at {len(log['checkpoints'])} checkpoints"
+          + (" and at the end" if log["final"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay pygame game sessions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="play a game and record the session")
+    rec.add_argument("game", help="game folder, e.g. tetris")
+    rec.add_argument("--seed", type=int, help="random seed (default: random)")
+    rec.add_argument("-o", "--output", metavar="FILE", help="log file (default: <game>-<seed>.replay.json)")
+
+    ply = sub.add_parser("play", help="replay a recorded session headlessly and check its state")
+    ply.add_argument("log", help="replay log written by 'record'")
+    ply.add_argument("--repeat", type=int, default=1, help="replay the session this many times")
+    ply.add_argument("--profile", action="store_true", help="print the top cProfile entries")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    else:
+        play(args)
+
+
+if __name__ == "__main__":
+    main()
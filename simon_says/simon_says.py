@@ -10,8 +10,14 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit import background
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 SIZE = 450
@@ -32,18 +38,14 @@ class Game:
         self.screen = pygame.display.set_mode((SIZE, SIZE + 100))
         pygame.display.set_caption("🔔 Simon Says")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 36)
         self.title_font = pygame.font.Font(None, 42)
         self.small_font = pygame.font.Font(None, 26)
         self.reset()
     
     def draw_gradient(self):
-        for y in range(SIZE + 100):
-            ratio = y / (SIZE + 100)
-            r = int(BG_TOP[0] + (BG_BOTTOM[0] - BG_TOP[0]) * ratio)
-            g = int(BG_TOP[1] + (BG_BOTTOM[1] - BG_TOP[1]) * ratio)
-            b = int(BG_TOP[2] + (BG_BOTTOM[2] - BG_TOP[2]) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SIZE, y))
+        self.screen.blit(background.gradient(self.screen.get_size(), BG_TOP, BG_BOTTOM), (0, 0))
     
     def reset(self):
         self.sequence = []
@@ -134,12 +136,12 @@ class Game:
         self.draw_gradient()
         
         # Header
-        title = self.title_font.render("🔔 Simon Says", True, WHITE)
+        title = render_text(self.title_font, "🔔 Simon Says", True, WHITE)
         self.screen.blit(title, (SIZE // 2 - title.get_width() // 2, 15))
         
         # Stats
-        score_text = self.font.render(f"Score: {self.score}", True, GOLD)
-        high_text = self.small_font.render(f"Best: {self.high_score}", True, (150, 200, 255))
+        score_text = render_text(self.font, f"Score: {self.score}", True, GOLD)
+        high_text = render_text(self.small_font, f"Best: {self.high_score}", True, (150, 200, 255))
         self.screen.blit(score_text, (SIZE // 2 - score_text.get_width() // 2, 55))
         self.screen.blit(high_text, (SIZE // 2 - high_text.get_width() // 2, 85))
         
@@ -150,11 +152,11 @@ class Game:
         
         # Status message
         if self.game_over:
-            status = self.font.render("Game Over! Press R", True, (255, 100, 120))
+            status = render_text(self.font, "Game Over! Press R", True, (255, 100, 120))
         elif self.state == 'showing':
-            status = self.font.render("Watch carefully...", True, (150, 200, 255))
+            status = render_text(self.font, "Watch carefully...", True, (150, 200, 255))
         else:
-            status = self.font.render("Your turn!", True, (100, 255, 150))
+            status = render_text(self.font, "Your turn!", True, (100, 255, 150))
         
         self.screen.blit(status, (SIZE // 2 - status.get_width() // 2, SIZE + 55))
         
@@ -162,6 +164,7 @@ class Game:
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
@@ -177,7 +180,8 @@ class Game:
                         if x1 <= x <= x2 and y1 <= y <= y2:
                             self.check_input(i)
             
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
 
@@ -10,8 +10,14 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit import background
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+
 pygame.init()
 
 SIZE = 450
@@ -35,6 +41,8 @@ WHITE = (255, 255, 255)
 SHADOW = (15, 20, 40)
 GOLD = (255, 215, 0)
 
+STATS_RECT = pygame.Rect(0, 50, SIZE, 30)
+
 class Game:
     def __init__(self):
         self.screen = pygame.display.set_mode((SIZE, SIZE + 80))
@@ -43,21 +51,19 @@ class Game:
         self.font = pygame.font.Font(None, 56)
         self.title_font = pygame.font.Font(None, 38)
         self.small_font = pygame.font.Font(None, 28)
+        self.dirty = DirtyRects()
         self.reset()
     
     def draw_gradient(self):
-        for y in range(SIZE + 80):
-            ratio = y / (SIZE + 80)
-            r = int(BG_TOP[0] + (BG_BOTTOM[0] - BG_TOP[0]) * ratio)
-            g = int(BG_TOP[1] + (BG_BOTTOM[1] - BG_TOP[1]) * ratio)
-            b = int(BG_TOP[2] + (BG_BOTTOM[2] - BG_TOP[2]) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SIZE, y))
+        self.screen.blit(background.gradient(self.screen.get_size(), BG_TOP, BG_BOTTOM), (0, 0))
     
     def reset(self):
         self.tiles = list(range(1, 16)) + [0]
         self.moves = 0
         self.shuffle()
         self.start_time = pygame.time.get_ticks()
+        self.shown_elapsed = 0
+        self.dirty.mark_all()
     
     def shuffle(self):
         for _ in range(200):
@@ -84,6 +90,20 @@ class Game:
             new_pos = nr * GRID + nc
             self.tiles[empty], self.tiles[new_pos] = self.tiles[new_pos], self.tiles[empty]
             self.moves += 1
+            if self.is_solved():
+                self.dirty.mark_all()
+            else:
+                self.dirty.mark(self.cell_rect(er, ec), self.cell_rect(nr, nc), STATS_RECT)
+    
+    def cell_rect(self, r, c):
+        return pygame.Rect(c * CELL, r * CELL + 80, CELL, CELL)
+    
+    def update(self):
+        # The clock in the stats row is the only thing that changes without input
+        elapsed = (pygame.time.get_ticks() - self.start_time) // 1000
+        if elapsed != self.shown_elapsed:
+            self.shown_elapsed = elapsed
+            self.dirty.mark(STATS_RECT)
     
     def is_solved(self):
         return self.tiles == list(range(1, 16)) + [0]
@@ -108,29 +128,32 @@ class Game:
         pygame.draw.rect(self.screen, highlight, (x, y, w, 8), border_radius=12)
         
         # Number
-        text = self.font.render(str(num), True, WHITE)
-        shadow_text = self.font.render(str(num), True, SHADOW)
+        text = render_text(self.font, str(num), True, WHITE)
+        shadow_text = render_text(self.font, str(num), True, SHADOW)
         self.screen.blit(shadow_text, (x + w//2 - text.get_width()//2 + 2, y + h//2 - text.get_height()//2 + 2))
         self.screen.blit(text, (x + w//2 - text.get_width()//2, y + h//2 - text.get_height()//2))
     
-    def draw(self):
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        clip = self.screen.get_clip()
         self.draw_gradient()
         
         # Header
-        title = self.title_font.render("🧩 Sliding Puzzle", True, WHITE)
+        title = render_text(self.title_font, "🧩 Sliding Puzzle", True, WHITE)
         self.screen.blit(title, (SIZE // 2 - title.get_width() // 2, 15))
         
         # Stats
-        elapsed = (pygame.time.get_ticks() - self.start_time) // 1000
-        moves_text = self.small_font.render(f"Moves: {self.moves}", True, GOLD)
-        time_text = self.small_font.render(f"Time: {elapsed}s", True, (150, 200, 255))
-        self.screen.blit(moves_text, (20, 55))
-        self.screen.blit(time_text, (SIZE - time_text.get_width() - 20, 55))
+        if clip.colliderect(STATS_RECT):
+            elapsed = self.shown_elapsed
+            moves_text = render_text(self.small_font, f"Moves: {self.moves}", True, GOLD)
+            time_text = render_text(self.small_font, f"Time: {elapsed}s", True, (150, 200, 255))
+            self.screen.blit(moves_text, (20, 55))
+            self.screen.blit(time_text, (SIZE - time_text.get_width() - 20, 55))
         
         # Draw tiles
         for i, tile in enumerate(self.tiles):
             r, c = i // GRID, i % GRID
-            if tile != 0:
+            if tile != 0 and clip.colliderect(self.cell_rect(r, c)):
                 self.draw_tile(tile, r, c)
         
         if self.is_solved():
@@ -138,19 +161,22 @@ class Game:
             overlay.fill((20, 30, 50, 220))
             self.screen.blit(overlay, (0, 0))
             
-            text = self.title_font.render("🎉 SOLVED! 🎉", True, GOLD)
-            stats = self.small_font.render(f"Completed in {self.moves} moves!", True, WHITE)
-            hint = self.small_font.render("Press R for new puzzle", True, (150, 200, 255))
+            text = render_text(self.title_font, "🎉 SOLVED! 🎉", True, GOLD)
+            stats = render_text(self.small_font, f"Completed in {self.moves} moves!", True, WHITE)
+            hint = render_text(self.small_font, "Press R for new puzzle", True, (150, 200, 255))
             
             self.screen.blit(text, (SIZE // 2 - text.get_width() // 2, SIZE // 2 - 20))
             self.screen.blit(stats, (SIZE // 2 - stats.get_width() // 2, SIZE // 2 + 30))
             self.screen.blit(hint, (SIZE // 2 - hint.get_width() // 2, SIZE // 2 + 70))
-        
-        pygame.display.flip()
+    
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.dirty.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
@@ -160,6 +186,7 @@ class Game:
                     if event.key == pygame.K_LEFT: self.move('left')
                     if event.key == pygame.K_RIGHT: self.move('right')
             
+            self.update()
             self.draw()
             self.clock.tick(60)
 
@@ -10,8 +10,14 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit import background
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 WINDOW_WIDTH = 800
@@ -78,6 +84,7 @@ class Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("🐍 Snake Game")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(12)
         self.font = pygame.font.Font(None, 36)
         self.big_font = pygame.font.Font(None, 72)
         self.reset()
@@ -91,12 +98,7 @@ class Game:
         self.game_over = False
     
     def draw_gradient_bg(self):
-        for y in range(WINDOW_HEIGHT):
-            ratio = y / WINDOW_HEIGHT
-            r = int(BG_TOP[0] + (BG_BOTTOM[0] - BG_TOP[0]) * ratio)
-            g = int(BG_TOP[1] + (BG_BOTTOM[1] - BG_TOP[1]) * ratio)
-            b = int(BG_TOP[2] + (BG_BOTTOM[2] - BG_TOP[2]) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WINDOW_WIDTH, y))
+        self.screen.blit(background.gradient(self.screen.get_size(), BG_TOP, BG_BOTTOM), (0, 0))
     
     def draw_grid(self):
         for x in range(0, WINDOW_WIDTH, GRID_SIZE):
@@ -186,8 +188,8 @@ class Game:
                 pygame.draw.rect(self.screen, color, rect, border_radius=5)
         
         # HUD
-        score_text = self.font.render(f"Score: {self.score}", True, GOLD)
-        high_text = self.font.render(f"Best: {self.high_score}", True, (150, 200, 255))
+        score_text = render_text(self.font, f"Score: {self.score}", True, GOLD)
+        high_text = render_text(self.font, f"Best: {self.high_score}", True, (150, 200, 255))
         self.screen.blit(score_text, (15, 10))
         self.screen.blit(high_text, (WINDOW_WIDTH - high_text.get_width() - 15, 10))
         
@@ -196,9 +198,9 @@ class Game:
             overlay.fill((15, 20, 35, 200))
             self.screen.blit(overlay, (0, 0))
             
-            game_over_text = self.big_font.render("GAME OVER", True, FOOD_COLOR)
-            score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-            restart_text = self.font.render("Press SPACE to restart", True, (150, 200, 255))
+            game_over_text = render_text(self.big_font, "GAME OVER", True, FOOD_COLOR)
+            score_text = render_text(self.font, f"Final Score: {self.score}", True, WHITE)
+            restart_text = render_text(self.font, "Press SPACE to restart", True, (150, 200, 255))
             
             self.screen.blit(game_over_text, (WINDOW_WIDTH // 2 - game_over_text.get_width() // 2, WINDOW_HEIGHT // 2 - 70))
             self.screen.blit(score_text, (WINDOW_WIDTH // 2 - score_text.get_width() // 2, WINDOW_HEIGHT // 2))
@@ -211,7 +213,8 @@ class Game:
         while running:
             await asyncio.sleep(0)
             running = self.handle_input()
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(12)
         pygame.quit()
@@ -12,8 +12,14 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+from gamekit.perf import PerfMonitor
+
 # Initialize Pygame
 pygame.init()
 
@@ -106,6 +112,8 @@ class Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Space Invaders")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
+        self.perf = PerfMonitor(entities=lambda: {"aliens": len(self.aliens), "bullets": len(self.bullets)})
         self.font = pygame.font.Font(None, 36)
         
         self.reset_game()
@@ -130,6 +138,7 @@ class Game:
 
     def handle_input(self):
         for event in pygame.event.get():
+            self.perf.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
@@ -140,19 +149,19 @@ class Game:
                 if event.key == pygame.K_r and self.game_over:
                     self.reset_game()
         
-        keys = pygame.key.get_pressed()
-        if not self.game_over:
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                self.player.move(-1)
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                self.player.move(1)
-        
         return True
 
     def update(self):
         if self.game_over:
             return
 
+        # Held keys are polled per simulation step so speed doesn't follow the frame rate
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            self.player.move(-1)
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            self.player.move(1)
+
         # Update bullets
         for bullet in self.bullets[:]:
             bullet.update()
@@ -211,22 +220,29 @@ class Game:
             bullet.draw(self.screen)
             
         # Draw UI
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+        score_text = render_text(self.font, f"Score: {self.score}", True, WHITE)
         self.screen.blit(score_text, (10, 10))
         
         if self.game_over:
-            game_over_text = self.font.render("GAME OVER - Press R to Restart", True, RED)
+            game_over_text = render_text(self.font, "GAME OVER - Press R to Restart", True, RED)
             text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
             self.screen.blit(game_over_text, text_rect)
             
+        self.perf.draw_overlay(self.screen)
         pygame.display.flip()
 
     async def run(self):
         running = True
         while running:
             running = self.handle_input()
-            self.update()
+            self.perf.begin_frame()
+            for _ in range(self.timestep.advance()):
+                self.update()
+            self.perf.lap("update")
             self.draw()
+            self.perf.lap("draw")
+            self.perf.end_frame()
+            self.clock.tick(60)
             # This is crucial for web capability
             await asyncio.sleep(0) 
 
@@ -0,0 +1,252 @@
+"""
+🧮 Bitmask Sudoku solver and puzzle generator
+
+A grid is a flat list of 81 digits, 0 for an empty cell, read row by row.
+Every row, column and 3x3 box keeps a 9-bit mask of the digits already in
+it, so a cell's candidates are one OR and one AND away:
+    ALL & ~(rows[r] | cols[c] | boxes[b])
+
+Search propagates before every branch:
+- naked singles: a cell with one candidate left takes it
+- hidden singles: a digit with one possible cell left in a row, column or
+  box goes there
+and then branches on the empty cell with the fewest candidates. Counting
+stops as soon as `limit` solutions are found, so asking whether a puzzle
+is unique costs at most two solutions. A puzzle is rated by the hardest of
+these steps it needs: naked singles alone, hidden singles too, or guessing.
+
+Puzzles are carved from a random solved grid by emptying cells in random
+order, putting a digit back whenever removing it would allow a second
+solution.
+
+Benchmark of solving and generating:
+    python sudoku/candidates.py --puzzles 200
+"""
+
+import time
+import random
+import argparse
+
+CELLS = 81
+ALL = (1 << 9) - 1
+ROW = [i // 9 for i in range(CELLS)]
+COL = [i % 9 for i in range(CELLS)]
+BOX = [i // 27 * 3 + i % 9 // 3 for i in range(CELLS)]
+# The 27 rows, columns and boxes as lists of cell indices
+UNITS = ([[r * 9 + c for c in range(9)] for r in range(9)]
+         + [[r * 9 + c for r in range(9)] for c in range(9)]
+         + [[i for i in range(CELLS) if BOX[i] == b] for b in range(9)])
+POPCOUNT = [bin(mask).count("1") for mask in range(1 << 9)]
+DIGIT = {1 << (d - 1): d for d in range(1, 10)}
+# Puzzle ratings: the hardest solving technique a puzzle needs
+NAKED_SINGLES, HIDDEN_SINGLES, GUESSING = range(3)
+
+
+def digits_of(mask):
+    """Digits whose bits are set in `mask`, smallest first."""
+    return [d for d in range(1, 10) if mask >> (d - 1) & 1]
+
+
+class Board:
+    def __init__(self, cells=None):
+        self.cells = [0] * CELLS
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.valid = True
+        if cells is not None:
+            for i, digit in enumerate(cells):
+                if digit:
+                    if not self.candidates(i) >> (digit - 1) & 1:
+                        self.valid = False
+                    self.place(i, digit)
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.cells = self.cells[:]
+        board.rows = self.rows[:]
+        board.cols = self.cols[:]
+        board.boxes = self.boxes[:]
+        board.valid = self.valid
+        return board
+
+    def candidates(self, i):
+        return ALL & ~(self.rows[ROW[i]] | self.cols[COL[i]] | self.boxes[BOX[i]])
+
+    def place(self, i, digit):
+        bit = 1 << (digit - 1)
+        self.cells[i] = digit
+        self.rows[ROW[i]] |= bit
+        self.cols[COL[i]] |= bit
+        self.boxes[BOX[i]] |= bit
+
+    def naked_singles(self):
+        """Fill every cell left with one candidate; how many were filled, or -1 on a contradiction."""
+        cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+        placed = 0
+        for i in range(CELLS):
+            if cells[i]:
+                continue
+            mask = ALL & ~(rows[ROW[i]] | cols[COL[i]] | boxes[BOX[i]])
+            if not mask:
+                return -1
+            if not mask & (mask - 1):
+                self.place(i, DIGIT[mask])
+                placed += 1
+        return placed
+
+    def hidden_singles(self):
+        """Put each digit with one possible cell left in a unit there; how many, or -1 on a contradiction."""
+        cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+        placed = 0
+        for unit in UNITS:
+            once = twice = filled = 0
+            for i in unit:
+                if cells[i]:
+                    filled |= 1 << (cells[i] - 1)
+                else:
+                    mask = ALL & ~(rows[ROW[i]] | cols[COL[i]] | boxes[BOX[i]])
+                    twice |= once & mask
+                    once |= mask
+            if once | filled != ALL:
+                # Some digit has nowhere left to go in this unit
+                return -1
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for i in unit:
+                    if not cells[i] and self.candidates(i) & bit:
+                        self.place(i, DIGIT[bit])
+                        break
+                else:
+                    # Its only cell was just taken by another hidden single
+                    return -1
+                placed += 1
+        return placed
+
+    def propagate(self):
+        """Fill naked and hidden singles until none are left; False on a contradiction."""
+        while True:
+            naked = self.naked_singles()
+            if naked < 0:
+                return False
+            hidden = self.hidden_singles()
+            if hidden < 0:
+                return False
+            if not naked and not hidden:
+                return True
+
+    def most_constrained(self):
+        """The empty cell with the fewest candidates, or None if the grid is full."""
+        best, best_count = None, 10
+        for i in range(CELLS):
+            if not self.cells[i]:
+                count = POPCOUNT[self.candidates(i)]
+                if count < best_count:
+                    best, best_count = i, count
+                    if count <= 2:
+                        break
+        return best
+
+
+def _search(board, limit, solutions, rng):
+    if not board.propagate():
+        return
+    i = board.most_constrained()
+    if i is None:
+        solutions.append(board.cells[:])
+        return
+    digits = digits_of(board.candidates(i))
+    if rng is not None:
+        rng.shuffle(digits)
+    for digit in digits:
+        child = board.copy()
+        child.place(i, digit)
+        _search(child, limit, solutions, rng)
+        if len(solutions) >= limit:
+            return
+
+
+def solve(cells, limit=1, rng=None):
+    """Up to `limit` solutions of the grid; `rng` shuffles the order digits are tried in."""
+    board = Board(cells)
+    solutions = []
+    if board.valid:
+        _search(board, limit, solutions, rng)
+    return solutions
+
+
+def count_solutions(cells, limit=2):
+    """Number of solutions, counted no higher than `limit`."""
+    return len(solve(cells, limit))
+
+
+def solved_grid(rng=random):
+    return solve([0] * CELLS, 1, rng)[0]
+
+
+def generate(rng=random, holes=45):
+    """(puzzle, solution) with a unique solution and up to `holes` empty cells.
+
+    holes=None empties every cell it can, leaving a minimal puzzle.
+    """
+    solution = solved_grid(rng)
+    puzzle = solution[:]
+    order = list(range(CELLS))
+    rng.shuffle(order)
+    removed = 0
+    for i in order:
+        if removed == holes:
+            break
+        puzzle[i] = 0
+        if count_solutions(puzzle) == 1:
+            removed += 1
+        else:
+            puzzle[i] = solution[i]
+    return puzzle, solution
+
+
+def rate(cells):
+    """The hardest technique a unique puzzle needs: NAKED_SINGLES, HIDDEN_SINGLES or GUESSING.
+
+    Hidden singles are only looked for when no naked single is left.
+    """
+    board = Board(cells)
+    rating = NAKED_SINGLES
+    while True:
+        if board.naked_singles() > 0:
+            continue
+        if board.hidden_singles() > 0:
+            rating = HIDDEN_SINGLES
+            continue
+        break
+    return rating if 0 not in board.cells else GUESSING
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Sudoku solving and generation speed.")
+    parser.add_argument("--puzzles", type=int, default=100, help="puzzles to generate and then solve")
+    parser.add_argument("--holes", type=int, default=None, help="empty cells per puzzle (default: as many as stay unique)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    puzzles = [generate(rng, args.holes) for _ in range(args.puzzles)]
+    generated = time.perf_counter() - start
+    clues = sum(CELLS - puzzle.count(0) for puzzle, _ in puzzles) / len(puzzles)
+    print(f"Generated {len(puzzles)} unique puzzles in {generated:.2f}s "
+          f"({len(puzzles) / generated:.1f} puzzles/s), {clues:.1f} clues on average")
+
+    start = time.perf_counter()
+    for puzzle, solution in puzzles:
+        solutions = solve(puzzle, limit=2)
+        assert solutions == [solution]
+    solved = time.perf_counter() - start
+    print(f"Solved them with a uniqueness check in {solved:.2f}s "
+          f"({len(puzzles) / solved:.0f} puzzles/s, {solved / len(puzzles) * 1000:.2f} ms each)")
+
+
+if __name__ == "__main__":
+    main()
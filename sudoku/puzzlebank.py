@@ -0,0 +1,155 @@
+"""
+🏦 Sudoku puzzle bank
+
+Unique puzzles generated offline, rated by the hardest technique they need
+(see candidates.rate) and stored by rating, so a game picks a puzzle of the
+wanted difficulty with one random index instead of generating one.
+
+File layout (little-endian): header, one record per rating, then the
+puzzles as fixed-width 81-byte records of ASCII digits ('0' for an empty
+cell), grouped by rating:
+    b"SDKB", version, rating count
+    byte offset, puzzle count          (per rating)
+
+    python sudoku/puzzlebank.py --per-level 500     # writes sudoku/puzzles.bank
+"""
+
+import os
+import time
+import struct
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from candidates import CELLS, NAKED_SINGLES, HIDDEN_SINGLES, GUESSING, generate, rate
+
+try:
+    import mmap
+except ImportError:                     # not every Python build has it
+    mmap = None
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzles.bank")
+MAGIC = b"SDKB"
+VERSION = 1
+HEADER = struct.Struct("<4sBB")
+LEVEL = struct.Struct("<II")
+LEVELS = (NAKED_SINGLES, HIDDEN_SINGLES, GUESSING)
+LEVEL_NAMES = {NAKED_SINGLES: "naked singles", HIDDEN_SINGLES: "hidden singles", GUESSING: "guessing"}
+# Emptier grids need harder techniques; cycling through these gives every rating a share
+HOLES = (45, 54, None)
+BATCH = 40
+
+
+class PuzzleBank:
+    def __init__(self, path=BANK_PATH):
+        """Map a bank file; an absent file gives an empty bank."""
+        self.levels = {}
+        self.data = b""
+        self.file = None
+        try:
+            self.file = open(path, "rb")
+        except OSError:
+            return
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            self.data = self.file.read()
+        magic, version, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            return
+        for level in range(count):
+            self.levels[level] = LEVEL.unpack_from(self.data, HEADER.size + level * LEVEL.size)
+
+    def count(self, level):
+        return self.levels.get(level, (0, 0))[1]
+
+    def puzzle(self, level, index):
+        offset = self.levels[level][0] + index * CELLS
+        return [digit - 48 for digit in self.data[offset:offset + CELLS]]
+
+    def pick(self, level, rng=random):
+        """A random puzzle of the given rating, or None if the bank has none."""
+        count = self.count(level)
+        if not count:
+            return None
+        return self.puzzle(level, rng.randrange(count))
+
+
+_bank = None
+
+
+def puzzle_bank():
+    """The shipped puzzle bank, mapped once."""
+    global _bank
+    if _bank is None:
+        _bank = PuzzleBank()
+    return _bank
+
+
+def generate_batch(seed):
+    """BATCH rated puzzles as (rating, 81-byte record)."""
+    rng = random.Random(seed)
+    batch = []
+    for i in range(BATCH):
+        puzzle, _ = generate(rng, HOLES[i % len(HOLES)])
+        batch.append((rate(puzzle), bytes(48 + digit for digit in puzzle)))
+    return batch
+
+
+def write(records, path):
+    offset = HEADER.size + LEVEL.size * len(LEVELS)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(LEVELS)))
+        for level in LEVELS:
+            f.write(LEVEL.pack(offset, len(records[level])))
+            offset += CELLS * len(records[level])
+        for level in LEVELS:
+            f.write(b"".join(records[level]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Sudoku puzzle bank.")
+    parser.add_argument("--per-level", type=int, default=500, help="puzzles of each rating")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first batch")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("-o", "--output", default=BANK_PATH, help="bank file")
+    args = parser.parse_args()
+
+    print(f"Generating {args.per_level} puzzles of each rating with {args.jobs} workers")
+    records = {level: [] for level in LEVELS}
+    seen = set()
+    seed = args.seed
+    generated = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        while any(len(records[level]) < args.per_level for level in LEVELS):
+            seeds = range(seed, seed + args.jobs)
+            seed += args.jobs
+            for batch in pool.map(generate_batch, seeds):
+                for level, record in batch:
+                    generated += 1
+                    if record not in seen and len(records[level]) < args.per_level:
+                        seen.add(record)
+                        records[level].append(record)
+    elapsed = time.perf_counter() - start
+    write(records, args.output)
+    print(f"Generated and rated {generated} puzzles in {elapsed:.1f}s ({generated / elapsed:.1f} puzzles/s), "
+          f"wrote {os.path.getsize(args.output)} bytes to {args.output}")
+
+    bank = PuzzleBank(args.output)
+    for level in LEVELS:
+        clues = sum(CELLS - bank.puzzle(level, i).count(0) for i in range(bank.count(level)))
+        print(f"{LEVEL_NAMES[level]:>15}: {bank.count(level)} puzzles, "
+              f"{clues / max(bank.count(level), 1):.1f} clues on average")
+
+    rng = random.Random(0)
+    picks = 100000
+    start = time.perf_counter()
+    for i in range(picks):
+        bank.pick(LEVELS[i % len(LEVELS)], rng)
+    elapsed = time.perf_counter() - start
+    print(f"Pick latency {elapsed / picks * 1e6:.2f} us ({picks} picks)")
+
+
+if __name__ == "__main__":
+    main()
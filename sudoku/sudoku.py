@@ -1,4 +1,3 @@
-import asyncio
 """
 📊 Sudoku
 Fill the grid with numbers 1-9!
@@ -8,126 +7,265 @@ Controls:
 - 1-9 to enter number
 - Delete/Backspace to clear
 - R to new puzzle
+- D to change difficulty
+- ESC to quit
 """
 
-import tkinter as tk
+import pygame
 import random
+import sys
+import os
+import asyncio
+from collections import deque
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.dirty import DirtyRects
+from gamekit.text import render_text
+from gamekit.worker import run_in_background
+from candidates import CELLS, ROW, COL, BOX, UNITS, NAKED_SINGLES, HIDDEN_SINGLES, GUESSING, generate, solve
+from puzzlebank import puzzle_bank
+
+pygame.init()
+
+CELL = 56
+MARGIN = 20
+BOARD_TOP = 60
+BOARD = 9 * CELL
+WIDTH = BOARD + 2 * MARGIN
+HEIGHT = BOARD_TOP + BOARD + 80
+
+BG = (44, 62, 80)
+LIGHT = (236, 240, 241)
+SHADE = (189, 195, 199)
+SELECTED = (243, 156, 18)
+CONFLICT = (245, 183, 177)
+LINE = (44, 62, 80)
+GIVEN = (44, 62, 80)
+RIGHT = (39, 174, 96)
+WRONG = (231, 76, 60)
+BUTTON = (52, 152, 219)
+WHITE = (255, 255, 255)
+
+TITLE_RECT = pygame.Rect(0, 0, WIDTH, BOARD_TOP)
+BUTTON_RECT = pygame.Rect(WIDTH // 2 - 80, BOARD_TOP + BOARD + 20, 160, 40)
+
+# Puzzle bank rating of each difficulty, and the empty cells to generate with
+# if the bank has none (fewer if removing more would allow a second solution)
+DIFFICULTIES = {"Easy": (NAKED_SINGLES, 45), "Medium": (HIDDEN_SINGLES, 54), "Hard": (GUESSING, None)}
+# Fallback for a difficulty the bank has no puzzles of: this many are generated
+# ahead of time on worker threads, so a new game starts at once
+PREFETCH = 2
+
+# The row, column and box (numbered 0-8, 9-17, 18-26 as in UNITS) of each cell, and the cells sharing one
+CELL_UNITS = [(ROW[i], 9 + COL[i], 18 + BOX[i]) for i in range(CELLS)]
+PEERS = [sorted({j for u in CELL_UNITS[i] for j in UNITS[u]} - {i}) for i in range(CELLS)]
 
-class Sudoku:
+class Game:
     def __init__(self):
-        self.window = tk.Tk()
-        self.window.title("📊 Sudoku")
-        self.window.configure(bg='#2c3e50')
-        self.cells = {}
-        self.selected = None
-        self.create_ui()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("📊 Sudoku")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 44)
+        self.title_font = pygame.font.Font(None, 40)
+        self.small_font = pygame.font.Font(None, 28)
+        self.dirty = DirtyRects()
+        self.difficulty = "Medium"
+        self.bank = puzzle_bank()
+        # Futures of puzzles being generated, oldest first, for difficulties the bank lacks
+        self.pending = {name: deque() for name in DIFFICULTIES}
+        self.new_puzzle()
+
+    def prefetch(self):
+        """Keep PREFETCH puzzles on the way for every difficulty the bank has none of.
+
+        Each job gets its own generator seeded from the main thread, so the
+        threads never touch the global random module and a replay deals the
+        same puzzles in the same order.
+        """
+        for name, (level, holes) in DIFFICULTIES.items():
+            if self.bank.count(level):
+                continue
+            pending = self.pending[name]
+            while len(pending) < PREFETCH:
+                pending.append(run_in_background(generate, random.Random(random.getrandbits(64)), holes))
+
+    def next_difficulty(self):
+        names = list(DIFFICULTIES)
+        self.difficulty = names[(names.index(self.difficulty) + 1) % len(names)]
         self.new_puzzle()
-        self.window.bind('r', lambda e: self.new_puzzle())
-    
-    def create_ui(self):
-        title = tk.Label(self.window, text="Sudoku", font=('Arial', 20, 'bold'), 
-                        bg='#2c3e50', fg='white')
-        title.grid(row=0, column=0, columnspan=9, pady=10)
-        
-        for r in range(9):
-            for c in range(9):
-                bg = '#ecf0f1' if ((r // 3) + (c // 3)) % 2 == 0 else '#bdc3c7'
-                cell = tk.Label(self.window, text='', font=('Arial', 18), width=3, height=1,
-                               bg=bg, relief='raised', borderwidth=1)
-                cell.grid(row=r + 1, column=c, padx=1, pady=1)
-                cell.bind('<Button-1>', lambda e, r=r, c=c: self.select(r, c))
-                self.cells[(r, c)] = cell
-        
-        self.window.bind('<Key>', self.key_press)
-        
-        btn = tk.Button(self.window, text="New Game", font=('Arial', 12),
-                       bg='#3498db', fg='white', command=self.new_puzzle)
-        btn.grid(row=10, column=0, columnspan=9, pady=10)
-    
-    def generate_solved(self):
-        base = list(range(1, 10))
-        random.shuffle(base)
-        grid = [[0] * 9 for _ in range(9)]
-        
-        def fill(grid):
-            for r in range(9):
-                for c in range(9):
-                    if grid[r][c] == 0:
-                        nums = list(range(1, 10))
-                        random.shuffle(nums)
-                        for n in nums:
-                            if self.is_valid(grid, r, c, n):
-                                grid[r][c] = n
-                                if fill(grid):
-                                    return True
-                                grid[r][c] = 0
-                        return False
-            return True
-        
-        fill(grid)
-        return grid
-    
-    def is_valid(self, grid, row, col, num):
-        if num in grid[row]: return False
-        if num in [grid[r][col] for r in range(9)]: return False
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for r in range(br, br + 3):
-            for c in range(bc, bc + 3):
-                if grid[r][c] == num: return False
-        return True
-    
+
     def new_puzzle(self):
-        self.solution = self.generate_solved()
-        self.puzzle = [row[:] for row in self.solution]
-        self.fixed = [[False] * 9 for _ in range(9)]
-        
-        # Remove numbers
-        for _ in range(45):
-            r, c = random.randint(0, 8), random.randint(0, 8)
-            while self.puzzle[r][c] == 0:
-                r, c = random.randint(0, 8), random.randint(0, 8)
-            self.puzzle[r][c] = 0
-        
-        for r in range(9):
-            for c in range(9):
-                val = self.puzzle[r][c]
-                if val:
-                    self.fixed[r][c] = True
-                    self.cells[(r, c)].config(text=str(val), fg='#2c3e50')
-                else:
-                    self.cells[(r, c)].config(text='', fg='#3498db')
+        level, holes = DIFFICULTIES[self.difficulty]
+        puzzle = self.bank.pick(level, random)
+        if puzzle is not None:
+            solution = solve(puzzle)[0]
+        else:
+            # Only without a bank entry for this rating: take the oldest prefetched
+            # puzzle, waiting for it if new games are asked for faster than they generate
+            self.prefetch()
+            puzzle, solution = self.pending[self.difficulty].popleft().result()
+            self.prefetch()
+        self.solution = solution
+        self.cells = puzzle[:]
+        self.fixed = [digit != 0 for digit in puzzle]
+        # counts[unit][digit]: how often each digit appears in each row, column and box;
+        # clashes[unit] has a bit set for every digit that appears there more than once
+        self.counts = [[0] * 10 for _ in range(27)]
+        self.clashes = [0] * 27
+        self.conflicts = 0
+        self.filled = 0
+        for i, digit in enumerate(puzzle):
+            if digit:
+                self.add(i, digit)
         self.selected = None
-    
+        self.won = False
+        self.dirty.mark_all()
+
+    def add(self, i, digit):
+        bit = 1 << (digit - 1)
+        for unit in CELL_UNITS[i]:
+            count = self.counts[unit][digit] + 1
+            self.counts[unit][digit] = count
+            if count == 2:
+                self.clashes[unit] |= bit
+                self.conflicts += 1
+        self.filled += 1
+
+    def remove(self, i, digit):
+        bit = 1 << (digit - 1)
+        for unit in CELL_UNITS[i]:
+            count = self.counts[unit][digit] - 1
+            self.counts[unit][digit] = count
+            if count == 1:
+                self.clashes[unit] &= ~bit
+                self.conflicts -= 1
+        self.filled -= 1
+
+    def conflicted(self, i):
+        digit = self.cells[i]
+        if not digit:
+            return False
+        row, col, box = CELL_UNITS[i]
+        return bool((self.clashes[row] | self.clashes[col] | self.clashes[box]) >> (digit - 1) & 1)
+
+    def cell_rect(self, i):
+        return pygame.Rect(MARGIN + COL[i] * CELL, BOARD_TOP + ROW[i] * CELL, CELL, CELL)
+
     def select(self, r, c):
-        if self.selected:
-            pr, pc = self.selected
-            bg = '#ecf0f1' if ((pr // 3) + (pc // 3)) % 2 == 0 else '#bdc3c7'
-            self.cells[(pr, pc)].config(bg=bg)
-        
-        if not self.fixed[r][c]:
-            self.selected = (r, c)
-            self.cells[(r, c)].config(bg='#f39c12')
-    
+        i = r * 9 + c
+        if self.selected is not None:
+            self.dirty.mark(self.cell_rect(self.selected))
+        if not self.fixed[i]:
+            self.selected = i
+            self.dirty.mark(self.cell_rect(i))
+
+    def enter(self, digit):
+        """Put `digit` (0 to clear) in the selected cell and repaint the cells whose conflicts changed."""
+        i = self.selected
+        old = self.cells[i]
+        if digit == old:
+            return
+        affected = [j for j in PEERS[i] if self.cells[j] and self.cells[j] in (old, digit)]
+        before = [self.conflicted(j) for j in affected]
+        if old:
+            self.remove(i, old)
+        self.cells[i] = digit
+        if digit:
+            self.add(i, digit)
+        self.dirty.mark(self.cell_rect(i))
+        for j, was in zip(affected, before):
+            if self.conflicted(j) != was:
+                self.dirty.mark(self.cell_rect(j))
+        self.check_win()
+
     def key_press(self, event):
-        if not self.selected: return
-        r, c = self.selected
-        
-        if event.char in '123456789':
-            num = int(event.char)
-            self.puzzle[r][c] = num
-            color = '#27ae60' if num == self.solution[r][c] else '#e74c3c'
-            self.cells[(r, c)].config(text=str(num), fg=color)
-            self.check_win()
-        elif event.keysym in ('Delete', 'BackSpace'):
-            self.puzzle[r][c] = 0
-            self.cells[(r, c)].config(text='')
-    
+        if self.selected is None or self.won: return
+
+        if event.unicode and event.unicode in '123456789':
+            self.enter(int(event.unicode))
+        elif event.key in (pygame.K_DELETE, pygame.K_BACKSPACE, pygame.K_0, pygame.K_KP0):
+            self.enter(0)
+
     def check_win(self):
-        if self.puzzle == self.solution:
-            tk.messagebox.showinfo("Congratulations!", "You solved the puzzle! 🎉")
-    
+        # Every cell filled with no digit repeated in a row, column or box
+        if self.filled == CELLS and not self.conflicts:
+            self.won = True
+            self.dirty.mark_all()
+
+    def draw_cell(self, i):
+        rect = self.cell_rect(i)
+        if i == self.selected:
+            color = SELECTED
+        elif self.conflicted(i):
+            color = CONFLICT
+        else:
+            color = LIGHT if (ROW[i] // 3 + COL[i] // 3) % 2 == 0 else SHADE
+        pygame.draw.rect(self.screen, color, rect)
+        digit = self.cells[i]
+        if digit:
+            if self.fixed[i]:
+                fg = GIVEN
+            else:
+                fg = RIGHT if digit == self.solution[i] else WRONG
+            text = render_text(self.font, str(digit), True, fg)
+            self.screen.blit(text, text.get_rect(center=rect.center))
+
+    def draw_grid(self):
+        for k in range(10):
+            width = 3 if k % 3 == 0 else 1
+            x, y = MARGIN + k * CELL, BOARD_TOP + k * CELL
+            pygame.draw.line(self.screen, LINE, (x, BOARD_TOP), (x, BOARD_TOP + BOARD), width)
+            pygame.draw.line(self.screen, LINE, (MARGIN, y), (MARGIN + BOARD, y), width)
+
+    def paint(self):
+        # Repaints everything inside the current clip rect (see DirtyRects)
+        clip = self.screen.get_clip()
+        if not pygame.Rect(MARGIN, BOARD_TOP, BOARD, BOARD).contains(clip):
+            self.screen.fill(BG)
+            title = render_text(self.title_font, f"Sudoku - {self.difficulty}", True, WHITE)
+            self.screen.blit(title, title.get_rect(center=TITLE_RECT.center))
+            pygame.draw.rect(self.screen, BUTTON, BUTTON_RECT, border_radius=6)
+            label = render_text(self.small_font, "New Game", True, WHITE)
+            self.screen.blit(label, label.get_rect(center=BUTTON_RECT.center))
+
+        for i in range(CELLS):
+            if clip.colliderect(self.cell_rect(i)):
+                self.draw_cell(i)
+        self.draw_grid()
+
+        if self.won:
+            text = render_text(self.title_font, "Solved! Press R for a new puzzle", True, WHITE)
+            box = text.get_rect(center=(WIDTH // 2, BOARD_TOP + BOARD // 2)).inflate(30, 20)
+            pygame.draw.rect(self.screen, BG, box, border_radius=8)
+            self.screen.blit(text, text.get_rect(center=box.center))
+
+    def draw(self):
+        self.dirty.render(self.screen, self.paint)
+
     async def run(self):
-        self.window.mainloop()
+        while True:
+            await asyncio.sleep(0)
+            for event in pygame.event.get():
+                self.dirty.handle_event(event)
+                if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
+                    if event.key == pygame.K_r: self.new_puzzle()
+                    elif event.key == pygame.K_d: self.next_difficulty()
+                    else: self.key_press(event)
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    x, y = event.pos
+                    if BUTTON_RECT.collidepoint(x, y):
+                        self.new_puzzle()
+                    elif not self.won and MARGIN <= x < MARGIN + BOARD and BOARD_TOP <= y < BOARD_TOP + BOARD:
+                        self.select((y - BOARD_TOP) // CELL, (x - MARGIN) // CELL)
+
+            self.draw()
+            self.clock.tick(60)
+
+async def main():
+    game = Game()
+    await game.run()
 
 if __name__ == "__main__":
-    Sudoku().run()
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+"""
+🤖 Placement-search player for Tetris
+
+For every rotation and column the piece is dropped straight down on the
+bitmask well, and the resulting stack is scored on four features: aggregate
+column height, lines cleared, holes and bumpiness (the weights are Yiyuan
+Lee's well-known genetic-algorithm tuned set). With lookahead, every
+placement of the current piece is also followed by every placement of the
+next piece and the better pair wins.
+
+Headless soak test, games spread over a process pool:
+    python tetris/placement.py --games 16 --lookahead
+"""
+
+import os
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from playfield import (ROTATIONS, COLS, ROWS, FULL_ROW, fits, spawn_position, gravity_frames,
+                       column_heights, landing_row)
+
+HEIGHT_WEIGHT = -0.510066
+LINES_WEIGHT = 0.760666
+HOLES_WEIGHT = -0.35663
+BUMPINESS_WEIGHT = -0.184483
+
+
+def _distinct_rotations(kind):
+    seen = set()
+    distinct = []
+    for rotation, shape in enumerate(ROTATIONS[kind]):
+        key = frozenset((r - shape.top, c - shape.left) for r, c in shape.cells)
+        if key not in seen:
+            seen.add(key)
+            distinct.append(rotation)
+    return distinct
+
+
+# O has one distinct orientation, I, S and Z two, the rest four
+DISTINCT_ROTATIONS = [_distinct_rotations(kind) for kind in range(7)]
+
+
+def drop_row(rows, heights, kind, rotation, x):
+    """Row where the piece lands when dropped from the top in column x, or None if it can't enter."""
+    if not fits(rows, kind, rotation, x, -ROTATIONS[kind][rotation].top):
+        return None
+    return landing_row(heights, kind, rotation, x)
+
+
+def place(rows, kind, rotation, x, y):
+    """Return (new rows, lines cleared) after locking the piece, or None if it sticks out of the top."""
+    shape = ROTATIONS[kind][rotation]
+    if y + shape.top < 0:
+        return None
+    rows = rows[:]
+    for dr, mask in shape.masks[x - shape.min_x]:
+        rows[y + dr] |= mask
+    kept = [row for row in rows if row != FULL_ROW]
+    cleared = ROWS - len(kept)
+    if cleared:
+        rows = [0] * cleared + kept
+    return rows, cleared
+
+
+def evaluate(rows, cleared):
+    """Weighted sum of aggregate height, lines cleared, holes and bumpiness."""
+    heights = [0] * COLS
+    holes = 0
+    covered = 0
+    for r, row in enumerate(rows):
+        new = row & ~covered
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = ROWS - r
+            new ^= low
+        holes += (covered & ~row).bit_count()
+        covered |= row
+    bumpiness = sum(abs(heights[c] - heights[c + 1]) for c in range(COLS - 1))
+    return (HEIGHT_WEIGHT * sum(heights) + LINES_WEIGHT * cleared
+            + HOLES_WEIGHT * holes + BUMPINESS_WEIGHT * bumpiness)
+
+
+def placements(rows, kind):
+    """Yield (rotation, x, y, new rows, lines cleared) for every final position of the piece."""
+    heights = column_heights(rows)
+    for rotation in DISTINCT_ROTATIONS[kind]:
+        shape = ROTATIONS[kind][rotation]
+        for x in range(shape.min_x, shape.max_x + 1):
+            y = drop_row(rows, heights, kind, rotation, x)
+            if y is None:
+                continue
+            result = place(rows, kind, rotation, x, y)
+            if result is not None:
+                yield (rotation, x, y) + result
+
+
+def best_placement(rows, kind, next_kind=None):
+    """Return the best (rotation, x, y) for the piece, or None if it can't be placed anywhere."""
+    best = None
+    best_score = None
+    for rotation, x, y, after, cleared in placements(rows, kind):
+        if next_kind is None:
+            score = evaluate(after, cleared)
+        else:
+            score = max((evaluate(final, cleared + more) for *_, final, more in placements(after, next_kind)),
+                        default=None)
+            if score is None:
+                continue
+        if best_score is None or score > best_score:
+            best, best_score = (rotation, x, y), score
+    return best
+
+
+def play_game(seed, lookahead=False, max_pieces=10000):
+    """Play one game headlessly with the same piece sequence rules as the game; returns its stats."""
+    rng = random.Random(seed)
+    rows = [0] * ROWS
+    kind, next_kind = rng.randint(0, 6), rng.randint(0, 6)
+    pieces = lines = 0
+    start = time.perf_counter()
+    while pieces < max_pieces:
+        spawn_x, spawn_y = spawn_position(kind)
+        if not fits(rows, kind, 0, spawn_x, spawn_y):
+            break
+        target = best_placement(rows, kind, next_kind if lookahead else None)
+        if target is None:
+            break
+        rows, cleared = place(rows, kind, *target)
+        lines += cleared
+        pieces += 1
+        kind, next_kind = next_kind, rng.randint(0, 6)
+    return {
+        "seed": seed,
+        "pieces": pieces,
+        "lines": lines,
+        "level": lines // 10 + 1,
+        "topped_out": pieces < max_pieces,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test Tetris with the placement-search player.")
+    parser.add_argument("--games", type=int, default=16, help="games to play")
+    parser.add_argument("--lookahead", action="store_true", help="also search the next piece")
+    parser.add_argument("--max-pieces", type=int, default=10000, help="stop a game after this many pieces")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args()
+
+    print(f"Playing {args.games} games{' with lookahead' if args.lookahead else ''}, "
+          f"up to {args.max_pieces} pieces each, {args.jobs} workers")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(play_game, range(args.seed, args.seed + args.games),
+                                [args.lookahead] * args.games, [args.max_pieces] * args.games))
+    wall = time.perf_counter() - start
+
+    pieces = sum(r["pieces"] for r in results)
+    cpu = sum(r["seconds"] for r in results)
+    print(f"\n{pieces} pieces in {wall:.1f}s wall ({pieces / wall:.0f} pieces/s over the pool, "
+          f"{pieces / cpu:.0f} pieces/s per worker)")
+    print(f"{sum(r['lines'] for r in results)} lines cleared, "
+          f"mean {sum(r['lines'] for r in results) / len(results):.0f} per game, "
+          f"{sum(r['topped_out'] for r in results)} of {len(results)} games topped out")
+
+    print(f"\n{'seed':>6}{'pieces':>9}{'lines':>8}{'level':>7}{'drop every':>12}")
+    for r in results:
+        print(f"{r['seed']:>6}{r['pieces']:>9}{r['lines']:>8}{r['level']:>7}"
+              f"{gravity_frames(r['level']):>9} fr")
+
+
+if __name__ == "__main__":
+    main()
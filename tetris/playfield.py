@@ -0,0 +1,205 @@
+"""
+🟦 Tetris playfield as row bitmasks
+
+Each row of the well is an int with bit c set when column c is filled, so a
+full row is simply FULL_ROW and a collision test is one AND per piece row.
+The height of every column's stack is kept up to date as well, so how far a
+piece falls comes from its bottom profile without probing row by row.
+
+Pieces use the SRS rotation system: every tetromino sits in a fixed 2x2,
+3x3 or 4x4 box and its four rotation states are that box turned clockwise.
+For every piece, rotation and column the per-row masks are precomputed, and
+rotations try the standard SRS wall kicks.
+
+    field = Playfield()
+    if field.fits(kind, rotation, x, y + 1): ...
+    rotation, x, y = field.rotate(kind, rotation, x, y, 1)    # with kicks
+"""
+
+COLS, ROWS = 10, 20
+FULL_ROW = (1 << COLS) - 1
+
+I, O, T, S, Z, J, L = range(7)
+# Spawn state of each piece inside its rotation box
+SPAWN_BOXES = [
+    [[0, 0, 0, 0], [1, 1, 1, 1], [0, 0, 0, 0], [0, 0, 0, 0]],   # I
+    [[1, 1], [1, 1]],                                           # O
+    [[0, 1, 0], [1, 1, 1], [0, 0, 0]],                          # T
+    [[0, 1, 1], [1, 1, 0], [0, 0, 0]],                          # S
+    [[1, 1, 0], [0, 1, 1], [0, 0, 0]],                          # Z
+    [[1, 0, 0], [1, 1, 1], [0, 0, 0]],                          # J
+    [[0, 0, 1], [1, 1, 1], [0, 0, 0]],                          # L
+]
+
+# SRS wall kicks as (dx, dy) with y pointing down, keyed by (from, to) rotation
+_JLSTZ_KICKS = {
+    (0, 1): [(0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)],
+    (1, 0): [(0, 0), (1, 0), (1, 1), (0, -2), (1, -2)],
+    (1, 2): [(0, 0), (1, 0), (1, 1), (0, -2), (1, -2)],
+    (2, 1): [(0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)],
+    (2, 3): [(0, 0), (1, 0), (1, -1), (0, 2), (1, 2)],
+    (3, 2): [(0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)],
+    (3, 0): [(0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)],
+    (0, 3): [(0, 0), (1, 0), (1, -1), (0, 2), (1, 2)],
+}
+_I_KICKS = {
+    (0, 1): [(0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)],
+    (1, 0): [(0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)],
+    (1, 2): [(0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)],
+    (2, 1): [(0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)],
+    (2, 3): [(0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)],
+    (3, 2): [(0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)],
+    (3, 0): [(0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)],
+    (0, 3): [(0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)],
+}
+_NO_KICKS = {key: [(0, 0)] for key in _JLSTZ_KICKS}
+KICKS = [_I_KICKS, _NO_KICKS] + [_JLSTZ_KICKS] * 5
+
+
+class Rotation:
+    """One rotation state of one piece, with its masks precomputed for every column."""
+
+    def __init__(self, box):
+        self.cells = [(r, c) for r, row in enumerate(box) for c, filled in enumerate(row) if filled]
+        self.top = min(r for r, _ in self.cells)
+        self.bottom = max(r for r, _ in self.cells)
+        self.left = min(c for _, c in self.cells)
+        self.right = max(c for _, c in self.cells)
+        self.min_x = -self.left
+        self.max_x = COLS - 1 - self.right
+        # (box column, lowest filled row in it) for each column the piece covers
+        self.profile = [(c, max(r for r, cc in self.cells if cc == c))
+                        for c in range(self.left, self.right + 1)]
+        # masks[x - min_x] = [(row offset, row mask at column x), ...]
+        self.masks = []
+        for x in range(self.min_x, self.max_x + 1):
+            rows = {}
+            for r, c in self.cells:
+                rows[r] = rows.get(r, 0) | 1 << (x + c)
+            self.masks.append(sorted(rows.items()))
+
+
+def _rotate_box(box):
+    return [list(row) for row in zip(*box[::-1])]
+
+
+def _build_rotations():
+    table = []
+    for box in SPAWN_BOXES:
+        states = []
+        for _ in range(4):
+            states.append(Rotation(box))
+            box = _rotate_box(box)
+        table.append(states)
+    return table
+
+
+ROTATIONS = _build_rotations()
+
+
+def spawn_position(kind):
+    """Column and row of a new piece's box: centred, with its top cells in row 0."""
+    box = len(SPAWN_BOXES[kind])
+    return (COLS - box) // 2, -ROTATIONS[kind][0].top
+
+
+def gravity_frames(level):
+    """Frames between automatic drops at a level (60 frames per second)."""
+    return max(3, 25 - level * 2)
+
+
+def fits(rows, kind, rotation, x, y):
+    """True if the piece fits in `rows` with its box at column x, row y."""
+    shape = ROTATIONS[kind][rotation]
+    if x < shape.min_x or x > shape.max_x or y + shape.bottom >= ROWS:
+        return False
+    for dr, mask in shape.masks[x - shape.min_x]:
+        row = y + dr
+        if row >= 0 and rows[row] & mask:
+            return False
+    return True
+
+
+def column_heights(rows):
+    """Height of the stack in every column, counted from the floor."""
+    heights = [0] * COLS
+    covered = 0
+    for r, row in enumerate(rows):
+        new = row & ~covered
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = ROWS - r
+            new ^= low
+        covered |= row
+        if covered == FULL_ROW:
+            break
+    return heights
+
+
+def landing_row(heights, kind, rotation, x):
+    """Row the piece comes to rest on when it falls from above the stack in column x."""
+    return min(ROWS - heights[x + c] - 1 - bottom for c, bottom in ROTATIONS[kind][rotation].profile)
+
+
+class Playfield:
+    def __init__(self):
+        self.rows = [0] * ROWS
+        self.colors = [[None] * COLS for _ in range(ROWS)]
+        self.heights = [0] * COLS
+
+    def fits(self, kind, rotation, x, y):
+        return fits(self.rows, kind, rotation, x, y)
+
+    def rotate(self, kind, rotation, x, y, turn=1):
+        """Rotate by `turn` quarter turns (1 = clockwise) with SRS kicks.
+
+        Returns the new (rotation, x, y), or None if every kick collides.
+        """
+        target = (rotation + turn) % 4
+        for dx, dy in KICKS[kind][(rotation, target)]:
+            if self.fits(kind, target, x + dx, y + dy):
+                return target, x + dx, y + dy
+        return None
+
+    def drop_distance(self, kind, rotation, x, y):
+        """How many rows the piece can fall from (x, y) before it lands."""
+        heights = self.heights
+        distance = ROWS
+        for c, bottom in ROTATIONS[kind][rotation].profile:
+            gap = ROWS - heights[x + c] - 1 - (y + bottom)
+            if gap < 0:
+                # Tucked under an overhang, where the surface says nothing about what is below
+                distance = 0
+                while self.fits(kind, rotation, x, y + distance + 1):
+                    distance += 1
+                return distance
+            if gap < distance:
+                distance = gap
+        return distance
+
+    def place(self, kind, rotation, x, y, color):
+        """Write a piece into the well. Returns False if any of it is above the top."""
+        inside = True
+        for r, c in ROTATIONS[kind][rotation].cells:
+            row = y + r
+            if row < 0:
+                inside = False
+                continue
+            self.rows[row] |= 1 << (x + c)
+            self.colors[row][x + c] = color
+            if ROWS - row > self.heights[x + c]:
+                self.heights[x + c] = ROWS - row
+        return inside
+
+    def clear_lines(self):
+        """Remove full rows, shift the rest down and return how many were cleared."""
+        keep = [i for i, row in enumerate(self.rows) if row != FULL_ROW]
+        cleared = ROWS - len(keep)
+        if cleared:
+            self.rows = [0] * cleared + [self.rows[i] for i in keep]
+            self.colors = [[None] * COLS for _ in range(cleared)] + [self.colors[i] for i in keep]
+            self.heights = column_heights(self.rows)
+        return cleared
+
+    def block_count(self):
+        return sum(bin(row).count("1") for row in self.rows)
@@ -4,23 +4,37 @@ Classic block stacking puzzle game!
 
 Controls:
 - Left/Right arrows to move
-- Up arrow to rotate
+- Up arrow to rotate, Z to rotate back
 - Down arrow to soft drop
 - SPACE to hard drop
+- A to let the AI play
 - R to restart, ESC to quit
 """
 
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit import background
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+from gamekit.perf import PerfMonitor
+from playfield import Playfield, ROTATIONS, COLS, ROWS, spawn_position, gravity_frames
+from placement import best_placement
+
 pygame.init()
 
 CELL = 30
-COLS, ROWS = 10, 20
 WIDTH = COLS * CELL + 180
 HEIGHT = ROWS * CELL
+SIDEBAR_X = COLS * CELL + 15
+NEXT_RECT = pygame.Rect(SIDEBAR_X, 10, 150, 100)
+STATS_RECT = pygame.Rect(SIDEBAR_X, 130, 150, 180)
+# Frames between AI moves, so auto-play can be followed by eye
+AI_STEP_FRAMES = 4
 
 # Beautiful color palette
 BG_TOP = (15, 20, 40)
@@ -42,77 +56,66 @@ COLORS = [
     ((220, 140, 0), (180, 110, 0)),     # L - Orange
 ]
 
-SHAPES = [
-    [[1,1,1,1]],
-    [[1,1],[1,1]],
-    [[0,1,0],[1,1,1]],
-    [[0,1,1],[1,1,0]],
-    [[1,1,0],[0,1,1]],
-    [[1,0,0],[1,1,1]],
-    [[0,0,1],[1,1,1]],
-]
-
 class Piece:
     def __init__(self):
-        idx = random.randint(0, 6)
-        self.shape = [row[:] for row in SHAPES[idx]]
-        self.color = COLORS[idx]
-        self.x = COLS // 2 - len(self.shape[0]) // 2
-        self.y = 0
+        self.kind = random.randint(0, 6)
+        self.rotation = 0
+        self.color = COLORS[self.kind]
+        self.x, self.y = spawn_position(self.kind)
     
-    def rotate(self):
-        self.shape = [list(row) for row in zip(*self.shape[::-1])]
+    @property
+    def cells(self):
+        return ROTATIONS[self.kind][self.rotation].cells
 
 class Game:
     def __init__(self):
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("🟦 Tetris")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
+        self.perf = PerfMonitor(entities=lambda: {"blocks": self.board.block_count()})
         self.font = pygame.font.Font(None, 28)
         self.title_font = pygame.font.Font(None, 32)
+        self.autoplay = False
+        self.sprites = {}
+        self.panels = {}
+        self.overlay = pygame.Surface((COLS * CELL, HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((20, 25, 45, 220))
         self.reset()
     
-    def draw_gradient(self):
-        for y in range(HEIGHT):
-            ratio = y / HEIGHT
-            r = int(BG_TOP[0] + (BG_BOTTOM[0] - BG_TOP[0]) * ratio)
-            g = int(BG_TOP[1] + (BG_BOTTOM[1] - BG_TOP[1]) * ratio)
-            b = int(BG_TOP[2] + (BG_BOTTOM[2] - BG_TOP[2]) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
-    
     def reset(self):
-        self.board = [[None] * COLS for _ in range(ROWS)]
+        self.board = Playfield()
+        self.stack = None
         self.piece = Piece()
         self.next_piece = Piece()
         self.score = 0
         self.lines = 0
         self.level = 1
         self.drop_time = 0
+        self.ai_time = 0
+        self.target = None
         self.game_over = False
         self.high_score = getattr(self, 'high_score', 0)
     
     def valid(self, piece, dx=0, dy=0):
-        for r, row in enumerate(piece.shape):
-            for c, cell in enumerate(row):
-                if cell:
-                    nx, ny = piece.x + c + dx, piece.y + r + dy
-                    if nx < 0 or nx >= COLS or ny >= ROWS:
-                        return False
-                    if ny >= 0 and self.board[ny][nx]:
-                        return False
-        return True
+        return self.board.fits(piece.kind, piece.rotation, piece.x + dx, piece.y + dy)
+    
+    def rotate(self, turn=1):
+        piece = self.piece
+        kicked = self.board.rotate(piece.kind, piece.rotation, piece.x, piece.y, turn)
+        if kicked:
+            piece.rotation, piece.x, piece.y = kicked
     
     def lock(self):
-        for r, row in enumerate(self.piece.shape):
-            for c, cell in enumerate(row):
-                if cell:
-                    y = self.piece.y + r
-                    if y < 0:
-                        self.game_over = True
-                        self.high_score = max(self.high_score, self.score)
-                        return
-                    self.board[y][self.piece.x + c] = self.piece.color
+        piece = self.piece
+        # place() writes the cells inside the well even when the piece tops out
+        self.stack = None
+        if not self.board.place(piece.kind, piece.rotation, piece.x, piece.y, piece.color):
+            self.game_over = True
+            self.high_score = max(self.high_score, self.score)
+            return
         self.clear_lines()
+        self.target = None
         self.piece = self.next_piece
         self.next_piece = Piece()
         if not self.valid(self.piece):
@@ -120,12 +123,9 @@ class Game:
             self.high_score = max(self.high_score, self.score)
     
     def clear_lines(self):
-        lines = 0
-        for r in range(ROWS - 1, -1, -1):
-            if all(self.board[r]):
-                del self.board[r]
-                self.board.insert(0, [None] * COLS)
-                lines += 1
+        lines = self.board.clear_lines()
+        if lines:
+            self.stack = None
         points = [0, 100, 300, 500, 800]
         self.score += points[lines] * self.level
         self.lines += lines
@@ -138,82 +138,110 @@ class Game:
             self.lock()
     
     def hard_drop(self):
-        while self.valid(self.piece, dy=1):
-            self.piece.y += 1
-            self.score += 2
+        distance = self.board.drop_distance(self.piece.kind, self.piece.rotation, self.piece.x, self.piece.y)
+        self.piece.y += distance
+        self.score += 2 * distance
         self.lock()
     
-    def draw_block(self, x, y, color, ghost=False):
-        if ghost:
-            pygame.draw.rect(self.screen, (*color[0], 50), (x, y, CELL - 2, CELL - 2), border_radius=4, width=2)
-        else:
-            # Shadow
-            pygame.draw.rect(self.screen, SHADOW, (x + 3, y + 3, CELL - 2, CELL - 2), border_radius=4)
-            # Main block
-            pygame.draw.rect(self.screen, color[0], (x, y, CELL - 2, CELL - 2), border_radius=4)
-            # Highlight
-            pygame.draw.rect(self.screen, color[1], (x, y, CELL - 2, 6), border_radius=4)
+    def block_sprite(self, color, ghost=False):
+        """Return the pre-rendered block (or ghost outline) for a piece color."""
+        sprite = self.sprites.get((color, ghost))
+        if sprite is None:
+            sprite = pygame.Surface((CELL + 1, CELL + 1), pygame.SRCALPHA)
+            if ghost:
+                pygame.draw.rect(sprite, color[0], (0, 0, CELL - 2, CELL - 2), border_radius=4, width=2)
+            else:
+                # Shadow
+                pygame.draw.rect(sprite, SHADOW, (3, 3, CELL - 2, CELL - 2), border_radius=4)
+                # Main block
+                pygame.draw.rect(sprite, color[0], (0, 0, CELL - 2, CELL - 2), border_radius=4)
+                # Highlight
+                pygame.draw.rect(sprite, color[1], (0, 0, CELL - 2, 6), border_radius=4)
+            sprite = sprite.convert_alpha()
+            self.sprites[(color, ghost)] = sprite
+        return sprite
+    
+    def draw_block(self, x, y, color, ghost=False, surface=None):
+        (surface or self.screen).blit(self.block_sprite(color, ghost), (x, y))
+    
+    def ai_step(self):
+        """Rotate or shift the piece one step towards the AI's placement, then drop it."""
+        piece = self.piece
+        if self.target is None:
+            self.target = best_placement(self.board.rows, piece.kind, self.next_piece.kind)
+            if self.target is None:
+                self.hard_drop()
+                return
+        rotation, x, _ = self.target
+        before = (piece.rotation, piece.x)
+        if piece.rotation != rotation:
+            self.rotate(-1 if (rotation - piece.rotation) % 4 == 3 else 1)
+        elif piece.x < x and self.valid(piece, dx=1):
+            piece.x += 1
+        elif piece.x > x and self.valid(piece, dx=-1):
+            piece.x -= 1
+        if (piece.rotation, piece.x) == before:
+            self.hard_drop()
     
     def update(self):
         if self.game_over:
             return
+        if self.autoplay:
+            self.ai_time += 1
+            if self.ai_time >= AI_STEP_FRAMES:
+                self.ai_time = 0
+                self.ai_step()
+                if self.game_over:
+                    return
         self.drop_time += 1
-        speed = max(3, 25 - self.level * 2)
-        if self.drop_time >= speed:
+        if self.drop_time >= gravity_frames(self.level):
             self.drop()
             self.drop_time = 0
     
-    def draw(self):
-        self.draw_gradient()
+    def paint_background(self, surface):
+        surface.blit(background.gradient(surface.get_size(), BG_TOP, BG_BOTTOM), (0, 0))
         
         # Board background
-        pygame.draw.rect(self.screen, BOARD_BG, (0, 0, COLS * CELL, HEIGHT))
+        pygame.draw.rect(surface, BOARD_BG, (0, 0, COLS * CELL, HEIGHT))
         
         # Grid
         for x in range(0, COLS * CELL, CELL):
-            pygame.draw.line(self.screen, GRID_COLOR, (x, 0), (x, HEIGHT))
+            pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, HEIGHT))
         for y in range(0, HEIGHT, CELL):
-            pygame.draw.line(self.screen, GRID_COLOR, (0, y), (COLS * CELL, y))
-        
-        # Placed blocks
-        for r in range(ROWS):
-            for c in range(COLS):
-                if self.board[r][c]:
-                    self.draw_block(c * CELL, r * CELL, self.board[r][c])
-        
-        # Ghost piece
-        if not self.game_over:
-            ghost_y = self.piece.y
-            while self.valid(self.piece, dy=ghost_y - self.piece.y + 1):
-                ghost_y += 1
-            for r, row in enumerate(self.piece.shape):
-                for c, cell in enumerate(row):
-                    if cell:
-                        self.draw_block((self.piece.x + c) * CELL, (ghost_y + r) * CELL, self.piece.color, ghost=True)
+            pygame.draw.line(surface, GRID_COLOR, (0, y), (COLS * CELL, y))
         
-        # Current piece
-        if not self.game_over:
-            for r, row in enumerate(self.piece.shape):
-                for c, cell in enumerate(row):
-                    if cell:
-                        self.draw_block((self.piece.x + c) * CELL, (self.piece.y + r) * CELL, self.piece.color)
-        
-        # Sidebar
-        sidebar_x = COLS * CELL + 15
-        
-        # Next piece box
-        pygame.draw.rect(self.screen, BOARD_BG, (sidebar_x, 10, 150, 100), border_radius=8)
-        next_text = self.title_font.render("NEXT", True, WHITE)
-        self.screen.blit(next_text, (sidebar_x + 55, 18))
-        
-        for r, row in enumerate(self.next_piece.shape):
-            for c, cell in enumerate(row):
-                if cell:
-                    self.draw_block(sidebar_x + 40 + c * 20, 50 + r * 20, self.next_piece.color)
-        
-        # Stats
-        pygame.draw.rect(self.screen, BOARD_BG, (sidebar_x, 130, 150, 180), border_radius=8)
+        # Sidebar panels
+        pygame.draw.rect(surface, BOARD_BG, NEXT_RECT, border_radius=8)
+        pygame.draw.rect(surface, BOARD_BG, STATS_RECT, border_radius=8)
+    
+    def stack_layer(self):
+        """Background plus locked blocks, repainted only after a lock or a line clear."""
+        if self.stack is None:
+            self.stack = background.layer("tetris", (WIDTH, HEIGHT), self.paint_background).copy()
+            for r, row in enumerate(self.board.colors):
+                for c, color in enumerate(row):
+                    if color:
+                        self.draw_block(c * CELL, r * CELL, color, surface=self.stack)
+        return self.stack
+    
+    def panel(self, name, rect, key, paint):
+        """Return a sidebar panel surface, repainted only when `key` changes."""
+        cached = self.panels.get(name)
+        if cached is None or cached[0] != key:
+            surface = background.layer("tetris", (WIDTH, HEIGHT), self.paint_background).subsurface(rect).copy()
+            paint(surface)
+            cached = self.panels[name] = (key, surface)
+        return cached[1]
+    
+    def paint_next(self, surface):
+        next_text = render_text(self.title_font, "NEXT", True, WHITE)
+        surface.blit(next_text, (55, 8))
         
+        top = ROTATIONS[self.next_piece.kind][0].top
+        for r, c in self.next_piece.cells:
+            self.draw_block(40 + c * 20, 40 + (r - top) * 20, self.next_piece.color, surface=surface)
+    
+    def paint_stats(self, surface):
         stats = [
             ("SCORE", str(self.score), GOLD),
             ("LINES", str(self.lines), (100, 200, 255)),
@@ -222,49 +250,72 @@ class Game:
         ]
         
         for i, (label, value, color) in enumerate(stats):
-            y_pos = 145 + i * 42
-            label_text = self.font.render(label, True, WHITE)
-            value_text = self.font.render(value, True, color)
-            self.screen.blit(label_text, (sidebar_x + 15, y_pos))
-            self.screen.blit(value_text, (sidebar_x + 15, y_pos + 18))
+            y_pos = 15 + i * 42
+            surface.blit(render_text(self.font, label, True, WHITE), (15, y_pos))
+            surface.blit(render_text(self.font, value, True, color), (15, y_pos + 18))
+    
+    def draw(self):
+        self.screen.blit(self.stack_layer(), (0, 0))
+        
+        if not self.game_over:
+            piece = self.piece
+            ghost_y = piece.y + self.board.drop_distance(piece.kind, piece.rotation, piece.x, piece.y)
+            for r, c in piece.cells:
+                self.draw_block((piece.x + c) * CELL, (ghost_y + r) * CELL, piece.color, ghost=True)
+            for r, c in piece.cells:
+                self.draw_block((piece.x + c) * CELL, (piece.y + r) * CELL, piece.color)
+        
+        self.screen.blit(self.panel("next", NEXT_RECT, self.next_piece.kind, self.paint_next), NEXT_RECT)
+        stats = (self.score, self.lines, self.level, self.high_score)
+        self.screen.blit(self.panel("stats", STATS_RECT, stats, self.paint_stats), STATS_RECT)
+        
+        if self.autoplay:
+            label = render_text(self.font, "AI playing", True, (100, 255, 150))
+            self.screen.blit(label, (SIDEBAR_X + 75 - label.get_width() // 2, 325))
         
         # Game over overlay
         if self.game_over:
-            overlay = pygame.Surface((COLS * CELL, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((20, 25, 45, 220))
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.overlay, (0, 0))
             
-            text = self.title_font.render("GAME OVER", True, (255, 100, 120))
-            hint = self.font.render("Press R to restart", True, (150, 200, 255))
+            text = render_text(self.title_font, "GAME OVER", True, (255, 100, 120))
+            hint = render_text(self.font, "Press R to restart", True, (150, 200, 255))
             self.screen.blit(text, (COLS * CELL // 2 - text.get_width() // 2, HEIGHT // 2 - 20))
             self.screen.blit(hint, (COLS * CELL // 2 - hint.get_width() // 2, HEIGHT // 2 + 20))
         
+        self.perf.draw_overlay(self.screen)
         pygame.display.flip()
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
+                self.perf.handle_event(event)
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: pygame.quit(); sys.exit()
                     if event.key == pygame.K_r: self.reset()
+                    if event.key == pygame.K_a: self.autoplay = not self.autoplay
                     if not self.game_over:
                         if event.key == pygame.K_LEFT and self.valid(self.piece, dx=-1):
                             self.piece.x -= 1
                         if event.key == pygame.K_RIGHT and self.valid(self.piece, dx=1):
                             self.piece.x += 1
                         if event.key == pygame.K_UP:
-                            old = [row[:] for row in self.piece.shape]
-                            self.piece.rotate()
-                            if not self.valid(self.piece):
-                                self.piece.shape = old
+                            self.rotate()
+                        if event.key == pygame.K_z:
+                            self.rotate(-1)
                         if event.key == pygame.K_DOWN:
                             self.drop()
                         if event.key == pygame.K_SPACE:
                             self.hard_drop()
             
-            self.update()
+            self.perf.begin_frame()
+            for _ in range(self.timestep.advance()):
+                self.update()
+            self.perf.lap("update")
             self.draw()
+            self.perf.lap("draw")
+            self.perf.end_frame()
             self.clock.tick(60)
 
 async def main():
@@ -84,5 +84,9 @@ class TicTacToe:
     async def run(self):
         self.window.mainloop()
 
+async def main():
+    game = TicTacToe()
+    await game.run()
+
 if __name__ == "__main__":
-    TicTacToe().run()
\ No newline at end of file
+    asyncio.run(main())
@@ -10,8 +10,13 @@ Controls:
 import pygame
 import random
 import sys
+import os
 import asyncio
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from gamekit.timestep import FixedTimestep
+from gamekit.text import render_text
+
 pygame.init()
 
 WIDTH, HEIGHT = 600, 500
@@ -63,6 +68,7 @@ class Game:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("🔨 Whack-a-Mole")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(60)
         self.font = pygame.font.Font(None, 36)
         self.reset()
     
@@ -110,9 +116,9 @@ class Game:
             mole.draw(self.screen)
         
         # Draw HUD
-        text = self.font.render(f"Score: {self.score}", True, WHITE)
+        text = render_text(self.font, f"Score: {self.score}", True, WHITE)
         self.screen.blit(text, (10, 10))
-        time_text = self.font.render(f"Time: {self.time_left // 60}", True, WHITE)
+        time_text = render_text(self.font, f"Time: {self.time_left // 60}", True, WHITE)
         self.screen.blit(time_text, (WIDTH - 120, 10))
         
         if self.game_over:
@@ -120,15 +126,16 @@ class Game:
             overlay.set_alpha(180)
             overlay.fill(BLACK)
             self.screen.blit(overlay, (0, 0))
-            text = self.font.render(f"Time's Up! Score: {self.score}", True, WHITE)
+            text = render_text(self.font, f"Time's Up! Score: {self.score}", True, WHITE)
             self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 20))
-            text2 = self.font.render("Press R to restart", True, WHITE)
+            text2 = render_text(self.font, "Press R to restart", True, WHITE)
             self.screen.blit(text2, (WIDTH // 2 - text2.get_width() // 2, HEIGHT // 2 + 20))
         
         pygame.display.flip()
     
     async def run(self):
         while True:
+            await asyncio.sleep(0)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 if event.type == pygame.KEYDOWN:
@@ -137,7 +144,8 @@ class Game:
                 if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
                     self.click(event.pos)
             
-            self.update()
+            for _ in range(self.timestep.advance()):
+                self.update()
             self.draw()
             self.clock.tick(60)
 